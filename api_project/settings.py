@@ -21,12 +21,14 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'rest_framework',
+    'apps.core',
     'apps.n8n_integration',
     'apps.bdgovjob',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'apps.core.compression.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -97,4 +99,74 @@ USE_TZ = True
 # Static files (CSS, JavaScript, Images)
 STATIC_URL = '/static/'
 
-DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
\ No newline at end of file
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Ingest
+# Rows per INSERT/UPDATE statement and savepoint on the bulk write paths.
+INGEST_BATCH_SIZE = int(os.getenv('INGEST_BATCH_SIZE', '500'))
+# Rows committed per transaction; 0 commits each send-data batch once.
+INGEST_TRANSACTION_SIZE = int(os.getenv('INGEST_TRANSACTION_SIZE', '0'))
+# Keyset pagination of the get-data endpoints (?limit=&cursor=).
+PAGINATION_DEFAULT_LIMIT = int(os.getenv('PAGINATION_DEFAULT_LIMIT', '100'))
+PAGINATION_MAX_LIMIT = int(os.getenv('PAGINATION_MAX_LIMIT', '1000'))
+# Results of the fuzzy search/ endpoints (?limit=).
+SEARCH_DEFAULT_LIMIT = int(os.getenv('SEARCH_DEFAULT_LIMIT', '10'))
+SEARCH_MAX_LIMIT = int(os.getenv('SEARCH_MAX_LIMIT', '50'))
+# Window (?days=) and length (?top=) of the top companies list of n8n/stats/.
+STATS_DEFAULT_DAYS = int(os.getenv('STATS_DEFAULT_DAYS', '30'))
+STATS_MAX_DAYS = int(os.getenv('STATS_MAX_DAYS', '366'))
+STATS_DEFAULT_TOP = int(os.getenv('STATS_DEFAULT_TOP', '10'))
+STATS_MAX_TOP = int(os.getenv('STATS_MAX_TOP', '100'))
+# Range (?days=, default and maximum) and number of buckets of the timeseries/ endpoints.
+TIMESERIES_DEFAULT_DAYS = int(os.getenv('TIMESERIES_DEFAULT_DAYS', '30'))
+TIMESERIES_MAX_DAYS = int(os.getenv('TIMESERIES_MAX_DAYS', '3660'))
+TIMESERIES_MAX_BUCKETS = int(os.getenv('TIMESERIES_MAX_BUCKETS', '2200'))
+# Items validated and written per chunk by the send-data/stream/ endpoints.
+INGEST_STREAM_CHUNK_SIZE = int(os.getenv('INGEST_STREAM_CHUNK_SIZE', '500'))
+# Rows read from the database and written out per chunk by the export/ endpoints.
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', '2000'))
+
+# Seconds a send-data response is replayed for retries with the same Idempotency-Key.
+IDEMPOTENCY_TTL = int(os.getenv('IDEMPOTENCY_TTL', '86400'))
+# Seconds after which an unfinished request no longer blocks retries with its key.
+IDEMPOTENCY_LOCK_TIMEOUT = int(os.getenv('IDEMPOTENCY_LOCK_TIMEOUT', '600'))
+
+# Cache
+# The 'responses' cache holds get-data period responses (apps.core.response_cache),
+# their data versions and hit/miss counters. 'file' shares all three between the
+# web workers and the import/queue commands, so a write in any process retires
+# cached responses everywhere. 'locmem' is per process: only use it when one
+# process both serves and writes. Both evict the least recently used entries
+# beyond RESPONSE_CACHE_MAX_ENTRIES.
+RESPONSE_CACHE_BACKENDS = {
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+    'file': 'apps.core.cache_backends.LRUFileBasedCache',
+}
+RESPONSE_CACHE_BACKEND = os.getenv('RESPONSE_CACHE_BACKEND', 'file')
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('DJANGO_CACHE_MAX_ENTRIES', '1000')),
+        },
+    },
+    'responses': {
+        'BACKEND': RESPONSE_CACHE_BACKENDS[RESPONSE_CACHE_BACKEND],
+        'LOCATION': os.getenv(
+            'RESPONSE_CACHE_LOCATION',
+            str(BASE_DIR / '.response_cache') if RESPONSE_CACHE_BACKEND == 'file' else 'responses',
+        ),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '500')),
+        },
+    },
+}
+# Tests run against a temporary 'responses' cache directory, not the shared one.
+TEST_RUNNER = 'apps.core.test_runner.TestRunner'
+# Seconds a cached period response lives without new data; 0 disables the cache.
+RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', '300'))
+# Response compression (gzip, or br with the optional brotli package).
+# Smaller bodies are sent uncompressed.
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))
+COMPRESSION_GZIP_LEVEL = int(os.getenv('COMPRESSION_GZIP_LEVEL', '6'))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv('COMPRESSION_BROTLI_QUALITY', '5'))
@@ -1,211 +1,287 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from django.conf import settings
 from django.utils import timezone
 from datetime import timedelta, datetime
-from django.db.models import Q
 from .models import GovtJob
-from .serializers import GovtJobSerializer
+from .serializers import GovtJobSerializer, GOVTJOB_ROWS
+from .ingest import upsert_jobs, upsert_counts
+from apps.core.conditional import check_values, conditional
+from apps.core.export import export
+from apps.core.fuzzy import fuzzy_search
+from apps.core.idempotency import idempotent
+from apps.core.models import IngestBatch
+from apps.core.ndjson import stream_ingest
+from apps.core.pagination import paginate, parse_limit
+from apps.core.queue import enqueue
+from apps.core.response_cache import cached_response
+from apps.core.rollups import summary
+from apps.core.responses import wants_summary
+from apps.core.rows import select_fields
+from apps.core.search import search
+from apps.core.timeseries import timeseries
 
 
 class SendDataView(APIView):
-    """POST: accept single or list of government jobs and persist them."""
+    """POST: accept single or list of government jobs and persist them.
     
+    With ``?mode=async`` the batch is queued and 202 is returned with a
+    batch id; poll ``ingest-batches/<id>/`` for the outcome. With
+    ``?response=summary`` only counts, ids and errors are returned.
+    """
+    
+    @idempotent
     def post(self, request):
+        if request.query_params.get('mode') == 'async':
+            return enqueue(request, IngestBatch.SOURCE_GOVTJOBS, 'bdgovjob_ingest_batch')
+        
         data = request.data
         payloads = data if isinstance(data, list) else [data]
         
-        created = []
-        updated = []
-        errors = []
-        skipped = []
+        created, updated, skipped, errors = upsert_jobs(payloads)
         
-        for item in payloads:
-            serializer = GovtJobSerializer(data=item)
-            if not serializer.is_valid():
-                errors.append({'item': item, 'errors': serializer.errors})
-                continue
-            
-            vd = serializer.validated_data
-            job_url = (vd.get('job_url') or '').strip()
-            
-            # Deduplication by job_url (primary key)
-            if job_url:
-                existing = GovtJob.objects.filter(job_url=job_url).first()
-                if existing:
-                    # Update existing record
-                    for key, value in vd.items():
-                        setattr(existing, key, value)
-                    existing.save()
-                    updated.append(GovtJobSerializer(existing).data)
-                    continue
-            
-            # Create new record
-            try:
-                job = GovtJob.objects.create(**vd)
-                created.append(GovtJobSerializer(job).data)
-            except Exception as e:
-                errors.append({'item': item, 'error': str(e)})
-        
-        resp = {
-            'created': created,
-            'updated': updated,
-            'skipped': skipped,
+        if wants_summary(request):
+            resp = {
+                'created_ids': [job.pk for job in created],
+                'updated_ids': [job.pk for job in updated],
+            }
+        else:
+            resp = {
+                'created': GovtJobSerializer(created, many=True).data,
+                'updated': GovtJobSerializer(updated, many=True).data,
+                'skipped': skipped,
+            }
+        resp.update({
             'total_created': len(created),
             'total_updated': len(updated),
+            'total_skipped': len(skipped),
             'total_errors': len(errors),
-        }
+        })
         
         if errors:
             resp['errors'] = errors
         
         status_code = status.HTTP_201_CREATED if created else (
-            status.HTTP_200_OK if updated else status.HTTP_400_BAD_REQUEST
+            status.HTTP_200_OK if updated or skipped else status.HTTP_400_BAD_REQUEST
         )
         return Response(resp, status=status_code)
 
 
+class SendDataStreamView(APIView):
+    """POST: ingest an NDJSON body in fixed-size chunks, streaming progress back."""
+    
+    def post(self, request):
+        return stream_ingest(request, upsert_counts)
+
+
+def filter_text(request, qs):
+    """Apply the get-data filters on job content; return ``(queryset, filters echoed back)``."""
+    # Filter by job title (case-insensitive partial match)
+    title = request.query_params.get('title')
+    if title:
+        qs = qs.filter(job_title__icontains=title)
+    
+    # Filter by vacancies
+    vacancies = request.query_params.get('vacancies')
+    if vacancies:
+        qs = qs.filter(vacancies__icontains=vacancies)
+    
+    # Filter by deadline (partial match)
+    deadline = request.query_params.get('deadline')
+    if deadline:
+        qs = qs.filter(deadline__icontains=deadline)
+    
+    # Deadline range on the parsed, indexed deadline_at (both days included)
+    deadline_after = request.query_params.get('deadline_after')
+    if deadline_after:
+        try:
+            after = datetime.strptime(deadline_after, '%Y-%m-%d')
+            qs = qs.filter(deadline_at__gte=timezone.make_aware(after, timezone.get_current_timezone()))
+        except ValueError:
+            pass
+    
+    deadline_before = request.query_params.get('deadline_before')
+    if deadline_before:
+        try:
+            before = datetime.strptime(deadline_before, '%Y-%m-%d') + timedelta(days=1)
+            qs = qs.filter(deadline_at__lt=timezone.make_aware(before, timezone.get_current_timezone()))
+        except ValueError:
+            pass
+    
+    # Minimum number of vacancies, on the parsed, indexed vacancies_int
+    min_vacancies = request.query_params.get('min_vacancies')
+    if min_vacancies:
+        try:
+            qs = qs.filter(vacancies_int__gte=int(min_vacancies))
+        except ValueError:
+            pass
+    
+    # Full-text search, ranked, every word a prefix (apps.core.search)
+    q = request.query_params.get('q')
+    if q:
+        qs = search(qs, q, GovtJob.SEARCH_FIELDS)
+    
+    return qs, {
+        'title': title,
+        'vacancies': vacancies,
+        'deadline': deadline,
+        'deadline_after': deadline_after,
+        'deadline_before': deadline_before,
+        'min_vacancies': min_vacancies,
+        'q': q,
+    }
+
+
+def filter_jobs(request):
+    """Apply the get-data query params; return ``(queryset, filters echoed back)``."""
+    qs = GovtJob.objects.all()
+    
+    # Filter by days (last N days)
+    days = request.query_params.get('days')
+    if days:
+        try:
+            days_int = int(days)
+            date_from = timezone.now() - timedelta(days=days_int)
+            qs = qs.filter(created_at__gte=date_from)
+        except ValueError:
+            pass
+    
+    # Filter by date range
+    start_date = request.query_params.get('start')
+    if start_date:
+        try:
+            start = datetime.strptime(start_date, '%Y-%m-%d')
+            start_aware = timezone.make_aware(start, timezone.get_current_timezone())
+            qs = qs.filter(created_at__gte=start_aware)
+        except ValueError:
+            pass
+    
+    end_date = request.query_params.get('end')
+    if end_date:
+        try:
+            end = datetime.strptime(end_date, '%Y-%m-%d')
+            end_aware = timezone.make_aware(end, timezone.get_current_timezone())
+            end_aware = end_aware + timedelta(days=1)
+            qs = qs.filter(created_at__lt=end_aware)
+        except ValueError:
+            pass
+    
+    qs, text_filters = filter_text(request, qs)
+    
+    filters = {
+        'days': days,
+        'start_date': start_date,
+        'end_date': end_date,
+        **text_filters,
+    }
+    return qs, filters
+
+
 class GetDataView(APIView):
     """GET: list persisted government jobs with optional filters via query params."""
     
+    @conditional
     def get(self, request):
-        qs = GovtJob.objects.all()
-        
-        # Filter by days (last N days)
-        days = request.query_params.get('days')
-        if days:
-            try:
-                days_int = int(days)
-                date_from = timezone.now() - timedelta(days=days_int)
-                qs = qs.filter(created_at__gte=date_from)
-            except ValueError:
-                pass
-        
-        # Filter by date range
-        start_date = request.query_params.get('start')
-        if start_date:
-            try:
-                start = datetime.strptime(start_date, '%Y-%m-%d')
-                start_aware = timezone.make_aware(start, timezone.get_current_timezone())
-                qs = qs.filter(created_at__gte=start_aware)
-            except ValueError:
-                pass
-        
-        end_date = request.query_params.get('end')
-        if end_date:
-            try:
-                end = datetime.strptime(end_date, '%Y-%m-%d')
-                end_aware = timezone.make_aware(end, timezone.get_current_timezone())
-                end_aware = end_aware + timedelta(days=1)
-                qs = qs.filter(created_at__lt=end_aware)
-            except ValueError:
-                pass
-        
-        # Filter by job title (case-insensitive partial match)
-        title = request.query_params.get('title')
-        if title:
-            qs = qs.filter(job_title__icontains=title)
+        qs, filters = filter_jobs(request)
         
-        # Filter by vacancies
-        vacancies = request.query_params.get('vacancies')
-        if vacancies:
-            qs = qs.filter(vacancies__icontains=vacancies)
-        
-        # Filter by deadline (partial match)
-        deadline = request.query_params.get('deadline')
-        if deadline:
-            qs = qs.filter(deadline__icontains=deadline)
-        
-        qs = qs.order_by('-created_at')
-        serializer = GovtJobSerializer(qs, many=True)
+        jobs, count, page = paginate(request, qs, GOVTJOB_ROWS)
         
         return Response({
-            'filters': {
-                'days': days,
-                'start_date': start_date,
-                'end_date': end_date,
-                'title': title,
-                'vacancies': vacancies,
-                'deadline': deadline,
-            },
-            'count': qs.count(),
-            'jobs': serializer.data
+            'filters': filters,
+            'count': count,
+            'jobs': jobs,
+            **page,
         })
 
 
 class GetTodayDataView(APIView):
     """GET: Government jobs scraped today"""
     
+    @cached_response(IngestBatch.SOURCE_GOVTJOBS)
+    @conditional
     def get(self, request):
         today = timezone.now().date()
         qs = GovtJob.objects.filter(
             created_at__date=today
-        ).order_by('-created_at')
-        serializer = GovtJobSerializer(qs, many=True)
+        )
+        jobs, count, page = paginate(request, qs, GOVTJOB_ROWS)
         return Response({
             'date': str(today),
-            'count': qs.count(),
-            'jobs': serializer.data
+            'count': count,
+            'jobs': jobs,
+            **page,
         })
 
 
 class GetYesterdayDataView(APIView):
     """GET: Government jobs scraped yesterday"""
     
+    @cached_response(IngestBatch.SOURCE_GOVTJOBS)
+    @conditional
     def get(self, request):
         yesterday = timezone.now().date() - timedelta(days=1)
         qs = GovtJob.objects.filter(
             created_at__date=yesterday
-        ).order_by('-created_at')
-        serializer = GovtJobSerializer(qs, many=True)
+        )
+        jobs, count, page = paginate(request, qs, GOVTJOB_ROWS)
         return Response({
             'date': str(yesterday),
-            'count': qs.count(),
-            'jobs': serializer.data
+            'count': count,
+            'jobs': jobs,
+            **page,
         })
 
 
 class GetWeekDataView(APIView):
     """GET: Government jobs scraped in the last 7 days"""
     
+    @cached_response(IngestBatch.SOURCE_GOVTJOBS)
+    @conditional
     def get(self, request):
         week_ago = timezone.now() - timedelta(days=7)
         qs = GovtJob.objects.filter(
             created_at__gte=week_ago
-        ).order_by('-created_at')
-        serializer = GovtJobSerializer(qs, many=True)
+        )
+        jobs, count, page = paginate(request, qs, GOVTJOB_ROWS)
         return Response({
             'period': 'last_7_days',
             'from': str(week_ago.date()),
             'to': str(timezone.now().date()),
-            'count': qs.count(),
-            'jobs': serializer.data
+            'count': count,
+            'jobs': jobs,
+            **page,
         })
 
 
 class GetMonthDataView(APIView):
     """GET: Government jobs scraped this month"""
     
+    @cached_response(IngestBatch.SOURCE_GOVTJOBS)
+    @conditional
     def get(self, request):
         now = timezone.now()
         month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
         qs = GovtJob.objects.filter(
             created_at__gte=month_start
-        ).order_by('-created_at')
-        serializer = GovtJobSerializer(qs, many=True)
+        )
+        jobs, count, page = paginate(request, qs, GOVTJOB_ROWS)
         return Response({
             'period': 'current_month',
             'month': now.strftime('%B %Y'),
             'from': str(month_start.date()),
             'to': str(now.date()),
-            'count': qs.count(),
-            'jobs': serializer.data
+            'count': count,
+            'jobs': jobs,
+            **page,
         })
 
 
 class GetDateDataView(APIView):
     """GET: Government jobs scraped on specific date"""
     
+    @cached_response(IngestBatch.SOURCE_GOVTJOBS)
+    @conditional
     def get(self, request, date_str):
         try:
             target_date = datetime.strptime(date_str, '%Y-%m-%d').date()
@@ -217,49 +293,73 @@ class GetDateDataView(APIView):
         
         qs = GovtJob.objects.filter(
             created_at__date=target_date
-        ).order_by('-created_at')
-        serializer = GovtJobSerializer(qs, many=True)
+        )
+        jobs, count, page = paginate(request, qs, GOVTJOB_ROWS)
         return Response({
             'date': str(target_date),
-            'count': qs.count(),
-            'jobs': serializer.data
+            'count': count,
+            'jobs': jobs,
+            **page,
         })
 
 
 class GetStatsView(APIView):
     """GET: Statistics about government jobs"""
     
+    @conditional
     def get(self, request):
-        total_jobs = GovtJob.objects.count()
-        today = timezone.now().date()
+        # Every figure, and the ETag validator, from the daily rollups in one
+        # aggregate query; the GovtJob table itself is not read.
+        totals = summary(IngestBatch.SOURCE_GOVTJOBS)
+        check_values(request, totals['last_modified'], totals['total'])
         
-        # Count jobs by time period
-        today_count = GovtJob.objects.filter(created_at__date=today).count()
-        week_count = GovtJob.objects.filter(
-            created_at__gte=timezone.now() - timedelta(days=7)
-        ).count()
-        month_count = GovtJob.objects.filter(
-            created_at__month=today.month,
-            created_at__year=today.year
-        ).count()
-        
-        # Count jobs with vacancies
-        with_vacancies = GovtJob.objects.exclude(
-            Q(vacancies__isnull=True) | Q(vacancies='') | Q(vacancies__iexact='N/A')
-        ).count()
+        return Response({
+            'total_jobs': totals['total'],
+            'today': totals['today'],
+            'this_week': totals['this_week'],
+            'this_month': totals['this_month'],
+            'with_vacancies': totals['with_vacancies'],
+            'with_deadlines': totals['with_deadline'],
+            'total_vacancies': totals['total_vacancies'],
+            'last_updated': totals['last_created_at'],
+        })
+
+
+class TimeseriesView(APIView):
+    """GET: government jobs per hour, day or week (?bucket=, ?start=&end= or ?days=, text filters)."""
+    
+    def get(self, request):
+        qs, filters = filter_text(request, GovtJob.objects.all())
+        use_rollups = not any(filters.values())
+        return Response({**timeseries(request, qs, IngestBatch.SOURCE_GOVTJOBS, use_rollups), 'filters': filters})
+
+
+class SearchView(APIView):
+    """GET: typo-tolerant search of government jobs by title (?q=, ?limit=, ?fields=)."""
+    
+    def get(self, request):
+        q = request.query_params.get('q', '').strip()
+        if not q:
+            return Response({'error': 'q is required'}, status=status.HTTP_400_BAD_REQUEST)
+        limit = parse_limit(request, settings.SEARCH_DEFAULT_LIMIT, settings.SEARCH_MAX_LIMIT)
         
-        # Count jobs with deadlines
-        with_deadlines = GovtJob.objects.exclude(
-            Q(deadline__isnull=True) | Q(deadline='') | Q(deadline__iexact='N/A')
-        ).count()
+        results = fuzzy_search(
+            GovtJob.objects.all(), q, IngestBatch.SOURCE_GOVTJOBS, GovtJob.SEARCH_FIELDS, select_fields(request, GOVTJOB_ROWS), limit,
+        )
         
         return Response({
-            'total_jobs': total_jobs,
-            'today': today_count,
-            'this_week': week_count,
-            'this_month': month_count,
-            'with_vacancies': with_vacancies,
-            'with_deadlines': with_deadlines,
-            'last_updated': GovtJob.objects.order_by('-created_at').first().created_at if total_jobs > 0 else None
+            'query': q,
+            'count': len(results),
+            'results': results,
         })
 
+
+class ExportView(APIView):
+    """GET: stream every matching government job as CSV or NDJSON (get-data filters, ?type=)."""
+    
+    # The scraped fields, as import_govtjobs reads them back.
+    CSV_COLUMNS = ['job_title', 'job_url', 'vacancies', 'deadline', 'posted_date', 'scraped_at']
+    
+    def get(self, request):
+        qs, _ = filter_jobs(request)
+        return export(request, qs, self.CSV_COLUMNS, GOVTJOB_ROWS, 'bdgovtjobs')
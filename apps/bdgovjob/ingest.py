@@ -0,0 +1,182 @@
+"""Batched upsert of government jobs keyed on the unique ``job_url``.
+
+Each chunk costs one SELECT of the already stored rows, one INSERT for the
+new ones and one UPDATE for the rows whose content actually changed. Rows
+that arrive unchanged are not written at all, so re-scrapes no longer bump
+``updated_at`` on every record.
+
+Chunks run in savepoints inside one transaction (see
+``apps.core.transactions``). A chunk that fails, e.g. because a concurrent
+writer inserted one of its URLs between the SELECT and the INSERT, is
+redone row by row, so only the rows that still fail are reported. The
+daily rollups (``apps.core.rollups``) are counted in the same savepoint.
+"""
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework import serializers
+from apps.core.fuzzy import index_terms
+from apps.core.models import IngestBatch
+from apps.core.normalize import GOVTJOB_TYPED_FIELDS, normalize_govtjobs
+from apps.core.response_cache import bump_version
+from apps.core.rollups import Tally
+from apps.core.transactions import write_batched
+from .models import GovtJob
+from .serializers import GovtJobIngestSerializer
+
+# Fields that decide whether a stored row changed. ``scraped_at`` moves on
+# every scrape, so on its own it does not count as a change.
+CONTENT_FIELDS = ['job_title', 'vacancies', 'deadline', 'posted_date']
+UPDATE_FIELDS = CONTENT_FIELDS + list(GOVTJOB_TYPED_FIELDS) + ['scraped_at', 'updated_at']
+
+
+def _content(job):
+    return tuple(getattr(job, field) for field in CONTENT_FIELDS)
+
+
+def _upsert_chunk(chunk):
+    """Upsert one chunk of ``(item, validated_data)`` pairs keyed by job_url.
+
+    Returns ``(created, updated, unchanged)``; the first two hold
+    ``GovtJob`` instances, the last the input items that were left alone.
+    """
+    keyed = [(item, vd) for item, vd in chunk if vd.get('job_url')]
+    existing = GovtJob.objects.in_bulk([vd['job_url'] for _, vd in keyed], field_name='job_url')
+
+    created = []
+    updated = []
+    unchanged = []
+    tally = Tally(IngestBatch.SOURCE_GOVTJOBS)
+    now = timezone.now()
+    for item, vd in keyed:
+        job = existing.get(vd['job_url'])
+        if job is None:
+            created.append(GovtJob(**vd))
+            continue
+        before = {field: getattr(job, field) for field in UPDATE_FIELDS}
+        for key, value in vd.items():
+            setattr(job, key, value)
+        if _content(job) == tuple(before[field] for field in CONTENT_FIELDS):
+            unchanged.append(item)
+            continue
+        job.updated_at = now
+        updated.append(job)
+        tally.updated(job, before, now)
+
+    if created:
+        GovtJob.objects.bulk_create(created)
+        if not connection.features.can_return_rows_from_bulk_insert:
+            stored = GovtJob.objects.in_bulk([job.job_url for job in created], field_name='job_url')
+            for job in created:
+                job.pk = stored[job.job_url].pk
+    if updated:
+        GovtJob.objects.bulk_update(updated, UPDATE_FIELDS)
+
+    tally.created(created)
+    tally.flush()
+    # Rows without a job_url have no conflict target; they are always new.
+    # save() counts them in the rollups itself.
+    created.extend(GovtJob.objects.create(**vd) for _, vd in chunk if not vd.get('job_url'))
+    return created, updated, unchanged
+
+
+def upsert_jobs(payloads, batch_size=None):
+    """Validate and upsert a list of government job payloads.
+
+    Returns ``(created, updated, skipped, errors)``. ``created`` and
+    ``updated`` hold ``GovtJob`` instances; ``skipped`` lists input items
+    that were unchanged or superseded by a later item with the same job_url;
+    ``errors`` lists invalid items with their errors.
+    """
+    validator = GovtJobIngestSerializer()
+    errors = []
+    skipped = []
+    items = []
+    rows = []
+    for item in payloads:
+        try:
+            rows.append(validator.run_validation(item))
+        except serializers.ValidationError as exc:
+            errors.append({'item': item, 'errors': exc.detail})
+            continue
+        items.append(item)
+
+    keyed = {}
+    unkeyed = []
+    for item, vd in zip(items, normalize_govtjobs(rows)):
+        job_url = vd.get('job_url')
+        if not job_url:
+            unkeyed.append((item, vd))
+            continue
+        if job_url in keyed:
+            # The last occurrence in the payload wins.
+            skipped.append({'item': keyed[job_url][0], 'reason': 'duplicate'})
+        keyed[job_url] = (item, vd)
+
+    created = []
+    updated = []
+    results, failures = write_batched(_upsert_chunk, list(keyed.values()) + unkeyed, batch_size)
+    for result in results:
+        created.extend(result[0])
+        updated.extend(result[1])
+        skipped.extend({'item': item, 'reason': 'unchanged'} for item in result[2])
+    errors.extend({'item': item, 'error': str(exc)} for (item, _), exc in failures)
+
+    if created or updated:
+        index_terms(IngestBatch.SOURCE_GOVTJOBS, [
+            getattr(job, field) for job in created + updated for field in GovtJob.SEARCH_FIELDS
+        ])
+        transaction.on_commit(lambda: bump_version(IngestBatch.SOURCE_GOVTJOBS))
+    return created, updated, skipped, errors
+
+
+def upsert_counts(payloads):
+    """Run ``upsert_jobs`` and return counters plus errors.
+
+    Used where the stored rows are not echoed back (streamed and queued
+    ingest).
+    """
+    created, updated, skipped, errors = upsert_jobs(payloads)
+    return {
+        'created': len(created),
+        'updated': len(updated),
+        'skipped': len(skipped),
+        'errors': errors,
+    }
+
+
+def fill_typed_fields(model, batch_size=1000):
+    """Re-parse the typed fields of every stored ``model`` row, in pk batches.
+
+    Rows whose parsed values changed are written with a new ``updated_at``,
+    since the API returns the typed fields and their ETag/Last-Modified have
+    to move with them. Takes the model so migrations can pass their
+    historical one. Returns ``(scanned, changed)``.
+    """
+    typed_fields = list(GOVTJOB_TYPED_FIELDS)
+    source_fields = list(GOVTJOB_TYPED_FIELDS.values())
+    scanned = 0
+    changed = 0
+    last_id = 0
+
+    while True:
+        rows = list(
+            model.objects.filter(pk__gt=last_id)
+            .only('pk', *source_fields, *typed_fields).order_by('pk')[:batch_size]
+        )
+        if not rows:
+            break
+        last_id = rows[-1].pk
+
+        parsed = normalize_govtjobs([{field: getattr(row, field) for field in source_fields} for row in rows])
+        stale = []
+        for row, values in zip(rows, parsed):
+            if any(getattr(row, field) != values[field] for field in typed_fields):
+                for field in typed_fields:
+                    setattr(row, field, values[field])
+                row.updated_at = timezone.now()
+                stale.append(row)
+        with transaction.atomic():
+            model.objects.bulk_update(stale, typed_fields + ['updated_at'])
+        scanned += len(rows)
+        changed += len(stale)
+    return scanned, changed
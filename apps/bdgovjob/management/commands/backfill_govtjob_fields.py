@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from apps.bdgovjob.ingest import fill_typed_fields
+from apps.bdgovjob.models import GovtJob
+from apps.core.models import IngestBatch
+from apps.core.response_cache import bump_version
+from apps.core.rollups import rebuild
+
+
+class Command(BaseCommand):
+    help = (
+        'Re-parse GovtJob.vacancies_int, deadline_at and posted_on from the free-text '
+        'columns (migration 0004 fills them once; run this after a parser change), then '
+        'rebuild the government job rollups and invalidate cached responses.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Rows parsed and written per transaction (default: 1000).',
+        )
+
+    def handle(self, *args, **options):
+        scanned, changed = fill_typed_fields(GovtJob, options['batch_size'])
+        days = rebuild(IngestBatch.SOURCE_GOVTJOBS)
+        if changed:
+            bump_version(IngestBatch.SOURCE_GOVTJOBS)
+        self.stdout.write(self.style.SUCCESS(
+            f'Parsed {scanned} row(s), updated {changed}; rebuilt {days} rollup day(s)'
+        ))
@@ -0,0 +1,12 @@
+from apps.bdgovjob.ingest import upsert_counts
+from apps.core.importer import ImportCommand
+from apps.core.normalize import normalize_govtjobs
+
+
+class Command(ImportCommand):
+    help = (
+        'Import government jobs from a scraper CSV or NDJSON file, upserting on job_url '
+        'in chunks. Resumes from a checkpoint if interrupted.'
+    )
+    normalize = staticmethod(normalize_govtjobs)
+    ingest = staticmethod(upsert_counts)
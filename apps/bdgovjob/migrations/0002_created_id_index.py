@@ -0,0 +1,21 @@
+# Generated by Django 3.2.25 on 2026-10-18 11:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bdgovjob', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='govtjob',
+            name='bdgovjob_go_created_7b8bfe_idx',
+        ),
+        migrations.AddIndex(
+            model_name='govtjob',
+            index=models.Index(fields=['-created_at', '-id'], name='govtjob_created_id_idx'),
+        ),
+    ]
@@ -0,0 +1,13 @@
+from django.db import migrations
+from apps.core.search import search_index_operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bdgovjob', '0002_created_id_index'),
+    ]
+
+    operations = [
+        search_index_operation('bdgovjob_govtjob', ['job_title']),
+    ]
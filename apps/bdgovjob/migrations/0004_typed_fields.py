@@ -0,0 +1,57 @@
+# Generated by Django 3.2.25 on 2026-10-18 12:53
+
+from django.db import migrations, models
+from apps.core.search import restore_search_triggers_operation
+
+
+def backfill_typed_fields(apps, schema_editor):
+    # Parse the jobs already stored, then count their vacancies in the rollups.
+    from apps.bdgovjob.ingest import fill_typed_fields
+    from apps.core.models import IngestBatch
+    from apps.core.response_cache import bump_version
+    from apps.core.rollups import rebuild
+    _, changed = fill_typed_fields(apps.get_model('bdgovjob', 'GovtJob'))
+    rebuild(IngestBatch.SOURCE_GOVTJOBS, apps)
+    if changed:
+        bump_version(IngestBatch.SOURCE_GOVTJOBS)
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bdgovjob', '0003_search_index'),
+        ('core', '0005_rollup_total_vacancies'),
+    ]
+
+    operations = [
+        # Runs last when migrating backwards, after RemoveField rebuilt the table.
+        restore_search_triggers_operation('bdgovjob_govtjob', ['job_title']),
+        migrations.AddField(
+            model_name='govtjob',
+            name='deadline_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='govtjob',
+            name='posted_on',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='govtjob',
+            name='vacancies_int',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='govtjob',
+            index=models.Index(fields=['deadline_at'], name='govtjob_deadline_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='govtjob',
+            index=models.Index(fields=['vacancies_int'], name='govtjob_vacancies_int_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='govtjob',
+            index=models.Index(fields=['posted_on'], name='govtjob_posted_on_idx'),
+        ),
+        restore_search_triggers_operation('bdgovjob_govtjob', ['job_title']),
+        migrations.RunPython(backfill_typed_fields, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,5 @@
 from django.db import models
-from django.utils import timezone
-from django.core.validators import URLValidator
-from django.core.exceptions import ValidationError
+from apps.core.normalize import GOVTJOB_FIELDS, clean_url, normalize_govtjobs
 
 
 class GovtJob(models.Model):
@@ -14,14 +12,24 @@ class GovtJob(models.Model):
     - deadline: Application deadline
     - posted_date: When the job was posted
     - scraped_at: When the data was scraped
+    
+    ``vacancies_int``, ``deadline_at`` and ``posted_on`` are typed copies of
+    the free-text columns, parsed on save and ingest (``apps.core.normalize``)
+    and None when the text has no number or date.
     """
     
+    # Columns indexed for ?q= full-text search (apps.core.search).
+    SEARCH_FIELDS = ('job_title',)
+    
     job_title = models.TextField(blank=True, null=True)
     job_url = models.URLField(max_length=500, blank=True, null=True, unique=True)
     vacancies = models.CharField(max_length=100, blank=True, null=True)
     deadline = models.CharField(max_length=200, blank=True, null=True)
     posted_date = models.CharField(max_length=100, blank=True, null=True)
     scraped_at = models.DateTimeField(blank=True, null=True)
+    vacancies_int = models.PositiveIntegerField(blank=True, null=True, editable=False)
+    deadline_at = models.DateTimeField(blank=True, null=True, editable=False)
+    posted_on = models.DateField(blank=True, null=True, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -30,8 +38,13 @@ class GovtJob(models.Model):
         verbose_name = 'Government Job'
         verbose_name_plural = 'Government Jobs'
         indexes = [
-            models.Index(fields=['-created_at']),
+            # Keyset pagination: ORDER BY created_at DESC, id DESC.
+            models.Index(fields=['-created_at', '-id'], name='govtjob_created_id_idx'),
             models.Index(fields=['job_url']),
+            # Range filters (deadline_before/after, min_vacancies) and sorting.
+            models.Index(fields=['deadline_at'], name='govtjob_deadline_at_idx'),
+            models.Index(fields=['vacancies_int'], name='govtjob_vacancies_int_idx'),
+            models.Index(fields=['posted_on'], name='govtjob_posted_on_idx'),
         ]
     
     def __str__(self):
@@ -39,56 +52,20 @@ class GovtJob(models.Model):
     
     def clean_url(self, value):
         """Normalize URL-like fields: treat empty, whitespace or 'N/A' as None."""
-        if value is None:
-            return None
-        if isinstance(value, str):
-            v = value.strip()
-            if not v or v.upper() == 'N/A':
-                return None
-            try:
-                URLValidator()(v)
-            except ValidationError:
-                return v
-            return v
-        return value
+        return clean_url(value)
     
-    def save(self, *args, **kwargs):
-        # Normalize job_title
-        if isinstance(self.job_title, str):
-            self.job_title = self.job_title.strip() or None
-        
-        # Normalize job_url
-        self.job_url = self.clean_url(self.job_url)
-        
-        # Normalize vacancies
-        if isinstance(self.vacancies, str):
-            v = self.vacancies.strip()
-            self.vacancies = v if v and v.upper() != 'N/A' else None
-        
-        # Normalize deadline
-        if isinstance(self.deadline, str):
-            d = self.deadline.strip()
-            self.deadline = d if d and d.upper() != 'N/A' else None
-        
-        # Normalize posted_date
-        if isinstance(self.posted_date, str):
-            p = self.posted_date.strip()
-            self.posted_date = p if p and p.upper() != 'N/A' else None
-        
-        # Parse scraped_at if it's a string
-        if isinstance(self.scraped_at, str):
-            try:
-                from datetime import datetime
-                parsed = datetime.strptime(self.scraped_at, '%Y-%m-%d %H:%M:%S')
-                self.scraped_at = timezone.make_aware(parsed, timezone.get_current_timezone())
-            except Exception:
-                try:
-                    parsed = timezone.datetime.fromisoformat(self.scraped_at)
-                    if timezone.is_naive(parsed):
-                        parsed = timezone.make_aware(parsed, timezone.get_current_timezone())
-                    self.scraped_at = parsed
-                except Exception:
-                    self.scraped_at = None
+    def normalize(self):
+        """Apply the field normalization performed by ``save()``.
         
+        Delegates to the batch engine in ``apps.core.normalize`` so single
+        saves and bulk paths (``bulk_create``/``bulk_update``) store exactly
+        the same values.
+        """
+        row = normalize_govtjobs([{field: getattr(self, field) for field in GOVTJOB_FIELDS}])[0]
+        for field, value in row.items():
+            setattr(self, field, value)
+    
+    def save(self, *args, **kwargs):
+        self.normalize()
         super().save(*args, **kwargs)
 
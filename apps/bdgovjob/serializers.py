@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from apps.core.rows import RowSerializer
 from .models import GovtJob
 
 
@@ -15,8 +16,25 @@ class GovtJobSerializer(serializers.ModelSerializer):
             'deadline',
             'posted_date',
             'scraped_at',
+            'vacancies_int',
+            'deadline_at',
+            'posted_on',
             'created_at',
             'updated_at',
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'vacancies_int', 'deadline_at', 'posted_on', 'created_at', 'updated_at']
 
+
+# values_list() read path of the get-data endpoints; renders like GovtJobSerializer.
+GOVTJOB_ROWS = RowSerializer(GovtJobSerializer)
+
+
+class GovtJobIngestSerializer(GovtJobSerializer):
+    """Validates send-data items.
+
+    ``job_url`` uniqueness is resolved by the upsert rather than rejected
+    by a per-item ``UniqueValidator`` query.
+    """
+    
+    class Meta(GovtJobSerializer.Meta):
+        extra_kwargs = {'job_url': {'validators': []}}
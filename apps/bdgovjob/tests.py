@@ -1,6 +1,24 @@
-from django.test import TestCase
+import csv
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone as dt_timezone
+from io import StringIO
+from unittest import mock, skipUnless
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
 from django.utils import timezone
+from apps.core.models import IngestBatch
+from apps.core import rollups
+from .ingest import upsert_jobs
 from .models import GovtJob
+from .serializers import GOVTJOB_ROWS, GovtJobSerializer
 
 
 class GovtJobModelTest(TestCase):
@@ -51,3 +69,444 @@ class GovtJobModelTest(TestCase):
         self.assertIsNone(job.deadline)
         self.assertIsNone(job.posted_date)
 
+
+class SendDataUpsertTest(TestCase):
+    """Test cases for the send-data upsert"""
+    
+    url = '/bdgovjob/send-data/'
+    
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+    
+    def job(self, n, **overrides):
+        data = {
+            'job_title': f'Job Circular {n}',
+            'job_url': f'https://bdgovtjob.net/job-{n}/',
+            'vacancies': '10',
+            'deadline': '25 November 2025 at 5:00 PM',
+            'posted_date': '3 November, 2025',
+            'scraped_at': '2025-11-03 12:00:00',
+        }
+        data.update(overrides)
+        return data
+    
+    def test_create_batch(self):
+        """Test that new jobs are created and echoed with ids"""
+        response = self.client.post(self.url, [self.job(1), self.job(2)], format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['total_created'], 2)
+        self.assertTrue(all(job['id'] for job in response.data['created']))
+        self.assertEqual(GovtJob.objects.count(), 2)
+    
+    def test_update_changed_job(self):
+        """Test that an existing job_url with new content is updated in place"""
+        self.client.post(self.url, [self.job(1)], format='json')
+        response = self.client.post(self.url, [self.job(1, vacancies='65')], format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_updated'], 1)
+        self.assertEqual(response.data['total_created'], 0)
+        self.assertEqual(GovtJob.objects.get().vacancies, '65')
+    
+    def test_unchanged_job_not_written(self):
+        """Test that re-sending identical content does not touch updated_at"""
+        self.client.post(self.url, [self.job(1)], format='json')
+        before = GovtJob.objects.get().updated_at
+        response = self.client.post(
+            self.url, [self.job(1, scraped_at='2025-11-04 12:00:00')], format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_updated'], 0)
+        self.assertEqual(response.data['skipped'][0]['reason'], 'unchanged')
+        self.assertEqual(GovtJob.objects.get().updated_at, before)
+    
+    def test_partial_update_keeps_missing_fields(self):
+        """Test that fields absent from the payload are left as stored"""
+        self.client.post(self.url, [self.job(1)], format='json')
+        self.client.post(self.url, [{'job_url': self.job(1)['job_url'], 'vacancies': '5'}], format='json')
+        job = GovtJob.objects.get()
+        self.assertEqual(job.vacancies, '5')
+        self.assertEqual(job.deadline, '25 November 2025 at 5:00 PM')
+    
+    def test_duplicate_urls_in_batch(self):
+        """Test that the last occurrence of a job_url in a batch wins"""
+        response = self.client.post(
+            self.url, [self.job(1), self.job(1, vacancies='20')], format='json'
+        )
+        self.assertEqual(response.data['total_created'], 1)
+        self.assertEqual(response.data['skipped'][0]['reason'], 'duplicate')
+        self.assertEqual(GovtJob.objects.get().vacancies, '20')
+    
+    def test_summary_response(self):
+        """Test that ?response=summary returns ids and counts without echoing rows"""
+        self.client.post(self.url, [self.job(1)], format='json')
+        response = self.client.post(
+            self.url + '?response=summary', [self.job(1, vacancies='65'), self.job(2)], format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertNotIn('created', response.data)
+        self.assertNotIn('skipped', response.data)
+        self.assertEqual(response.data['created_ids'], [GovtJob.objects.get(job_url=self.job(2)['job_url']).pk])
+        self.assertEqual(response.data['updated_ids'], [GovtJob.objects.get(job_url=self.job(1)['job_url']).pk])
+        self.assertEqual(response.data['total_updated'], 1)
+    
+    def test_query_count_per_chunk(self):
+        """Test that a mixed batch costs a fixed number of statements"""
+        self.client.post(self.url, [self.job(i) for i in range(10)], format='json')
+        payload = [self.job(i, vacancies='99') for i in range(5)]
+        payload += [self.job(i) for i in range(5, 10)]
+        payload += [self.job(i) for i in range(10, 20)]
+        # 2 savepoints + release each, SELECT, INSERT, id lookup, UPDATE, daily
+        # rollup UPDATE, search vocabulary lookup (every word is known already)
+        with self.assertNumQueries(10):
+            created, updated, skipped, errors = upsert_jobs(payload)
+        self.assertEqual(len(created), 10)
+        self.assertEqual(len(updated), 5)
+        self.assertEqual(len(skipped), 5)
+
+
+class GetDataPaginationTest(TestCase):
+    """Test cases for keyset pagination of the get-data endpoints"""
+    
+    def setUp(self):
+        caches['responses'].clear()
+    
+    def test_week_pages(self):
+        """Test that the week endpoint pages through rows with a cursor"""
+        GovtJob.objects.bulk_create(
+            [GovtJob(job_title=f'Job {n}', job_url=f'https://bdgovtjob.net/job-{n}/') for n in range(3)]
+        )
+        first = self.client.get('/bdgovjob/get-data/week/?limit=2')
+        self.assertEqual(len(first.data['jobs']), 2)
+        second = self.client.get(first.data['next'])
+        self.assertEqual(len(second.data['jobs']), 1)
+        self.assertIsNone(second.data['next'])
+        ids = [job['id'] for job in first.data['jobs'] + second.data['jobs']]
+        self.assertEqual(sorted(ids, reverse=True), ids)
+        self.assertEqual(first.data['count'], 3)
+        self.assertEqual(second.data['count'], 3)
+    
+    def test_one_query_per_endpoint(self):
+        """Test that every list endpoint fetches rows and count in one query"""
+        GovtJob.objects.create(job_title='Job', job_url='https://bdgovtjob.net/job/')
+        today = timezone.now().date()
+        for url in ['/bdgovjob/get-data/', '/bdgovjob/get-data/?title=Job&days=1',
+                    '/bdgovjob/get-data/today/', '/bdgovjob/get-data/yesterday/',
+                    '/bdgovjob/get-data/week/', '/bdgovjob/get-data/month/',
+                    f'/bdgovjob/get-data/date/{today}/', '/bdgovjob/get-data/month/?limit=10']:
+            with self.subTest(url=url), self.assertNumQueries(1):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class SparseFieldsTest(TestCase):
+    """Test cases for ?fields= on the list endpoints"""
+    
+    def test_fields(self):
+        """Test that only the requested fields are returned, unknown ones rejected"""
+        caches['responses'].clear()
+        upsert_jobs([{'job_title': 'Planning Division Job Circular', 'job_url': 'https://bdgovtjob.net/pd', 'deadline': '30 Nov 2025'}])
+        response = self.client.get('/bdgovjob/get-data/week/', {'fields': 'job_title,deadline'})
+        self.assertEqual(response.data['jobs'], [{'job_title': 'Planning Division Job Circular', 'deadline': '30 Nov 2025'}])
+        response = self.client.get('/bdgovjob/get-data/', {'fields': 'job_title,company_name'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class GetStatsTest(TestCase):
+    """Test cases for the single-query stats endpoint"""
+    
+    def setUp(self):
+        self.now = datetime(2025, 11, 15, 12, 0, tzinfo=dt_timezone.utc)
+        rows = [
+            ('today', datetime(2025, 11, 15, 0, 0), '5', '30 Nov 2025'),
+            ('yesterday', datetime(2025, 11, 14, 23, 59, 59), 'N/A', ''),
+            ('month-start', datetime(2025, 11, 1, 0, 0), '', None),
+            ('last-month', datetime(2025, 10, 31, 23, 59, 59), None, 'N/A'),
+            ('tomorrow', datetime(2025, 11, 16, 0, 0), 'n/a', '1 Dec 2025'),
+        ]
+        for slug, created_at, vacancies, deadline in rows:
+            job = GovtJob.objects.create(
+                job_title=slug, job_url=f'https://bdgovtjob.net/{slug}/', vacancies=vacancies, deadline=deadline,
+            )
+            GovtJob.objects.filter(pk=job.pk).update(created_at=created_at.replace(tzinfo=dt_timezone.utc))
+        call_command('rebuild_rollups', stdout=StringIO())
+    
+    def test_one_query(self):
+        """Test that stats are one aggregate over the rollups with calendar-day periods"""
+        with mock.patch('django.utils.timezone.now', return_value=self.now), self.assertNumQueries(1):
+            response = self.client.get('/bdgovjob/stats/')
+        self.assertEqual(response.data, {
+            'total_jobs': 5,
+            'today': 1,
+            'this_week': 3,
+            'this_month': 4,
+            'with_vacancies': 1,
+            'with_deadlines': 2,
+            'total_vacancies': 5,
+            'last_updated': datetime(2025, 11, 16, 0, 0, tzinfo=dt_timezone.utc),
+        })
+    
+    def test_not_modified_in_one_query(self):
+        """Test that a conditional stats request is one query as well"""
+        etag = self.client.get('/bdgovjob/stats/')['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get('/bdgovjob/stats/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class GetStatsConditionalTest(TestCase):
+    """Test cases for ETag / Last-Modified on the stats endpoint"""
+    
+    def test_update_changes_etag(self):
+        """Test that stats answer 304 until a job is updated"""
+        job = {'job_title': 'Job', 'job_url': 'https://bdgovtjob.net/job/'}
+        upsert_jobs([job])
+        etag = self.client.get('/bdgovjob/stats/')['ETag']
+        response = self.client.get('/bdgovjob/stats/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        upsert_jobs([dict(job, vacancies='5')])
+        response = self.client.get('/bdgovjob/stats/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['with_vacancies'], 1)
+    
+    def test_saves_and_deletes_change_stats(self):
+        """Test that admin-style saves and ORM deletes keep the stats and their ETag current"""
+        upsert_jobs([{'job_title': f'Job {n}', 'job_url': f'https://bdgovtjob.net/job-{n}/'} for n in range(7)])
+        etag = self.client.get('/bdgovjob/stats/')['ETag']
+        job = GovtJob.objects.get(job_url='https://bdgovtjob.net/job-0/')
+        job.vacancies = '12'
+        job.save()
+        GovtJob.objects.filter(job_url__in=[f'https://bdgovtjob.net/job-{n}/' for n in (4, 5, 6)]).delete()
+        response = self.client.get('/bdgovjob/stats/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_jobs'], 4)
+        self.assertEqual(response.data['with_vacancies'], 1)
+        self.assertEqual(response.data['total_vacancies'], 12)
+        call_command('rebuild_rollups', stdout=StringIO())
+        self.assertEqual(self.client.get('/bdgovjob/stats/').data, response.data)
+
+
+class TimeseriesTest(TestCase):
+    """Test cases for the timeseries/ endpoint"""
+    
+    def test_rollups_and_filters_agree(self):
+        """Test that rollup and filtered counts fill the same buckets"""
+        upsert_jobs([
+            {'job_title': 'Bangladesh Bank Job Circular', 'job_url': 'https://bdgovtjob.net/bb/'},
+            {'job_title': 'Planning Division Job Circular', 'job_url': 'https://bdgovtjob.net/pd/'},
+        ])
+        response = self.client.get('/bdgovjob/timeseries/', {'days': 7})
+        self.assertEqual([point['count'] for point in response.data['series']], [0] * 6 + [2])
+        response = self.client.get('/bdgovjob/timeseries/', {'days': 7, 'title': 'bank'})
+        self.assertEqual([point['count'] for point in response.data['series']], [0] * 6 + [1])
+        self.assertEqual(response.data['filters']['title'], 'bank')
+
+
+class TypedFieldsTest(TestCase):
+    """Test cases for the parsed vacancies_int / deadline_at / posted_on columns"""
+    
+    def setUp(self):
+        upsert_jobs([
+            {'job_title': 'Bank Job', 'job_url': 'https://bdgovtjob.net/bank/', 'vacancies': '1,017',
+             'deadline': '25 November 2025 at 5:00 PM', 'posted_date': '3 November, 2025'},
+            {'job_title': 'Police Job', 'job_url': 'https://bdgovtjob.net/police/', 'vacancies': '৬৫ জন',
+             'deadline': '30/11/2025'},
+            {'job_title': 'Rail Job', 'job_url': 'https://bdgovtjob.net/rail/', 'vacancies': 'N/A', 'deadline': 'N/A'},
+        ])
+    
+    def test_parsed_on_ingest(self):
+        """Test that upserts store the typed copies and keep them in step with the text"""
+        job = GovtJob.objects.get(job_url='https://bdgovtjob.net/bank/')
+        self.assertEqual(job.vacancies_int, 1017)
+        self.assertEqual(job.deadline_at, datetime(2025, 11, 25, 17, 0, tzinfo=dt_timezone.utc))
+        self.assertEqual(str(job.posted_on), '2025-11-03')
+        upsert_jobs([{'job_title': 'Bank Job', 'job_url': 'https://bdgovtjob.net/bank/', 'vacancies': '12'}])
+        self.assertEqual(GovtJob.objects.get(pk=job.pk).vacancies_int, 12)
+        self.assertEqual(self.client.get('/bdgovjob/stats/').data['total_vacancies'], 12 + 65)
+    
+    def test_range_filters(self):
+        """Test deadline_after / deadline_before (both days included) and min_vacancies"""
+        def urls(**params):
+            response = self.client.get('/bdgovjob/get-data/', params)
+            return sorted(job['job_url'].split('/')[-2] for job in response.data['jobs'])
+        
+        self.assertEqual(urls(deadline_before='2025-11-25'), ['bank'])
+        self.assertEqual(urls(deadline_after='2025-11-26'), ['police'])
+        self.assertEqual(urls(deadline_after='2025-11-25', deadline_before='2025-11-30'), ['bank', 'police'])
+        self.assertEqual(urls(min_vacancies=100), ['bank'])
+        self.assertEqual(urls(min_vacancies='many', deadline_after='soon'), ['bank', 'police', 'rail'])
+    
+    def test_backfill_command(self):
+        """Test that backfill_govtjob_fields parses rows written around the ingest path"""
+        GovtJob.objects.update(vacancies_int=None, deadline_at=None, posted_on=None)
+        caches['responses'].clear()
+        cached = self.client.get('/bdgovjob/get-data/today/')
+        out = StringIO()
+        call_command('backfill_govtjob_fields', batch_size=2, stdout=out)
+        self.assertIn('Parsed 3 row(s), updated 2', out.getvalue())
+        response = self.client.get('/bdgovjob/get-data/today/', HTTP_IF_NONE_MATCH=cached['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(sorted(job['vacancies_int'] or 0 for job in response.data['jobs']), [0, 65, 1017])
+        self.assertEqual(list(GovtJob.objects.order_by('job_url').values_list('vacancies_int', flat=True)), [1017, 65, None])
+        self.assertEqual(self.client.get('/bdgovjob/stats/').data['total_vacancies'], 1017 + 65)
+
+
+class GovtJobRowsGoldenTest(TestCase):
+    """Test cases for the values_list() read path against GovtJobSerializer"""
+    
+    def test_matches_serializer(self):
+        """Test that the fast path renders byte-for-byte like GovtJobSerializer"""
+        GovtJob.objects.create(job_title='Job 1', job_url='https://bdgovtjob.net/job-1/', vacancies='1,017',
+                               deadline='30 Nov 2025 5:00 PM', posted_date='3 November, 2025',
+                               scraped_at='2025-11-03 10:30:15')
+        GovtJob.objects.create(job_title='সরকারি চাকরি', vacancies='N/A', deadline='', scraped_at=None)
+        qs = GovtJob.objects.order_by('-created_at', '-id')
+        for tz in ('UTC', 'Asia/Dhaka'):
+            with self.subTest(tz=tz), timezone.override(tz):
+                self.assertEqual(
+                    JSONRenderer().render(GOVTJOB_ROWS.serialize(qs)),
+                    JSONRenderer().render(GovtJobSerializer(qs, many=True).data),
+                )
+
+
+class SearchTest(TestCase):
+    """Test cases for ?q= full-text search on get-data"""
+    
+    def test_search_titles(self):
+        """Test that ?q= matches job titles by word prefix"""
+        GovtJob.objects.create(job_title='Bangladesh Bank Job Circular 2025', job_url='https://bdgovtjob.net/bb/')
+        GovtJob.objects.create(job_title='Planning Division Job Circular', job_url='https://bdgovtjob.net/pd/')
+        response = self.client.get('/bdgovjob/get-data/', {'q': 'bangladesh circ'})
+        self.assertEqual([job['job_url'] for job in response.data['jobs']], ['https://bdgovtjob.net/bb/'])
+        self.assertEqual(response.data['filters']['q'], 'bangladesh circ')
+
+
+@skipUnless(connection.vendor == 'sqlite', 'the FTS5 triggers are SQLite only')
+class SearchTriggersMigrationTest(TransactionTestCase):
+    """Test cases for the FTS5 triggers across the table rebuilds of migration 0004"""
+    
+    def indexed(self, title):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO bdgovjob_govtjob (job_title, job_url, created_at, updated_at) "
+                "VALUES (%s, %s, '2025-11-03 00:00:00', '2025-11-03 00:00:00')", [title, f'https://bdgovtjob.net/{title}/'],
+            )
+            cursor.execute('SELECT count(*) FROM bdgovjob_govtjob_fts WHERE bdgovjob_govtjob_fts MATCH %s', [title])
+            return cursor.fetchone()[0]
+    
+    def test_triggers_survive_both_directions(self):
+        """Test that new titles stay searchable after migrating back to 0003 and forward again"""
+        self.addCleanup(call_command, 'migrate', 'bdgovjob', verbosity=0)
+        call_command('migrate', 'bdgovjob', '0003', verbosity=0)
+        self.assertEqual(self.indexed('backwards'), 1)
+        call_command('migrate', 'bdgovjob', verbosity=0)
+        self.assertEqual(self.indexed('forwards'), 1)
+    
+    def test_forwards_parses_stored_rows(self):
+        """Test that migrating to 0004 fills the typed fields and rollups of rows stored before it"""
+        self.addCleanup(call_command, 'migrate', 'bdgovjob', verbosity=0)
+        call_command('migrate', 'bdgovjob', '0003', verbosity=0)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO bdgovjob_govtjob (job_title, job_url, vacancies, deadline, created_at, updated_at) "
+                "VALUES ('stored', 'https://bdgovtjob.net/stored/', '৬৫ জন', '30 Nov 2025', "
+                "'2025-11-03 00:00:00', '2025-11-03 00:00:00')"
+            )
+        call_command('migrate', 'bdgovjob', verbosity=0)
+        job = GovtJob.objects.get(job_url='https://bdgovtjob.net/stored/')
+        self.assertEqual(job.vacancies_int, 65)
+        self.assertIsNotNone(job.deadline_at)
+        self.assertEqual(rollups.summary(IngestBatch.SOURCE_GOVTJOBS)['total_vacancies'], 65)
+
+
+class FuzzySearchTest(TestCase):
+    """Test cases for the typo-tolerant search/ endpoint"""
+    
+    def test_misspelled_title(self):
+        """Test that a misspelled title finds the closest job first"""
+        upsert_jobs([
+            {'job_title': 'Bangladesh Bank Job Circular 2025', 'job_url': 'https://bdgovtjob.net/bb'},
+            {'job_title': 'Planning Division Job Circular', 'job_url': 'https://bdgovtjob.net/pd'},
+        ])
+        response = self.client.get('/bdgovjob/search/', {'q': 'Bangladsh Bnk'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['query'], 'Bangladsh Bnk')
+        self.assertEqual([job['job_url'] for job in response.data['results']], ['https://bdgovtjob.net/bb'])
+    
+    def test_updated_title_searchable(self):
+        """Test that words of an updated title join the vocabulary"""
+        upsert_jobs([{'job_title': 'Planning Division Job Circular', 'job_url': 'https://bdgovtjob.net/pd'}])
+        upsert_jobs([{'job_title': 'Planning Commission Job Circular', 'job_url': 'https://bdgovtjob.net/pd'}])
+        response = self.client.get('/bdgovjob/search/', {'q': 'comission'})
+        self.assertEqual(response.data['count'], 1)
+
+
+class ExportTest(TestCase):
+    """Test cases for the streaming export/ endpoint"""
+    
+    def test_csv_export(self):
+        """Test that the CSV streams the scraped columns of the filtered jobs"""
+        upsert_jobs([
+            {'job_title': 'Planning Division Job Circular', 'job_url': 'https://bdgovtjob.net/pd',
+             'vacancies': '12', 'deadline': '30 Nov 2025', 'scraped_at': '2025-11-03 12:00:00'},
+            {'job_title': 'Bangladesh Bank Job Circular', 'job_url': 'https://bdgovtjob.net/bb'},
+        ])
+        response = self.client.get('/bdgovjob/export/', {'title': 'planning'})
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        content = b''.join(response.streaming_content).decode('utf-8-sig')
+        self.assertEqual(list(csv.DictReader(StringIO(content))), [{
+            'job_title': 'Planning Division Job Circular',
+            'job_url': 'https://bdgovtjob.net/pd',
+            'vacancies': '12',
+            'deadline': '30 Nov 2025',
+            'posted_date': '',
+            'scraped_at': '2025-11-03 12:00:00',
+        }])
+
+
+class SendDataStreamTest(TestCase):
+    """Test cases for the NDJSON streaming upsert endpoint"""
+    
+    def test_stream_upsert(self):
+        """Test that streamed chunks create, update and skip like send-data"""
+        GovtJob.objects.create(job_title='Old', job_url='https://bdgovtjob.net/job-1/')
+        lines = [
+            {'job_title': 'New', 'job_url': 'https://bdgovtjob.net/job-1/'},
+            {'job_title': 'Job 2', 'job_url': 'https://bdgovtjob.net/job-2/'},
+            {'job_title': 'Job 2', 'job_url': 'https://bdgovtjob.net/job-2/'},
+        ]
+        body = ''.join(json.dumps(line) + '\n' for line in lines)
+        with self.settings(INGEST_STREAM_CHUNK_SIZE=1):
+            response = self.client.post(
+                '/bdgovjob/send-data/stream/', body, content_type='application/x-ndjson'
+            )
+            progress = [json.loads(l) for l in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual(len(progress), 4)
+        summary = progress[-1]
+        self.assertEqual((summary['created'], summary['updated'], summary['skipped']), (1, 1, 1))
+        self.assertEqual(GovtJob.objects.get(job_url='https://bdgovtjob.net/job-1/').job_title, 'New')
+
+
+class ImportGovtJobsCommandTest(TestCase):
+    """Test cases for the import_govtjobs command"""
+    
+    def test_import_upserts(self):
+        """Test that a CSV import creates new jobs and updates changed ones"""
+        GovtJob.objects.create(job_title='Old', job_url='https://bdgovtjob.net/job-0/')
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        path = os.path.join(tmpdir, 'bdgovtjobs.csv')
+        with open(path, 'w', newline='', encoding='utf-8-sig') as handle:
+            writer = csv.writer(handle)
+            writer.writerow(['job_title', 'job_url', 'vacancies', 'deadline', 'posted_date', 'scraped_at'])
+            for n in range(3):
+                writer.writerow([f'Job {n}', f'https://bdgovtjob.net/job-{n}/', 'N/A', '', '', '2025-11-03 10:30:00'])
+        
+        out = StringIO()
+        call_command('import_govtjobs', path, stdout=out)
+        
+        self.assertIn('created=2, updated=1, skipped=0', out.getvalue())
+        job = GovtJob.objects.get(job_url='https://bdgovtjob.net/job-0/')
+        self.assertEqual(job.job_title, 'Job 0')
+        self.assertIsNone(job.vacancies)
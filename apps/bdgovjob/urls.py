@@ -1,18 +1,26 @@
 from django.urls import path
+from apps.core.api_views import IngestBatchView
+from apps.core.models import IngestBatch
 from .api_views import (
     SendDataView, 
+    SendDataStreamView,
     GetDataView,
     GetTodayDataView,
     GetYesterdayDataView,
     GetWeekDataView,
     GetMonthDataView,
     GetDateDataView,
+    SearchView,
+    ExportView,
     GetStatsView,
+    TimeseriesView,
 )
 
 urlpatterns = [
     # Data submission endpoint
     path('send-data/', SendDataView.as_view(), name='bdgovjob_send_data'),
+    path('send-data/stream/', SendDataStreamView.as_view(), name='bdgovjob_send_data_stream'),
+    path('ingest-batches/<int:batch_id>/', IngestBatchView.as_view(source=IngestBatch.SOURCE_GOVTJOBS), name='bdgovjob_ingest_batch'),
     
     # Smart filtering endpoints
     path('get-data/', GetDataView.as_view(), name='bdgovjob_get_data'),
@@ -24,5 +32,14 @@ urlpatterns = [
     
     # Statistics endpoint
     path('stats/', GetStatsView.as_view(), name='bdgovjob_stats'),
+    
+    # Job volume per hour / day / week
+    path('timeseries/', TimeseriesView.as_view(), name='bdgovjob_timeseries'),
+    
+    # Typo-tolerant search
+    path('search/', SearchView.as_view(), name='bdgovjob_search'),
+    
+    # Streaming CSV / NDJSON download (get-data filters)
+    path('export/', ExportView.as_view(), name='bdgovjob_export'),
 ]
 
@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import IngestBatch
+
+
+@admin.register(IngestBatch)
+class IngestBatchAdmin(admin.ModelAdmin):
+    list_display = ('id', 'source', 'status', 'processed_items', 'total_items', 'created_at', 'finished_at')
+    list_filter = ('source', 'status')
+    readonly_fields = ('created_at', 'started_at', 'finished_at')
+    exclude = ('payload',)
@@ -0,0 +1,17 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from .models import IngestBatch
+from .serializers import IngestBatchSerializer
+
+
+class IngestBatchView(APIView):
+    """GET: progress and per-item errors of a queued send-data batch."""
+
+    source = None
+
+    def get(self, request, batch_id):
+        batch = IngestBatch.objects.filter(source=self.source, pk=batch_id).first()
+        if batch is None:
+            return Response({'error': 'Ingest batch not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(IngestBatchSerializer(batch).data)
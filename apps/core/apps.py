@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.core'
+    verbose_name = 'Ingest Infrastructure'
+
+    def ready(self):
+        from .rollups import connect_signals
+        connect_signals()
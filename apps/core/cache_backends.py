@@ -0,0 +1,38 @@
+"""Cache backends used by the response cache.
+
+Django's ``FileBasedCache`` culls a random sample of entries when it is
+full. ``LRUFileBasedCache`` culls the least recently used ones instead,
+like ``LocMemCache`` does, so both supported backends keep the hot entries.
+"""
+import os
+from django.core.cache.backends.filebased import FileBasedCache
+
+
+def _mtime(path):
+    try:
+        return os.path.getmtime(path)
+    except OSError:
+        return 0
+
+
+class LRUFileBasedCache(FileBasedCache):
+    """File cache that evicts by last access; ``get`` refreshes the file's mtime."""
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, default, version)
+        if value is not default:
+            try:
+                os.utime(self._key_to_file(key, version))
+            except OSError:
+                pass
+        return value
+
+    def _cull(self):
+        filelist = self._list_cache_files()
+        if len(filelist) < self._max_entries:
+            return
+        if self._cull_frequency == 0:
+            return self.clear()
+        filelist.sort(key=_mtime)
+        for fname in filelist[:len(filelist) // self._cull_frequency]:
+            self._delete(fname)
@@ -0,0 +1,161 @@
+"""Response compression negotiated from ``Accept-Encoding``.
+
+The list endpoints return large, repetitive JSON (the same company names,
+URL prefixes and timestamps on every row), which gzip shrinks several
+times over. ``CompressionMiddleware`` picks the best coding the client
+accepts: ``br`` when the optional ``brotli`` package is installed, else
+``gzip``. Bodies under ``COMPRESSION_MIN_SIZE`` bytes are sent as they
+are.
+
+Streamed responses (``export/``, ``send-data/stream/``) are compressed
+chunk by chunk with a flush after each, so every chunk still reaches the
+client as soon as it is produced.
+
+Responses of the cached period endpoints carry the key of their
+``apps.core.response_cache`` entry. Their compressed bytes are stored
+next to it, under the same data version, so a hot response is compressed
+once rather than on every hit. Only anonymous JSON is stored that way:
+the browsable API's HTML carries the user's name and CSRF token.
+
+Like Django's ``GZipMiddleware``, a strong ``ETag`` becomes weak once the
+body is compressed; ``apps.core.conditional`` compares them weakly.
+"""
+import zlib
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:  # optional: pip install brotli
+    brotli = None
+
+# Attribute set by ``cached_response`` on the responses it may reuse.
+CACHE_KEY_ATTR = 'compression_key'
+# The only rendering whose compressed bytes are cached; it holds nothing
+# about the user, unlike the browsable API.
+SHARED_MEDIA_TYPE = 'application/json'
+
+
+class GzipEncoder:
+    name = 'gzip'
+
+    def __init__(self):
+        # wbits 16 + MAX_WBITS writes a gzip header (with mtime 0, so equal
+        # bodies compress to equal bytes).
+        self._compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data):
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data=b''):
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliEncoder:
+    name = 'br'
+
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+
+    def compress(self, data):
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self, data=b''):
+        return self._compressor.process(data) + self._compressor.finish()
+
+
+def available_encoders():
+    """Supported encoders, most preferred first."""
+    return ([BrotliEncoder] if brotli is not None else []) + [GzipEncoder]
+
+
+def _qualities(accept_encoding):
+    qualities = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        qualities[coding] = quality
+    return qualities
+
+
+def negotiate(accept_encoding):
+    """Return the encoder class to use for ``accept_encoding``, or None."""
+    qualities = _qualities(accept_encoding or '')
+    best, best_quality = None, 0.0
+    for encoder in available_encoders():
+        quality = qualities.get(encoder.name, qualities.get('*', 0.0))
+        if quality > best_quality:
+            best, best_quality = encoder, quality
+    return best
+
+
+def _stream(chunks, encoder):
+    for chunk in chunks:
+        data = encoder.compress(chunk)
+        if data:
+            yield data
+    yield encoder.finish()
+
+
+def _shareable(request, response):
+    """Whether ``response``'s bytes are the same for every client."""
+    media_type = response.get('Content-Type', '').partition(';')[0].strip().lower()
+    if media_type != SHARED_MEDIA_TYPE:
+        return False
+    user = getattr(request, 'user', None)
+    return not (user is not None and user.is_authenticated) and 'HTTP_AUTHORIZATION' not in request.META
+
+
+def _compressed_content(request, response, encoder_class):
+    key = getattr(response, CACHE_KEY_ATTR, None)
+    if key is None or not settings.RESPONSE_CACHE_TTL or not _shareable(request, response):
+        return encoder_class().finish(response.content)
+    cache = caches['responses']
+    key = f'{key}:{encoder_class.name}'
+    content = cache.get(key)
+    if content is None:
+        content = encoder_class().finish(response.content)
+        cache.set(key, content, settings.RESPONSE_CACHE_TTL)
+    return content
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Compress responses with the best coding the client accepts."""
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding'):
+            return response
+        if not response.streaming and len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoder_class = negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoder_class is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = _stream(response.streaming_content, encoder_class())
+            del response['Content-Length']
+        else:
+            content = _compressed_content(request, response, encoder_class)
+            if len(content) >= len(response.content):
+                return response
+            response.content = content
+            response['Content-Length'] = str(len(content))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoder_class.name
+        return response
@@ -0,0 +1,120 @@
+"""ETag / Last-Modified validators for the get-data and stats endpoints.
+
+The validator of a response is the newest timestamp (``updated_at`` where
+the model has one, else ``created_at``) and the number of rows it covers,
+plus today's date because the period endpoints also change at midnight.
+
+A plain request derives the validator from the rows it fetched anyway, so
+it costs no query. A conditional request (``If-None-Match`` or
+``If-Modified-Since``) first runs one ``MAX``/``COUNT`` aggregate over the
+same rows; on a match the view answers ``304 Not Modified`` without
+fetching or serializing anything.
+"""
+import functools
+import hashlib
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class NotModified(Exception):
+    """Raised by ``check`` when the client's copy is still current."""
+
+    def __init__(self, etag, last_modified):
+        super().__init__(etag)
+        self.etag = etag
+        self.last_modified = last_modified
+
+
+def timestamp_field(model):
+    names = {field.name for field in model._meta.get_fields()}
+    return 'updated_at' if 'updated_at' in names else 'created_at'
+
+
+def make_validator(last_modified, count):
+    """Return ``(etag, last_modified)`` for a newest timestamp and a row count."""
+    stamp = last_modified.isoformat() if last_modified else ''
+    raw = f'{stamp}|{count}|{timezone.now().date()}'
+    return quote_etag(hashlib.sha1(raw.encode('utf-8')).hexdigest()), last_modified
+
+
+def is_conditional(request):
+    return 'If-None-Match' in request.headers or 'If-Modified-Since' in request.headers
+
+
+def matches(request, etag, last_modified):
+    """True when the request's validators say the client's copy is current.
+
+    ETags compare weakly: a compressed response sends ``W/"..."``.
+    """
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match is not None:
+        tags = [tag[2:] if tag.startswith('W/') else tag for tag in parse_etags(if_none_match)]
+        return if_none_match.strip() == '*' or etag in tags
+    since = parse_http_date_safe(request.headers.get('If-Modified-Since', ''))
+    if since is None or last_modified is None:
+        return False
+    return int(last_modified.timestamp()) <= since
+
+
+def set_headers(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
+
+
+def not_modified(etag, last_modified):
+    return set_headers(Response(status=status.HTTP_304_NOT_MODIFIED), etag, last_modified)
+
+
+def _aggregate(scope):
+    # On a sliced (page) queryset Django aggregates over the page as a subquery.
+    result = scope.aggregate(last_modified=Max(timestamp_field(scope.model)), count=Count('pk'))
+    return make_validator(result['last_modified'], result['count'])
+
+
+def check(request, scope):
+    """Validate a conditional request against the rows of ``scope``.
+
+    Does nothing for plain requests. Otherwise runs one aggregate, raises
+    ``NotModified`` on a match and remembers the validator for the response.
+    """
+    if not is_conditional(request):
+        return
+    request.validator = _aggregate(scope)
+    if matches(request, *request.validator):
+        raise NotModified(*request.validator)
+
+
+def check_values(request, last_modified, count):
+    """Like ``check``, for views that aggregated the validator values themselves.
+
+    Sets the validator for plain requests too (stats).
+    """
+    request.validator = make_validator(last_modified, count)
+    if is_conditional(request) and matches(request, *request.validator):
+        raise NotModified(*request.validator)
+
+
+def remember(request, last_modified, count):
+    """Set the validator from values the view fetched anyway, unless ``check`` did."""
+    if getattr(request, 'validator', None) is None:
+        request.validator = make_validator(last_modified, count)
+
+
+def conditional(method):
+    """Decorate an ``APIView`` ``get``: answer 304 or add ETag/Last-Modified."""
+    @functools.wraps(method)
+    def wrapper(view, request, *args, **kwargs):
+        request.validator = None
+        try:
+            response = method(view, request, *args, **kwargs)
+        except NotModified as exc:
+            return not_modified(exc.etag, exc.last_modified)
+        if response.status_code == status.HTTP_200_OK and request.validator is not None:
+            set_headers(response, *request.validator)
+        return response
+    return wrapper
@@ -0,0 +1,199 @@
+"""Typo-tolerant search behind the ``search/`` endpoints.
+
+``?q=`` on get-data needs every word spelled right; "Bangladsh Bank" or
+another transliteration of a Bengali name finds nothing. Here words are
+compared by trigram similarity, the measure of PostgreSQL's ``pg_trgm``:
+a word is padded to ``"  word "`` and split into its three-letter
+windows, and two words are as similar as the Jaccard index of their
+trigram sets.
+
+Comparing the query with every row would be a full-table scan, so the
+comparison runs against the vocabulary instead. Every distinct word of
+the searchable columns is a ``SearchTerm`` with one ``SearchTermTrigram``
+posting per trigram, kept up to date by the ingest paths
+(``index_terms``) and rebuilt by ``manage.py rebuild_search_terms``. The
+vocabulary grows with the number of distinct words, not rows. A query
+then costs:
+
+1. one grouped lookup per query word on the trigram postings, returning
+   the vocabulary words that share the most trigrams with it;
+2. one indexed search (``apps.core.search.search_groups``) for the
+   newest ``CANDIDATE_ROWS`` rows holding, for every query word, one of
+   its ``EXPANSIONS`` closest words (plus a second search for rows close
+   to only some query words when that finds too few);
+3. scoring those candidates in Python: for each query word the best
+   similarity to a word of the row, averaged over the query words.
+
+The side tables work on SQLite and PostgreSQL alike, without the
+``pg_trgm`` extension.
+"""
+import functools
+import re
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Count
+from .models import IngestBatch, SearchTerm, SearchTermTrigram
+from .search import search_groups
+
+# Words below this similarity to a query word are not searched for.
+SIMILARITY_THRESHOLD = 0.3
+# Vocabulary words considered per query word, most shared trigrams first.
+CANDIDATE_TERMS = 50
+# Of those, the most similar ones searched for.
+EXPANSIONS = 8
+# Rows scored per query, newest first.
+CANDIDATE_ROWS = 500
+
+# Per-source model whose ``SEARCH_FIELDS`` make up the vocabulary.
+MODELS = {
+    IngestBatch.SOURCE_HOTJOBS: 'n8n_integration.HotJob',
+    IngestBatch.SOURCE_GOVTJOBS: 'bdgovjob.GovtJob',
+}
+
+MAX_TERM_LENGTH = SearchTerm._meta.get_field('term').max_length
+_WORD = re.compile(r'\w+')
+# Words looked up and added per round trip.
+CHUNK_SIZE = 500
+
+
+def words(text):
+    """Lower-cased words of ``text``."""
+    return _WORD.findall((text or '').lower())
+
+
+@functools.lru_cache(maxsize=65536)
+def trigrams(word):
+    """The set of trigrams of ``word``, padded the way ``pg_trgm`` pads."""
+    padded = f'  {word} '
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def similarity(a, b):
+    """Trigram similarity of two words, between 0 and 1."""
+    first, second = trigrams(a), trigrams(b)
+    return len(first & second) / len(first | second)
+
+
+def _indexable(word):
+    # Numbers are matched exactly; misspelling one yields another number.
+    return len(word) > 1 and not word.isdigit() and len(word) <= MAX_TERM_LENGTH
+
+
+def index_terms(source, texts):
+    """Add the words of ``texts`` that are new to ``source``'s vocabulary.
+
+    Returns the number of words added.
+    """
+    vocabulary = {word for text in texts for word in words(text) if _indexable(word)}
+    added = 0
+    candidates = sorted(vocabulary)
+    for start in range(0, len(candidates), CHUNK_SIZE):
+        chunk = candidates[start:start + CHUNK_SIZE]
+        known = set(
+            SearchTerm.objects.filter(source=source, term__in=chunk).values_list('term', flat=True)
+        )
+        new = [word for word in chunk if word not in known]
+        if not new:
+            continue
+        with transaction.atomic():
+            SearchTerm.objects.bulk_create(
+                [SearchTerm(source=source, term=word) for word in new], ignore_conflicts=True,
+            )
+            stored = SearchTerm.objects.filter(source=source, term__in=new).values_list('pk', 'term')
+            SearchTermTrigram.objects.bulk_create(
+                [
+                    SearchTermTrigram(source=source, trigram=trigram, term_id=pk)
+                    for pk, term in stored
+                    for trigram in trigrams(term)
+                ],
+            )
+        added += len(new)
+    return added
+
+
+def rebuild_terms(source, batch_size=CHUNK_SIZE):
+    """Replace ``source``'s vocabulary with the words of its stored rows.
+
+    Drops words no row uses any more. Returns the number of words indexed.
+    """
+    model = apps.get_model(MODELS[source])
+    with transaction.atomic():
+        SearchTermTrigram.objects.filter(source=source).delete()
+        SearchTerm.objects.filter(source=source).delete()
+        added = 0
+        last_id = 0
+        while True:
+            rows = list(
+                model.objects.filter(pk__gt=last_id).order_by('pk')
+                .values_list('pk', *model.SEARCH_FIELDS)[:batch_size]
+            )
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            added += index_terms(source, [text for row in rows for text in row[1:]])
+    return added
+
+
+def similar_terms(source, word):
+    """Vocabulary words of ``source`` similar to ``word``, as ``{term: similarity}``."""
+    grams = trigrams(word)
+    postings = (
+        SearchTermTrigram.objects
+        .filter(source=source, trigram__in=grams)
+        .values('term__term')
+        .annotate(shared=Count('trigram', distinct=True))
+        .order_by('-shared')[:CANDIDATE_TERMS]
+    )
+    found = {}
+    for posting in postings:
+        term = posting['term__term']
+        score = posting['shared'] / (len(grams) + len(trigrams(term)) - posting['shared'])
+        if score >= SIMILARITY_THRESHOLD:
+            found[term] = score
+    best = sorted(found, key=lambda term: (-found[term], term))[:EXPANSIONS]
+    return {term: found[term] for term in best}
+
+
+def fuzzy_search(qs, text, source, columns, row_serializer, limit):
+    """Return the ``limit`` rows of ``qs`` closest to ``text`` in ``columns``.
+
+    Rows are the dicts ``row_serializer`` builds, best first, each with its
+    ``score`` (0 to 1) added.
+    """
+    query = [word for word in words(text) if len(word) <= MAX_TERM_LENGTH]
+    if not query:
+        return []
+    groups = [[word] + list(similar_terms(source, word)) if _indexable(word) else [word] for word in query]
+
+    # Rows close to every query word; when too few, rows close to any of them.
+    columns = list(columns)
+    rows = list(search_groups(qs, groups, columns, CANDIDATE_ROWS).order_by('-id').values_list('id', *columns))
+    if len(rows) < limit and len(groups) > 1:
+        seen = {row[0] for row in rows}
+        partial = search_groups(qs, groups, columns, CANDIDATE_ROWS, require_all=False).order_by('-id')
+        rows.extend(row for row in partial.values_list('id', *columns) if row[0] not in seen)
+
+    # Rows share most of their words, so each pair is compared once.
+    cache = {}
+
+    def closeness(word, row_word):
+        key = (word, row_word)
+        if key not in cache:
+            cache[key] = similarity(word, row_word)
+        return cache[key]
+
+    scores = {}
+    for pk, *texts in rows:
+        row_words = {word for text in texts for word in words(text)}
+        best = [max((closeness(word, row_word) for row_word in row_words), default=0.0) for word in query]
+        scores[pk] = sum(best) / len(query)
+    # Stable sort: equal scores stay newest first.
+    top = sorted(scores, key=scores.get, reverse=True)[:limit]
+
+    # Only the returned rows are read in full.
+    sources = row_serializer.sources
+    stored = {row[-1]: row for row in qs.filter(pk__in=top).values_list(*sources, 'id')}
+    results = row_serializer.to_dicts([stored[pk] for pk in top])
+    for result, pk in zip(results, top):
+        result['score'] = round(scores[pk], 4)
+    return results
@@ -0,0 +1,113 @@
+"""Idempotency-Key support for the send-data endpoints.
+
+n8n retries a POST when the response is slow. With ``@idempotent`` on a
+view method, the first request with a given key (the ``Idempotency-Key``
+header, or a hash of the body when the header is missing) runs normally.
+Its response is stored in the cache and in ``IdempotencyRecord``. A retry
+gets the stored response back (``Idempotent-Replayed: true``) without
+validation or dedup queries; on a cache hit it does not touch the database
+at all. A retry that arrives while the first request is still running gets
+409.
+"""
+import functools
+import hashlib
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from .models import IdempotencyRecord
+
+HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+CACHE_PREFIX = 'idempotency:'
+
+
+def request_key(request):
+    """Hash of method, path, Prefer header and the client key (or the body without one).
+
+    ``Prefer`` is part of the key because it changes the response shape.
+    """
+    supplied = request.headers.get(HEADER)
+    if supplied:
+        token = f'key:{supplied}'
+    else:
+        token = f'body:{hashlib.sha256(request.body).hexdigest()}'
+    prefer = request.headers.get('Prefer', '')
+    return hashlib.sha256(f'{request.method} {request.get_full_path()}\n{prefer}\n{token}'.encode('utf-8')).hexdigest()
+
+
+def _replay(status_code, data):
+    response = Response(data, status=status_code)
+    response[REPLAYED_HEADER] = 'true'
+    return response
+
+
+def _claim(key, path, now):
+    """Insert the in-progress record for ``key``; return it or the existing one.
+
+    Returns ``(record, created)``. Expired records and in-progress records
+    abandoned longer than ``IDEMPOTENCY_LOCK_TIMEOUT`` are replaced.
+    """
+    expires_at = now + timedelta(seconds=settings.IDEMPOTENCY_TTL)
+    for _ in range(2):
+        try:
+            with transaction.atomic():
+                return IdempotencyRecord.objects.create(key=key, path=path[:200], expires_at=expires_at), True
+        except IntegrityError:
+            record = IdempotencyRecord.objects.filter(key=key).first()
+            if record is None:
+                continue
+            abandoned = (
+                record.status_code is None
+                and record.created_at <= now - timedelta(seconds=settings.IDEMPOTENCY_LOCK_TIMEOUT)
+            )
+            if record.expires_at > now and not abandoned:
+                return record, False
+            record.delete()
+    raise IntegrityError(f'Could not claim idempotency key {key}')
+
+
+def idempotent(view_method):
+    """Decorate an APIView handler so retried requests replay the first response."""
+
+    @functools.wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request_key(request)
+        cache_key = CACHE_PREFIX + key
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return _replay(*cached)
+
+        now = timezone.now()
+        record, created = _claim(key, request.path, now)
+        if not created:
+            if record.status_code is None:
+                return Response(
+                    {'error': f'A request with this {HEADER} is still being processed. Retry later.'},
+                    status=status.HTTP_409_CONFLICT
+                )
+            ttl = (record.expires_at - now).total_seconds()
+            cache.set(cache_key, (record.status_code, record.response), timeout=ttl)
+            return _replay(record.status_code, record.response)
+
+        try:
+            response = view_method(self, request, *args, **kwargs)
+        except Exception:
+            record.delete()
+            raise
+        if response.status_code >= 500 or not hasattr(response, 'data'):
+            # Nothing worth replaying; let the retry run again.
+            record.delete()
+            return response
+
+        record.status_code = response.status_code
+        record.response = response.data
+        record.save(update_fields=['status_code', 'response'])
+        cache.set(cache_key, (record.status_code, record.response), timeout=settings.IDEMPOTENCY_TTL)
+        IdempotencyRecord.objects.filter(expires_at__lte=now).delete()
+        return response
+
+    return wrapper
@@ -0,0 +1,154 @@
+"""Bulk import of scraper output files (CSV or NDJSON).
+
+``ImportCommand`` is the base of the ``import_hotjobs`` and
+``import_govtjobs`` management commands. The file is streamed record by
+record, and each chunk goes through the app's ingest function in its own
+transaction. After every chunk a checkpoint file records how far the
+import got, so an interrupted import resumes where it stopped.
+"""
+import csv
+import json
+import os
+import time
+from django.core.management.base import BaseCommand, CommandError
+
+FORMATS = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}
+
+
+def iter_records(path, fmt):
+    """Yield one dict per CSV row or NDJSON line of ``path``."""
+    if fmt == 'csv':
+        # The scraper writes CSV with pandas' utf-8-sig (BOM) encoding.
+        with open(path, newline='', encoding='utf-8-sig') as handle:
+            yield from csv.DictReader(handle)
+    else:
+        with open(path, encoding='utf-8') as handle:
+            for line_number, line in enumerate(handle, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError as exc:
+                    raise CommandError(f'{path}:{line_number}: invalid JSON ({exc})')
+
+
+class Checkpoint:
+    """Number of records of a file already imported, stored next to it."""
+
+    def __init__(self, path, data_path):
+        self.path = path
+        stat = os.stat(data_path)
+        self.identity = {'file': os.path.abspath(data_path), 'size': stat.st_size, 'mtime': stat.st_mtime}
+
+    def load(self):
+        """Return the saved record count, or 0 if there is no checkpoint for this file."""
+        try:
+            with open(self.path) as handle:
+                saved = json.load(handle)
+        except (OSError, ValueError):
+            return 0
+        if any(saved.get(key) != value for key, value in self.identity.items()):
+            return 0
+        return saved.get('records', 0)
+
+    def save(self, records):
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w') as handle:
+            json.dump(dict(self.identity, records=records), handle)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class ImportCommand(BaseCommand):
+    """Stream a CSV/NDJSON file into the database in chunks.
+
+    Subclasses set ``ingest``, the app's counting ingest function (integer
+    counters plus an ``errors`` list, like ``ingest_counts``), and
+    ``normalize``, which cleans a chunk of records before it is ingested.
+    """
+
+    default_chunk_size = 1000
+    # Cleans each chunk before ``ingest``. The apps' normalizers turn scraper
+    # placeholders ('N/A', empty cells) into None instead of failing validation.
+    normalize = staticmethod(list)
+    ingest = None
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or NDJSON file to import.')
+        parser.add_argument(
+            '--format', choices=['csv', 'ndjson'],
+            help='File format (default: from the file extension).',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=self.default_chunk_size,
+            help=f'Records per transaction (default: {self.default_chunk_size}).',
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help='Checkpoint file (default: <path>.checkpoint).',
+        )
+        parser.add_argument(
+            '--restart', action='store_true',
+            help='Ignore an existing checkpoint and import from the first record.',
+        )
+
+    def ingest_chunk(self, records):
+        return self.ingest(self.normalize(records))
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.isfile(path):
+            raise CommandError(f'File not found: {path}')
+        fmt = options['format'] or FORMATS.get(os.path.splitext(path)[1].lower())
+        if fmt is None:
+            raise CommandError('Cannot tell the file format from its extension; pass --format.')
+        chunk_size = options['chunk_size']
+
+        checkpoint = Checkpoint(options['checkpoint'] or f'{path}.checkpoint', path)
+        resume_from = 0 if options['restart'] else checkpoint.load()
+        if resume_from:
+            self.stdout.write(f'Resuming after record {resume_from} (from {checkpoint.path})')
+
+        self.totals = {}
+        self.error_count = 0
+        self.done = self.resume_from = resume_from
+        self.started = time.perf_counter()
+        chunk = []
+        for position, record in enumerate(iter_records(path, fmt), start=1):
+            if position <= resume_from:
+                continue
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                self.flush(chunk, checkpoint)
+                chunk = []
+        if chunk:
+            self.flush(chunk, checkpoint)
+        checkpoint.clear()
+
+        elapsed = time.perf_counter() - self.started
+        imported = self.done - resume_from
+        summary = ', '.join(f'{key}={value}' for key, value in self.totals.items())
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {imported} record(s) in {elapsed:.1f}s ({imported / elapsed:.0f} records/s): '
+            f'{summary or "nothing new"}, errors={self.error_count}'
+        ))
+
+    def flush(self, chunk, checkpoint):
+        """Ingest one chunk, then record progress in the checkpoint."""
+        result = self.ingest_chunk(chunk)
+        errors = result.pop('errors', [])
+        for key, value in result.items():
+            self.totals[key] = self.totals.get(key, 0) + value
+        self.error_count += len(errors)
+        for error in errors[:5]:
+            self.stderr.write(f'  invalid record: {json.dumps(error, default=str)}')
+        if len(errors) > 5:
+            self.stderr.write(f'  ... and {len(errors) - 5} more invalid record(s) in this chunk')
+
+        self.done += len(chunk)
+        checkpoint.save(self.done)
+        elapsed = time.perf_counter() - self.started
+        self.stdout.write(f'{self.done} records ({(self.done - self.resume_from) / elapsed:.0f} records/s)')
@@ -0,0 +1,69 @@
+import threading
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.db import connections
+from apps.core.queue import claim_next_batch, process_batch, requeue_stale
+
+
+class Command(BaseCommand):
+    help = 'Drain queued send-data batches into HotJob/GovtJob with a pool of worker threads.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int, default=2,
+            help='Number of worker threads (default: 2). On SQLite writes serialize, so 1-2 is enough.',
+        )
+        parser.add_argument(
+            '--poll-interval', type=float, default=2.0,
+            help='Seconds to sleep when the queue is empty (default: 2).',
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Exit once the queue is empty instead of polling forever.',
+        )
+        parser.add_argument(
+            '--stale-after', type=int, default=3600,
+            help='Requeue batches left in processing for this many seconds by a dead worker (default: 3600).',
+        )
+
+    def handle(self, *args, **options):
+        requeued = requeue_stale(timedelta(seconds=options['stale_after']))
+        if requeued:
+            self.stdout.write(f'Requeued {requeued} stale batch(es)')
+
+        stop = threading.Event()
+        workers = [
+            threading.Thread(target=self.work, args=(stop, options), name=f'ingest-worker-{n}', daemon=True)
+            for n in range(max(1, options['concurrency']))
+        ]
+        for worker in workers:
+            worker.start()
+        try:
+            for worker in workers:
+                while worker.is_alive():
+                    worker.join(timeout=0.5)
+        except KeyboardInterrupt:
+            self.stdout.write('Stopping after the current batches...')
+            stop.set()
+            for worker in workers:
+                worker.join()
+
+    def work(self, stop, options):
+        try:
+            while not stop.is_set():
+                batch = claim_next_batch()
+                if batch is None:
+                    if options['once']:
+                        return
+                    stop.wait(options['poll_interval'])
+                    continue
+                started = time.perf_counter()
+                batch = process_batch(batch)
+                self.stdout.write(
+                    f'[{threading.current_thread().name}] batch #{batch.pk} ({batch.source}) '
+                    f'{batch.status}: {batch.processed_items}/{batch.total_items} items, '
+                    f'{batch.counts} in {time.perf_counter() - started:.2f}s'
+                )
+        finally:
+            connections.close_all()
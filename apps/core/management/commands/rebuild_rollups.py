@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from apps.core.fuzzy import MODELS
+from apps.core.rollups import rebuild
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute the daily job rollups behind the stats endpoints from the stored '
+        'jobs, e.g. after deploying them or after writes that bypassed send-data.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--source', choices=sorted(MODELS), action='append',
+            help='Only rebuild this source (repeatable; default: all).',
+        )
+
+    def handle(self, *args, **options):
+        for source in options['source'] or sorted(MODELS):
+            days = rebuild(source)
+            self.stdout.write(self.style.SUCCESS(f'{source}: stored {days} day(s)'))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from apps.core.fuzzy import MODELS, rebuild_terms
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the word/trigram vocabulary behind the search/ endpoints from the '
+        'stored jobs, e.g. for rows stored before the vocabulary existed.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--source', choices=sorted(MODELS), action='append',
+            help='Only rebuild this source (repeatable; default: all).',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Rows read per query (default: 500).',
+        )
+
+    def handle(self, *args, **options):
+        for source in options['source'] or sorted(MODELS):
+            added = rebuild_terms(source, options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f'{source}: indexed {added} word(s)'))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from apps.core.models import IngestBatch
+from apps.core.response_cache import is_shared, reset_stats, stats
+
+SOURCES = [source for source, _ in IngestBatch.SOURCE_CHOICES]
+
+
+class Command(BaseCommand):
+    help = 'Show hit/miss counters of the get-data response cache.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reset', action='store_true', help='Zero the counters after printing them.')
+
+    def handle(self, *args, **options):
+        if not is_shared():
+            self.stderr.write(self.style.WARNING(
+                'RESPONSE_CACHE_BACKEND=locmem keeps the counters in each server process; '
+                'this command only sees its own (empty) ones. Use the file backend.'
+            ))
+        for source, counters in stats(SOURCES).items():
+            lookups = counters['hits'] + counters['misses']
+            ratio = counters['hits'] / lookups if lookups else 0
+            self.stdout.write(f"{source}: {counters['hits']} hit(s), {counters['misses']} miss(es), hit ratio {ratio:.0%}")
+        if options['reset']:
+            reset_stats(SOURCES)
+            self.stdout.write('Counters reset')
@@ -0,0 +1,39 @@
+# Generated by Django 3.2.25 on 2026-10-18 11:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IngestBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('hotjobs', 'BDJobs Hot Jobs'), ('govtjobs', 'BD Government Jobs')], max_length=20)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('payload', models.TextField()),
+                ('total_items', models.PositiveIntegerField(default=0)),
+                ('processed_items', models.PositiveIntegerField(default=0)),
+                ('counts', models.JSONField(blank=True, default=dict)),
+                ('errors', models.JSONField(blank=True, default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Ingest Batch',
+                'verbose_name_plural': 'Ingest Batches',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='ingestbatch',
+            index=models.Index(fields=['status', 'id'], name='core_ingest_status_ed85fc_idx'),
+        ),
+    ]
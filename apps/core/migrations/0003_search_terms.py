@@ -0,0 +1,43 @@
+# Generated by Django 3.2.25 on 2026-10-18 11:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_idempotencyrecord'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('hotjobs', 'BDJobs Hot Jobs'), ('govtjobs', 'BD Government Jobs')], max_length=20)),
+                ('term', models.CharField(max_length=100)),
+            ],
+            options={
+                'verbose_name': 'Search Term',
+                'verbose_name_plural': 'Search Terms',
+            },
+        ),
+        migrations.CreateModel(
+            name='SearchTermTrigram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('hotjobs', 'BDJobs Hot Jobs'), ('govtjobs', 'BD Government Jobs')], max_length=20)),
+                ('trigram', models.CharField(max_length=3)),
+                ('term', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trigrams', to='core.searchterm')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='searchterm',
+            constraint=models.UniqueConstraint(fields=('source', 'term'), name='core_searchterm_source_term_uniq'),
+        ),
+        migrations.AddIndex(
+            model_name='searchtermtrigram',
+            index=models.Index(fields=['source', 'trigram', 'term'], name='core_trigram_lookup_idx'),
+        ),
+    ]
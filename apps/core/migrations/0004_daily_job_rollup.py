@@ -0,0 +1,47 @@
+# Generated by Django 3.2.25 on 2026-10-18 12:22
+
+from django.db import migrations, models
+
+
+def rebuild_rollups(apps, schema_editor):
+    # Count the jobs already stored, so stats/ does not start from zero.
+    from apps.core.fuzzy import MODELS
+    from apps.core.rollups import rebuild
+    for source in MODELS:
+        rebuild(source, apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_search_terms'),
+        ('n8n_integration', '0003_hotjob_dedup_key'),
+        ('bdgovjob', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyJobRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('hotjobs', 'BDJobs Hot Jobs'), ('govtjobs', 'BD Government Jobs')], max_length=20)),
+                ('day', models.DateField()),
+                ('created', models.IntegerField(default=0)),
+                ('updated', models.IntegerField(default=0)),
+                ('with_vacancies', models.IntegerField(default=0)),
+                ('with_deadline', models.IntegerField(default=0)),
+                ('last_created_at', models.DateTimeField(blank=True, null=True)),
+                ('last_modified', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Daily Job Rollup',
+                'verbose_name_plural': 'Daily Job Rollups',
+                'ordering': ['source', '-day'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailyjobrollup',
+            constraint=models.UniqueConstraint(fields=('source', 'day'), name='core_rollup_source_day_uniq'),
+        ),
+        migrations.RunPython(rebuild_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-18 12:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_daily_job_rollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailyjobrollup',
+            name='total_vacancies',
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
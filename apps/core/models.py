@@ -0,0 +1,145 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class IngestBatch(models.Model):
+    """A send-data payload accepted for asynchronous processing.
+
+    The raw request body is stored as received; the
+    ``process_ingest_batches`` worker drains pending batches into
+    ``HotJob``/``GovtJob`` and records progress and per-item errors here.
+    """
+
+    SOURCE_HOTJOBS = 'hotjobs'
+    SOURCE_GOVTJOBS = 'govtjobs'
+    SOURCE_CHOICES = [
+        (SOURCE_HOTJOBS, 'BDJobs Hot Jobs'),
+        (SOURCE_GOVTJOBS, 'BD Government Jobs'),
+    ]
+
+    STATUS_PENDING = 'pending'
+    STATUS_PROCESSING = 'processing'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_PROCESSING, 'Processing'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    payload = models.TextField()
+    total_items = models.PositiveIntegerField(default=0)
+    processed_items = models.PositiveIntegerField(default=0)
+    counts = models.JSONField(default=dict, blank=True)
+    errors = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Ingest Batch'
+        verbose_name_plural = 'Ingest Batches'
+        indexes = [
+            models.Index(fields=['status', 'id']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_source_display()} batch #{self.pk} ({self.status})"
+
+
+class IdempotencyRecord(models.Model):
+    """Stored outcome of a send-data request, replayed for retries.
+
+    ``key`` is a hash of the request path and the client's Idempotency-Key
+    header (or of the body when no header is sent). A row with no
+    ``status_code`` marks a request that is still running. Rows past
+    ``expires_at`` are pruned on write.
+    """
+
+    key = models.CharField(max_length=64, unique=True)
+    path = models.CharField(max_length=200)
+    status_code = models.PositiveSmallIntegerField(blank=True, null=True)
+    response = models.JSONField(encoder=DjangoJSONEncoder, blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Idempotency Record'
+        verbose_name_plural = 'Idempotency Records'
+
+    def __str__(self):
+        return f"{self.path} {self.key[:12]} ({self.status_code or 'in progress'})"
+
+
+class SearchTerm(models.Model):
+    """A distinct word of the fuzzy-searchable columns of one source.
+
+    The vocabulary is much smaller than the job tables (company names and
+    titles repeat), so the trigram postings in ``SearchTermTrigram`` stay
+    small enough to scan per query. See ``apps.core.fuzzy``.
+    """
+
+    source = models.CharField(max_length=20, choices=IngestBatch.SOURCE_CHOICES)
+    term = models.CharField(max_length=100)
+
+    class Meta:
+        verbose_name = 'Search Term'
+        verbose_name_plural = 'Search Terms'
+        constraints = [
+            models.UniqueConstraint(fields=['source', 'term'], name='core_searchterm_source_term_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.term} ({self.source})"
+
+
+class SearchTermTrigram(models.Model):
+    """Trigram posting: ``trigram`` occurs in ``term``."""
+
+    source = models.CharField(max_length=20, choices=IngestBatch.SOURCE_CHOICES)
+    trigram = models.CharField(max_length=3)
+    term = models.ForeignKey(SearchTerm, on_delete=models.CASCADE, related_name='trigrams')
+
+    class Meta:
+        indexes = [
+            # Covers the per-query "terms sharing these trigrams" GROUP BY.
+            models.Index(fields=['source', 'trigram', 'term'], name='core_trigram_lookup_idx'),
+        ]
+
+
+class DailyJobRollup(models.Model):
+    """Per-day job counters of one source, maintained on ingest.
+
+    ``created``, ``with_vacancies`` and ``with_deadline`` count the rows
+    created on ``day`` (the latter two as the rows stand now), and
+    ``total_vacancies`` sums their parsed vacancies; ``updated`` counts the
+    updates written on ``day``. ``last_created_at`` and
+    ``last_modified`` are the newest row and the latest write of the day.
+    See ``apps.core.rollups``.
+    """
+
+    source = models.CharField(max_length=20, choices=IngestBatch.SOURCE_CHOICES)
+    day = models.DateField()
+    created = models.IntegerField(default=0)
+    updated = models.IntegerField(default=0)
+    with_vacancies = models.IntegerField(default=0)
+    with_deadline = models.IntegerField(default=0)
+    total_vacancies = models.BigIntegerField(default=0)
+    last_created_at = models.DateTimeField(blank=True, null=True)
+    last_modified = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['source', '-day']
+        verbose_name = 'Daily Job Rollup'
+        verbose_name_plural = 'Daily Job Rollups'
+        constraints = [
+            models.UniqueConstraint(fields=['source', 'day'], name='core_rollup_source_day_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.source} {self.day}: {self.created} new, {self.updated} updated"
@@ -0,0 +1,83 @@
+"""Incremental NDJSON ingest shared by the ``send-data/stream/`` endpoints.
+
+The request body is read line by line and handed to the app's ingest
+function in fixed-size chunks, so peak memory is bounded by the chunk size
+rather than by the upload. Progress is streamed back as one JSON object per
+chunk followed by a final summary line.
+"""
+import json
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework import status
+from rest_framework.response import Response
+
+NDJSON_CONTENT_TYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonl')
+
+
+def iter_ndjson(stream):
+    """Yield ``(line_number, obj, error)`` for each non-blank line of ``stream``."""
+    for line_number, raw in enumerate(stream, start=1):
+        if not raw.strip():
+            continue
+        try:
+            yield line_number, json.loads(raw), None
+        except ValueError as exc:
+            yield line_number, None, f'Invalid JSON: {exc}'
+
+
+def _progress(stream, ingest_chunk, chunk_size):
+    totals = {'received': 0, 'errors': 0}
+    chunk_number = 0
+    items = []
+    parse_errors = []
+
+    def flush():
+        nonlocal chunk_number
+        chunk_number += 1
+        result = ingest_chunk(items) if items else {}
+        errors = parse_errors + list(result.pop('errors', []))
+        line = {'chunk': chunk_number, 'received': len(items) + len(parse_errors)}
+        line.update(result)
+        line['errors'] = errors
+        totals['received'] += line['received']
+        totals['errors'] += len(errors)
+        for key, value in result.items():
+            totals[key] = totals.get(key, 0) + value
+        items.clear()
+        parse_errors.clear()
+        return json.dumps(line, default=str) + '\n'
+
+    for line_number, obj, error in iter_ndjson(stream):
+        if error is not None:
+            parse_errors.append({'line': line_number, 'error': error})
+        else:
+            items.append(obj)
+        if len(items) + len(parse_errors) >= chunk_size:
+            yield flush()
+    if items or parse_errors:
+        yield flush()
+
+    totals['done'] = True
+    totals['chunks'] = chunk_number
+    yield json.dumps(totals) + '\n'
+
+
+def stream_ingest(request, ingest_chunk, chunk_size=None):
+    """Ingest an NDJSON request body chunk by chunk.
+
+    ``ingest_chunk`` receives a list of decoded items and returns a dict of
+    integer counters plus an ``errors`` list for that chunk.
+    """
+    content_type = request.content_type.split(';')[0].strip().lower()
+    if content_type not in NDJSON_CONTENT_TYPES:
+        return Response(
+            {'error': f'Unsupported content type. Send {NDJSON_CONTENT_TYPES[0]} (one JSON object per line).'},
+            status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+        )
+    if chunk_size is None:
+        chunk_size = settings.INGEST_STREAM_CHUNK_SIZE
+    stream = request.stream or ()
+    return StreamingHttpResponse(
+        _progress(stream, ingest_chunk, chunk_size),
+        content_type='application/x-ndjson'
+    )
@@ -0,0 +1,301 @@
+"""Batch normalization of scraped job rows.
+
+``HotJob.save()``/``GovtJob.save()`` and every bulk path (``bulk_create``,
+``bulk_update``, the ingest functions) run the same code here, so a row is
+stored identically however it is written. The cleaners are plain functions
+built once at import time. Timestamps go through a per-batch
+``DateTimeParser``, which tries the last format that matched first and
+parses each distinct string only once. A scrape stamps hundreds of rows with
+the same second, so that cache matters.
+
+Government jobs also get typed copies of their free-text columns
+(``vacancies_int``, ``deadline_at``, ``posted_on``) so they can be
+filtered, sorted and summed on an index. The parsers behind them are
+memoized: circulars repeat the same few deadline and date strings.
+"""
+import functools
+import hashlib
+import re
+from datetime import date, datetime, time, timezone as dt_timezone
+from django.utils import timezone
+
+# Format written by the scrapers; ISO 8601 (``fromisoformat``) is the fallback.
+SCRAPER_DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+HOTJOB_FIELDS = ('company_name', 'company_logo_url', 'position', 'job_url', 'scraped_date')
+GOVTJOB_FIELDS = ('job_title', 'job_url', 'vacancies', 'deadline', 'posted_date', 'scraped_at')
+# Typed, indexed copies of the free-text GovtJob columns: {typed field: source field}.
+GOVTJOB_TYPED_FIELDS = {'vacancies_int': 'vacancies', 'deadline_at': 'deadline', 'posted_on': 'posted_date'}
+
+
+def strip_or_none(value):
+    """Strip strings; empty strings become None."""
+    if isinstance(value, str):
+        return value.strip() or None
+    return value
+
+
+def collapse_whitespace(value):
+    """Collapse runs of whitespace to one space; empty strings become None."""
+    if isinstance(value, str):
+        return ' '.join(value.split()) or None
+    return value
+
+
+def strip_placeholder(value):
+    """Strip strings; empty strings and 'N/A' become None."""
+    if isinstance(value, str):
+        value = value.strip()
+        return value if value and value.upper() != 'N/A' else None
+    return value
+
+
+def clean_url(value):
+    """Normalize URL-like fields: treat empty, whitespace or 'N/A' as None.
+
+    Other values are kept as given. The models used to run ``URLValidator``
+    here and then keep the value whatever the outcome, so the check is
+    skipped; the serializers validate URLs on the way in.
+    """
+    return strip_placeholder(value)
+
+
+class DateTimeParser:
+    """Parse scraped timestamp strings into aware datetimes.
+
+    Use one instance per batch. The format that matched last is tried
+    first, and each distinct string is parsed only once. Unparseable strings
+    become None. Non-string values are returned unchanged.
+    """
+
+    def __init__(self, tz=None):
+        self.tz = tz or timezone.get_current_timezone()
+        self._parsers = [self._parse_scraper_format, datetime.fromisoformat]
+        self._cache = {}
+
+    @staticmethod
+    def _parse_scraper_format(value):
+        return datetime.strptime(value, SCRAPER_DATETIME_FORMAT)
+
+    def _parse(self, value):
+        for index, parser in enumerate(self._parsers):
+            try:
+                parsed = parser(value)
+            except ValueError:
+                continue
+            if index:
+                # Remember the detected format for the rest of the batch.
+                self._parsers.insert(0, self._parsers.pop(index))
+            if timezone.is_naive(parsed):
+                parsed = timezone.make_aware(parsed, self.tz)
+            return parsed
+        return None
+
+    def __call__(self, value):
+        if not isinstance(value, str):
+            return value
+        try:
+            return self._cache[value]
+        except KeyError:
+            parsed = self._cache[value] = self._parse(value)
+            return parsed
+
+
+MONTHS = {
+    name: number
+    for number, names in enumerate([
+        ('january', 'jan', 'জানুয়ারি', 'জানুয়ারী'),
+        ('february', 'feb', 'ফেব্রুয়ারি', 'ফেব্রুয়ারী'),
+        ('march', 'mar', 'মার্চ'),
+        ('april', 'apr', 'এপ্রিল'),
+        ('may', 'মে'),
+        ('june', 'jun', 'জুন'),
+        ('july', 'jul', 'জুলাই'),
+        ('august', 'aug', 'আগস্ট', 'আগষ্ট'),
+        ('september', 'sep', 'sept', 'সেপ্টেম্বর'),
+        ('october', 'oct', 'অক্টোবর'),
+        ('november', 'nov', 'নভেম্বর'),
+        ('december', 'dec', 'ডিসেম্বর'),
+    ], start=1)
+    for name in names
+}
+# Largest value of a PositiveIntegerField on every backend.
+MAX_VACANCIES = 2147483647
+# "1,017", "65" or Bengali digits ("৬৫"); \d matches any decimal digit and
+# int() reads them all.
+_NUMBER = re.compile(r'\d+(?:,\d{3})*')
+# "2025-11-25", "25/11/2025", "25.11.2025" (day first, as written in Bangladesh).
+_ISO_DATE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})')
+_NUMERIC_DATE = re.compile(r'(\d{1,2})[/.-](\d{1,2})[/.-](\d{4})')
+# "5:00 PM", "5 pm", "17:00".
+_TIME_12H = re.compile(r'(\d{1,2})(?:[:.](\d{2}))?\s*([ap])\.?\s*m\b', re.IGNORECASE)
+_TIME_24H = re.compile(r'(\d{1,2})[:.](\d{2})')
+# "25", "25th", "3rd".
+_DAY = re.compile(r'(\d{1,2})(?:st|nd|rd|th)?$', re.IGNORECASE)
+
+
+def _month(token):
+    return MONTHS.get(token.lower().rstrip('.'))
+
+
+def _date_from_words(tokens):
+    """Find "25 November 2025" or "November 25th 2025" in a list of tokens."""
+    for index in range(len(tokens) - 2):
+        first, second, year = tokens[index:index + 3]
+        if not (year.isdigit() and len(year) == 4):
+            continue
+        day, month = _DAY.match(first), _month(second)
+        if day is None or month is None:
+            day, month = _DAY.match(second), _month(first)
+        if day is None or month is None:
+            continue
+        try:
+            return date(int(year), month, int(day.group(1))), ' '.join(tokens[index + 3:])
+        except ValueError:
+            continue
+    return None, ''
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_date_text(text):
+    """Return ``(date, time or None)`` from a free-text date, or None.
+
+    Understands "25 November 2025 at 5:00 PM", "3 November, 2025",
+    "30 Nov 2025", "2025-11-30" and "30/11/2025", with English or Bengali
+    month names and digits. A time is only looked for after the date.
+    """
+    match = _ISO_DATE.search(text)
+    if match:
+        year, month, day = match.groups()
+    else:
+        match = _NUMERIC_DATE.search(text)
+        if match:
+            day, month, year = match.groups()
+    if match:
+        try:
+            found, rest = date(int(year), int(month), int(day)), text[match.end():]
+        except ValueError:
+            return None
+    else:
+        found, rest = _date_from_words(text.replace(',', ' ').split())
+        if found is None:
+            return None
+
+    match = _TIME_12H.search(rest)
+    if match:
+        hour, minute, meridiem = int(match.group(1)), int(match.group(2) or 0), match.group(3).lower()
+        if not 1 <= hour <= 12:
+            return found, None
+        hour = hour % 12 + (12 if meridiem == 'p' else 0)
+    else:
+        match = _TIME_24H.search(rest)
+        if not match:
+            return found, None
+        hour, minute = int(match.group(1)), int(match.group(2))
+    if hour > 23 or minute > 59:
+        return found, None
+    return found, time(hour, minute)
+
+
+@functools.lru_cache(maxsize=4096)
+def parse_vacancies(text):
+    """The first number in ``text`` ("65", "1,017", "৬৫ জন"), or None."""
+    match = _NUMBER.search(text)
+    if not match:
+        return None
+    number = int(match.group().replace(',', ''))
+    return number if number <= MAX_VACANCIES else None
+
+
+def parse_posted_on(text):
+    """The date in a free-text posted date, or None."""
+    parsed = parse_date_text(text)
+    return parsed[0] if parsed else None
+
+
+def parse_deadline_at(text, tz=None):
+    """The aware datetime of a free-text deadline, or None.
+
+    A deadline without a time lasts until the end of its day.
+    """
+    parsed = parse_date_text(text)
+    if parsed is None:
+        return None
+    day, moment = parsed
+    return timezone.make_aware(datetime.combine(day, moment or time.max), tz or timezone.get_current_timezone())
+
+
+HOTJOB_CLEANERS = {
+    'company_name': strip_or_none,
+    'position': collapse_whitespace,
+    'company_logo_url': clean_url,
+    'job_url': clean_url,
+}
+
+GOVTJOB_CLEANERS = {
+    'job_title': strip_or_none,
+    'job_url': clean_url,
+    'vacancies': strip_placeholder,
+    'deadline': strip_placeholder,
+    'posted_date': strip_placeholder,
+}
+
+
+def normalize_rows(rows, cleaners, datetime_field):
+    """Return cleaned copies of ``rows``; only keys present in a row are touched."""
+    bound = tuple(cleaners.items()) + ((datetime_field, DateTimeParser()),)
+    clean_rows = []
+    for row in rows:
+        clean = dict(row)
+        for field, cleaner in bound:
+            if field in clean:
+                clean[field] = cleaner(clean[field])
+        clean_rows.append(clean)
+    return clean_rows
+
+
+def normalize_hotjobs(rows):
+    """Normalize a batch of HotJob field dicts."""
+    return normalize_rows(rows, HOTJOB_CLEANERS, 'scraped_date')
+
+
+def normalize_govtjobs(rows):
+    """Normalize a batch of GovtJob field dicts.
+
+    Rows holding ``vacancies``, ``deadline`` or ``posted_date`` also get
+    their typed copy (see ``GOVTJOB_TYPED_FIELDS``), None when unparseable.
+    """
+    tz = timezone.get_current_timezone()
+    parsers = {
+        'vacancies_int': parse_vacancies,
+        'deadline_at': lambda text: parse_deadline_at(text, tz),
+        'posted_on': parse_posted_on,
+    }
+    clean_rows = normalize_rows(rows, GOVTJOB_CLEANERS, 'scraped_at')
+    for row in clean_rows:
+        for typed_field, field in GOVTJOB_TYPED_FIELDS.items():
+            if field in row:
+                value = row[field]
+                row[typed_field] = parsers[typed_field](value) if isinstance(value, str) else None
+    return clean_rows
+
+
+def hotjob_dedup_key(row):
+    """SHA-256 of job_url, or of company_name/position/scraped_date without a URL.
+
+    ``row`` must already be normalized. The timestamp is hashed in UTC so
+    equal instants written with different offsets share a key.
+    """
+    if row.get('job_url'):
+        source = f"url:{row['job_url']}"
+    else:
+        scraped = ''
+        scraped_date = row.get('scraped_date')
+        if isinstance(scraped_date, datetime):
+            if timezone.is_naive(scraped_date):
+                scraped_date = timezone.make_aware(scraped_date, timezone.get_current_timezone())
+            scraped = scraped_date.astimezone(dt_timezone.utc).isoformat()
+        source = '\x1f'.join([
+            'fallback', row.get('company_name') or '', row.get('position') or '', scraped
+        ])
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()
@@ -0,0 +1,141 @@
+"""Opt-in keyset (cursor) pagination for the get-data endpoints.
+
+Rows are ordered newest first on ``(created_at, id)``. A page is fetched
+with ``WHERE (created_at, id) < cursor ORDER BY created_at DESC, id DESC
+LIMIT n`` on the composite index, so page N costs the same as page 1 and no
+request holds more than ``limit`` rows. The cursor is the key of the last
+row on the page, base64-encoded so clients treat it as opaque.
+
+Every endpoint answers with a single query. Without pagination ``count``
+is the number of rows fetched. The first page gets the total from a
+``COUNT(*) OVER ()`` window in the page query itself, and the cursor
+carries it to the following pages; ``?count=false`` leaves it out.
+
+Pagination is only applied when the request carries ``limit`` or
+``cursor``; without them the endpoints keep returning every row.
+"""
+import base64
+import json
+from datetime import datetime
+from django.conf import settings
+from django.db.models import Count, Q, Window
+from rest_framework.exceptions import ValidationError
+from .conditional import check, remember, timestamp_field
+from .rows import select_fields
+from .search import RANK
+
+LIMIT_PARAM = 'limit'
+CURSOR_PARAM = 'cursor'
+COUNT_PARAM = 'count'
+ORDERING = ('-created_at', '-id')
+
+
+def encode_cursor(created_at, pk, total=None):
+    raw = json.dumps([created_at.isoformat(), pk, total]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Return ``(created_at, id, total)`` from a cursor; raise ValueError if malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, pk, total = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(pk), None if total is None else int(total)
+    except (TypeError, ValueError):
+        raise ValueError('Invalid cursor')
+
+
+def parse_limit(request, default, maximum, param=LIMIT_PARAM):
+    """Read ``?limit=`` (or ``param``): ``default`` when absent, capped at ``maximum``.
+
+    Raises ``ValidationError`` unless it is a positive integer.
+    """
+    value = request.query_params.get(param)
+    if value is None:
+        return default
+    try:
+        limit = int(value)
+    except ValueError:
+        limit = 0
+    if limit < 1:
+        raise ValidationError({'error': f'{param} must be a positive integer'})
+    return min(limit, maximum)
+
+
+def _limit(request):
+    return parse_limit(request, settings.PAGINATION_DEFAULT_LIMIT, settings.PAGINATION_MAX_LIMIT)
+
+
+def is_paginated(request):
+    params = request.query_params
+    return LIMIT_PARAM in params or CURSOR_PARAM in params
+
+
+def _fetch(qs, row_serializer, extra):
+    """Return ``(output dicts, {extra column: values})`` for ``qs``."""
+    sources = row_serializer.sources
+    columns = sources + [column for column in extra if column not in sources]
+    rows = list(qs.values_list(*columns))
+    position = {column: columns.index(column) for column in extra}
+    values = {column: [row[position[column]] for row in rows] for column in extra}
+    return rows, values
+
+
+def paginate(request, qs, row_serializer):
+    """Fetch the rows of ``qs`` for this request in one query.
+
+    Rows are read with ``values_list()`` and returned as the dicts
+    ``row_serializer`` (a ``RowSerializer``) builds, narrowed to
+    ``?fields=`` when given. Returns
+    ``(rows, count, page)``. Without ``limit``/``cursor``, ``rows`` holds
+    every row of ``qs`` newest first, ``count`` is their number and
+    ``page`` is empty. Otherwise ``rows`` holds at most ``limit`` rows after
+    the cursor, ``count`` is the total across all pages (None with
+    ``?count=false``) and ``page`` holds ``limit`` and ``next`` (the URL of
+    the following page, or None). Raises ``ValidationError`` for a bad
+    ``limit``, ``cursor`` or field name. For conditional requests raises
+    ``NotModified`` (see ``apps.core.conditional``) before fetching rows.
+    """
+    row_serializer = select_fields(request, row_serializer)
+    stamp = timestamp_field(qs.model)
+    if not is_paginated(request):
+        # Search results come best match first; pages stay newest first.
+        ranked = RANK in qs.query.annotations
+        qs = qs.order_by(f'-{RANK}', *ORDERING) if ranked else qs.order_by(*ORDERING)
+        check(request, qs)
+        rows, values = _fetch(qs, row_serializer, [stamp])
+        remember(request, max(values[stamp], default=None), len(rows))
+        return row_serializer.to_dicts(rows), len(rows), {}
+
+    qs = qs.order_by(*ORDERING)
+    limit = _limit(request)
+    want_count = request.query_params.get(COUNT_PARAM, '').lower() not in ('false', '0')
+    total = None
+    cursor = request.query_params.get(CURSOR_PARAM)
+    if cursor:
+        try:
+            created_at, pk, total = decode_cursor(cursor)
+        except ValueError as exc:
+            raise ValidationError({'error': str(exc)})
+        qs = qs.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+    check(request, qs[:limit + 1])
+    extra = [stamp, 'created_at', 'id']
+    if not cursor and want_count:
+        # Window functions run before LIMIT: every row carries the total.
+        qs = qs.annotate(total_count=Window(Count('pk')))
+        extra.append('total_count')
+
+    rows, values = _fetch(qs[:limit + 1], row_serializer, extra)
+    remember(request, max(values[stamp], default=None), len(rows))
+    if not cursor and want_count:
+        total = values['total_count'][0] if rows else 0
+    if not want_count:
+        total = None
+
+    next_url = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        params = request.query_params.copy()
+        params[CURSOR_PARAM] = encode_cursor(values['created_at'][limit - 1], values['id'][limit - 1], total)
+        next_url = request.build_absolute_uri(f'{request.path}?{params.urlencode()}')
+    return row_serializer.to_dicts(rows), total, {'limit': limit, 'next': next_url}
@@ -0,0 +1,99 @@
+"""Accept-and-queue ingest: persist a send-data batch now, write it later.
+
+``enqueue`` is called from the send-data views for ``?mode=async``;
+``claim_next_batch`` and ``process_batch`` are driven by the
+``process_ingest_batches`` management command.
+"""
+import json
+from django.conf import settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.module_loading import import_string
+from rest_framework import status
+from rest_framework.response import Response
+from .models import IngestBatch
+
+# Per-source ingest function: takes a list of items and returns integer
+# counters plus an ``errors`` list.
+HANDLERS = {
+    IngestBatch.SOURCE_HOTJOBS: 'apps.n8n_integration.ingest.ingest_counts',
+    IngestBatch.SOURCE_GOVTJOBS: 'apps.bdgovjob.ingest.upsert_counts',
+}
+
+
+def load_payloads(raw):
+    """Decode a send-data body into a list of items (single object or list)."""
+    data = json.loads(raw)
+    return data if isinstance(data, list) else [data]
+
+
+def enqueue(request, source, status_url_name):
+    """Store the raw request body as a pending batch and return 202."""
+    try:
+        raw = request.body.decode('utf-8')
+    except UnicodeDecodeError as exc:
+        return Response({'error': f'Body is not UTF-8: {exc}'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        total = len(load_payloads(raw))
+    except ValueError as exc:
+        return Response({'error': f'Invalid JSON: {exc}'}, status=status.HTTP_400_BAD_REQUEST)
+
+    batch = IngestBatch.objects.create(source=source, payload=raw, total_items=total)
+    return Response({
+        'batch_id': batch.pk,
+        'status': batch.status,
+        'total_items': total,
+        'status_url': request.build_absolute_uri(
+            reverse(status_url_name, kwargs={'batch_id': batch.pk})
+        ),
+    }, status=status.HTTP_202_ACCEPTED)
+
+
+def requeue_stale(max_age):
+    """Return batches stuck in processing for longer than ``max_age`` to the queue."""
+    return IngestBatch.objects.filter(
+        status=IngestBatch.STATUS_PROCESSING,
+        started_at__lt=timezone.now() - max_age,
+    ).update(status=IngestBatch.STATUS_PENDING, started_at=None)
+
+
+def claim_next_batch():
+    """Atomically move the oldest pending batch to processing and return it.
+
+    The conditional UPDATE makes claiming safe across worker threads and
+    processes; a worker that loses the race simply tries the next id.
+    """
+    pending = IngestBatch.objects.filter(status=IngestBatch.STATUS_PENDING).order_by('id')
+    for batch_id in pending.values_list('id', flat=True)[:20]:
+        claimed = IngestBatch.objects.filter(pk=batch_id, status=IngestBatch.STATUS_PENDING).update(
+            status=IngestBatch.STATUS_PROCESSING, started_at=timezone.now()
+        )
+        if claimed:
+            return IngestBatch.objects.get(pk=batch_id)
+    return None
+
+
+def process_batch(batch, chunk_size=None):
+    """Ingest a claimed batch chunk by chunk, saving progress after each chunk."""
+    if chunk_size is None:
+        chunk_size = settings.INGEST_STREAM_CHUNK_SIZE
+    progress_fields = ['processed_items', 'counts', 'errors']
+    try:
+        handler = import_string(HANDLERS[batch.source])
+        items = load_payloads(batch.payload)
+        # Resume after the last chunk a previous (interrupted) run saved.
+        for start in range(batch.processed_items, len(items), chunk_size):
+            chunk = items[start:start + chunk_size]
+            result = handler(chunk)
+            batch.errors.extend(result.pop('errors'))
+            for key, value in result.items():
+                batch.counts[key] = batch.counts.get(key, 0) + value
+            batch.processed_items = start + len(chunk)
+            batch.save(update_fields=progress_fields)
+        batch.status = IngestBatch.STATUS_DONE
+    except Exception as exc:
+        batch.errors.append({'error': str(exc)})
+        batch.status = IngestBatch.STATUS_FAILED
+    batch.finished_at = timezone.now()
+    batch.save(update_fields=progress_fields + ['status', 'finished_at'])
+    return batch
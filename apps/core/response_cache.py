@@ -0,0 +1,143 @@
+"""Versioned read-through cache for the get-data period endpoints.
+
+Dashboards and n8n poll ``get-data/today|yesterday|week|month|date/<d>/``
+far more often than ``send-data`` writes. ``@cached_response(source)``
+stores a view's response data in the ``responses`` cache under a key built
+from the path, the sorted query parameters, today's date and the data
+version of ``source``. The ingest functions call ``bump_version`` after a
+write commits, which retires every cached response of that app at once;
+until then cached responses are served without touching the database.
+
+The week and month windows also move with the clock, so entries expire
+after ``RESPONSE_CACHE_TTL`` seconds even without new data. Responses carry
+``X-Cache: HIT`` or ``MISS``; hit and miss counters are kept per source
+(see the ``response_cache_stats`` command). Versions and counters live in
+the ``responses`` cache itself, so they are only shared between processes
+(web workers, import and queue commands) with a shared backend, the
+default ``file`` one. The ETag/Last-Modified
+validator is cached with the data, so a conditional poll that hits the
+cache gets its 304 without a query. Responses carry their cache key, under
+which ``apps.core.compression`` keeps their compressed bytes.
+"""
+import functools
+import hashlib
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from .compression import CACHE_KEY_ATTR
+from .conditional import is_conditional, matches, not_modified, set_headers
+
+CACHE_ALIAS = 'responses'
+PREFIX = 'response-cache:'
+HEADER = 'X-Cache'
+OUTCOMES = ('hits', 'misses')
+
+
+def _cache():
+    return caches[CACHE_ALIAS]
+
+
+def _version_key(source):
+    return f'{PREFIX}version:{source}'
+
+
+def _stats_key(source, outcome):
+    return f'{PREFIX}stats:{source}:{outcome}'
+
+
+def data_version(source):
+    """Current data version of ``source``.
+
+    A missing (or evicted) version starts from the clock, so it never
+    repeats a number that older cached responses were stored under.
+    """
+    cache = _cache()
+    key = _version_key(source)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key, time.time_ns())
+    return version
+
+
+def bump_version(source):
+    """Invalidate every cached response of ``source``."""
+    cache = _cache()
+    try:
+        cache.incr(_version_key(source))
+    except ValueError:
+        cache.set(_version_key(source), time.time_ns(), None)
+
+
+def _count(source, outcome):
+    cache = _cache()
+    key = _stats_key(source, outcome)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def stats(sources):
+    """Return ``{source: {'hits': n, 'misses': n}}``."""
+    cache = _cache()
+    return {
+        source: {outcome: cache.get(_stats_key(source, outcome), 0) for outcome in OUTCOMES}
+        for source in sources
+    }
+
+
+def is_shared():
+    """Whether the ``responses`` cache is seen by every process (not ``LocMemCache``)."""
+    return not isinstance(_cache(), LocMemCache)
+
+
+def reset_stats(sources):
+    _cache().delete_many([_stats_key(source, outcome) for source in sources for outcome in OUTCOMES])
+
+
+def response_key(source, request):
+    params = sorted((name, sorted(values)) for name, values in request.query_params.lists())
+    raw = f'{request.path}\n{params}\n{timezone.now().date()}'
+    digest = hashlib.sha256(raw.encode('utf-8')).hexdigest()
+    return f'{PREFIX}{source}:{data_version(source)}:{digest}'
+
+
+def cached_response(source):
+    """Decorate an ``APIView`` ``get`` method with the versioned response cache."""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            ttl = settings.RESPONSE_CACHE_TTL
+            if not ttl:
+                return method(view, request, *args, **kwargs)
+
+            cache = _cache()
+            key = response_key(source, request)
+            entry = cache.get(key)
+            if entry is not None:
+                _count(source, 'hits')
+                data, validator = entry
+                if validator is not None and is_conditional(request) and matches(request, *validator):
+                    response = not_modified(*validator)
+                else:
+                    response = Response(data)
+                    setattr(response, CACHE_KEY_ATTR, key)
+                    if validator is not None:
+                        set_headers(response, *validator)
+                response[HEADER] = 'HIT'
+                return response
+
+            _count(source, 'misses')
+            response = method(view, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(key, (response.data, getattr(request, 'validator', None)), ttl)
+                setattr(response, CACHE_KEY_ATTR, key)
+            response[HEADER] = 'MISS'
+            return response
+        return wrapper
+    return decorator
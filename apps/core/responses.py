@@ -0,0 +1,17 @@
+"""Response shaping shared by the send-data endpoints.
+
+By default send-data echoes every stored row, which makes the response as
+large as the request. Clients that only need the outcome ask for a summary
+with ``?response=summary`` or ``Prefer: return=minimal`` (RFC 7240) and get
+counts, ids and errors only.
+"""
+SUMMARY_PARAM = 'response'
+SUMMARY_VALUE = 'summary'
+
+
+def wants_summary(request):
+    """True when the client asked for a summary instead of the full echo."""
+    if request.query_params.get(SUMMARY_PARAM) == SUMMARY_VALUE:
+        return True
+    prefer = request.headers.get('Prefer', '')
+    return 'return=minimal' in (token.strip() for token in prefer.split(','))
@@ -0,0 +1,276 @@
+"""Per-day job counters behind the stats endpoints.
+
+Counting jobs per period means scanning ``HotJob``/``GovtJob``, which
+grows with every scrape. ``DailyJobRollup`` keeps one row per source and
+day instead: how many jobs were created that day (how many of those have
+vacancies or a deadline, and how many vacancies they offer), how many
+were updated, and the newest timestamps. Statistics then read tens of rollup rows.
+
+The ingest paths collect their changes in a ``Tally`` and ``flush`` it
+inside the savepoint of the chunk they write, so the counters commit or
+roll back together with the rows. Counters are incremented with ``F()``
+expressions, so concurrent writers add up instead of overwriting each
+other.
+
+Jobs saved or deleted one by one (the admin, ``Model.save()``,
+``QuerySet.delete()``, which deletes row by row while receivers are
+connected) are counted by ``pre_save``/``post_save``/``post_delete``
+receivers, also inside the writing transaction. Only bulk writes that
+send no signals (``QuerySet.update()``, ``bulk_create`` outside the
+ingest paths, raw SQL) bypass the counters; ``manage.py rebuild_rollups``
+recomputes the rollups from the stored jobs.
+"""
+from collections import Counter, defaultdict
+from datetime import datetime, time, timedelta
+from types import SimpleNamespace
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.db.models import Count, DateTimeField, F, Max, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce, Greatest, TruncDate
+from django.utils import timezone
+from .fuzzy import MODELS
+from .models import DailyJobRollup
+from .response_cache import bump_version
+
+# Counted by ``with_vacancies`` / ``with_deadline`` where the model has them.
+FILLED_FIELDS = {'with_vacancies': 'vacancies', 'with_deadline': 'deadline'}
+# Summed into ``total_vacancies`` where the model has it.
+SUMMED_FIELDS = {'total_vacancies': 'vacancies_int'}
+# auto_now_add and auto_now stamp a new row microseconds apart; a row
+# updated_at later than this after created_at was written again.
+UPDATE_GAP = timedelta(seconds=1)
+
+
+def filled(value):
+    """Whether ``value`` holds a real value (not None, empty or N/A)."""
+    return value is not None and value.strip() != '' and value.strip().upper() != 'N/A'
+
+
+def filled_q(field):
+    """Rows whose ``field`` holds a real value (not NULL, empty or N/A)."""
+    return ~(Q(**{f'{field}__isnull': True}) | Q(**{field: ''}) | Q(**{f'{field}__iexact': 'N/A'}))
+
+
+def day_of(value):
+    """The local date of the aware datetime ``value``."""
+    return timezone.localtime(value).date()
+
+
+def _counters(job):
+    counts = {
+        counter: int(filled(getattr(job, field)))
+        for counter, field in FILLED_FIELDS.items()
+        if hasattr(job, field)
+    }
+    counts.update(
+        (counter, getattr(job, field) or 0)
+        for counter, field in SUMMED_FIELDS.items()
+        if hasattr(job, field)
+    )
+    return counts
+
+
+class Tally:
+    """Rollup changes of one write, collected per day until ``flush()``."""
+
+    def __init__(self, source):
+        self.source = source
+        self.counts = defaultdict(Counter)
+        self.stamps = defaultdict(dict)
+
+    def add(self, day, **counts):
+        self.counts[day].update(counts)
+
+    def stamp(self, day, **values):
+        for field, value in values.items():
+            current = self.stamps[day].get(field)
+            if current is None or value > current:
+                self.stamps[day][field] = value
+
+    def created(self, jobs):
+        """Count newly inserted ``jobs`` on the day of their ``created_at``."""
+        for job in jobs:
+            day = day_of(job.created_at)
+            self.add(day, created=1, **_counters(job))
+            self.stamp(day, last_created_at=job.created_at, last_modified=job.created_at)
+
+    def updated(self, job, before, now):
+        """Count the update of ``job`` at ``now``.
+
+        ``before`` maps field names to the values the job had. A vacancy or
+        deadline filled in, changed or cleared moves the counters of the day
+        the job was created.
+        """
+        day = day_of(now)
+        self.add(day, updated=1)
+        self.stamp(day, last_modified=now)
+        self.changed(job, before)
+
+    def changed(self, job, before):
+        """Move the counters of ``job``'s creation day from ``before`` to its values."""
+        changes = Counter(_counters(job))
+        changes.subtract(_counters(SimpleNamespace(**before)))
+        self.add(day_of(job.created_at), **changes)
+
+    def deleted(self, job, now):
+        """Uncount the deleted ``job``; the deletion at ``now`` is a modification."""
+        self.add(day_of(job.created_at), created=-1, **{
+            counter: -count for counter, count in _counters(job).items()
+        })
+        self.stamp(day_of(now), last_modified=now)
+
+    def flush(self):
+        """Apply the collected changes; one UPDATE per day touched.
+
+        A day without a rollup row yet gets one first. Call inside the
+        transaction that writes the jobs.
+        """
+        for day in sorted(set(self.counts) | set(self.stamps)):
+            changes = {field: F(field) + count for field, count in self.counts[day].items() if count}
+            for field, value in self.stamps[day].items():
+                value = Value(value, output_field=DateTimeField())
+                changes[field] = Greatest(Coalesce(field, value), value)
+            if not changes:
+                continue
+            rows = DailyJobRollup.objects.filter(source=self.source, day=day)
+            if not rows.update(**changes):
+                DailyJobRollup.objects.bulk_create(
+                    [DailyJobRollup(source=self.source, day=day)], ignore_conflicts=True,
+                )
+                rows.update(**changes)
+        self.counts.clear()
+        self.stamps.clear()
+
+
+def _source(model):
+    return next(source for source, label in MODELS.items() if label == model._meta.label)
+
+
+def _counted_fields(model):
+    fields = {field.name for field in model._meta.get_fields()}
+    return [field for field in [*FILLED_FIELDS.values(), *SUMMED_FIELDS.values()] if field in fields]
+
+
+def _before_save(sender, instance, **kwargs):
+    # The stored values, to move the counters of a row saved over them.
+    if instance.pk is not None:
+        instance._rollup_before = (
+            sender.objects.filter(pk=instance.pk).values('pk', *_counted_fields(sender)).first()
+        )
+
+
+def _after_save(sender, instance, created, **kwargs):
+    source = _source(sender)
+    before = instance.__dict__.pop('_rollup_before', None)
+    tally = Tally(source)
+    if created or before is None:
+        tally.created([instance])
+    elif hasattr(instance, 'updated_at'):
+        tally.updated(instance, before, instance.updated_at)
+    else:
+        tally.changed(instance, before)
+    tally.flush()
+    transaction.on_commit(lambda: bump_version(source))
+
+
+def _after_delete(sender, instance, **kwargs):
+    source = _source(sender)
+    tally = Tally(source)
+    tally.deleted(instance, timezone.now())
+    tally.flush()
+    # Deleting the newest job of its day falls back to the next newest one.
+    day = day_of(instance.created_at)
+    start, end = (
+        timezone.make_aware(datetime.combine(value, time.min), timezone.get_current_timezone())
+        for value in (day, day + timedelta(days=1))
+    )
+    newest = (
+        sender.objects.filter(created_at__gte=start, created_at__lt=end)
+        .order_by('-created_at').values('created_at')[:1]
+    )
+    DailyJobRollup.objects.filter(
+        source=source, day=day, last_created_at=instance.created_at,
+    ).update(last_created_at=Subquery(newest))
+    transaction.on_commit(lambda: bump_version(source))
+
+
+def connect_signals():
+    """Count single-row saves and deletes of the job models (see the module docstring)."""
+    for source, label in MODELS.items():
+        pre_save.connect(_before_save, sender=label, dispatch_uid=f'rollups-pre-save-{source}')
+        post_save.connect(_after_save, sender=label, dispatch_uid=f'rollups-post-save-{source}')
+        post_delete.connect(_after_delete, sender=label, dispatch_uid=f'rollups-post-delete-{source}')
+
+
+def rebuild(source, registry=apps):
+    """Recompute ``source``'s rollups from its stored jobs.
+
+    Past updates cannot be replayed: a row counts as one update, on the day
+    of its ``updated_at``, if it was written again after its creation.
+    Returns the number of days stored. Migrations pass their historical
+    app ``registry``.
+    """
+    model = registry.get_model(MODELS[source])
+    rollup_model = registry.get_model('core', 'DailyJobRollup')
+    fields = {field.name for field in model._meta.get_fields()}
+    counters = {field.name for field in rollup_model._meta.get_fields()}
+    stamp = 'updated_at' if 'updated_at' in fields else 'created_at'
+    annotations = {
+        'created': Count('pk'),
+        'last_created_at': Max('created_at'),
+        'last_modified': Max(stamp),
+    }
+    for counter, field in FILLED_FIELDS.items():
+        if field in fields and counter in counters:
+            annotations[counter] = Count('pk', filter=filled_q(field))
+    for counter, field in SUMMED_FIELDS.items():
+        if field in fields and counter in counters:
+            annotations[counter] = Coalesce(Sum(field), 0)
+
+    days = {}
+    by_created = model.objects.order_by().annotate(day=TruncDate('created_at')).values('day')
+    for row in by_created.annotate(**annotations):
+        days[row['day']] = rollup_model(source=source, **row)
+    if stamp == 'updated_at':
+        rewritten = (
+            model.objects.order_by()
+            .filter(updated_at__gt=F('created_at') + UPDATE_GAP)
+            .annotate(day=TruncDate('updated_at')).values('day')
+            .annotate(updated=Count('pk'), last_modified=Max('updated_at'))
+        )
+        for row in rewritten:
+            rollup = days.setdefault(row['day'], rollup_model(source=source, day=row['day']))
+            rollup.updated = row['updated']
+            if rollup.last_modified is None or row['last_modified'] > rollup.last_modified:
+                rollup.last_modified = row['last_modified']
+
+    with transaction.atomic():
+        rollup_model.objects.filter(source=source).delete()
+        rollup_model.objects.bulk_create(days.values())
+    return len(days)
+
+
+def summary(source, now=None):
+    """Totals of ``source`` from its rollups, in one aggregate query.
+
+    Returns ``total``, ``today``, ``this_week`` (the last 7 days, today
+    included, and any later day), ``this_month`` and the sums of the
+    counters, plus the newest ``last_created_at`` and ``last_modified``
+    (None without rollups).
+    """
+    today = day_of(now or timezone.now())
+    month_start = today.replace(day=1)
+    next_month = (month_start + timedelta(days=32)).replace(day=1)
+    return DailyJobRollup.objects.filter(source=source).aggregate(
+        total=Coalesce(Sum('created'), 0),
+        today=Coalesce(Sum('created', filter=Q(day=today)), 0),
+        this_week=Coalesce(Sum('created', filter=Q(day__gt=today - timedelta(days=7))), 0),
+        this_month=Coalesce(Sum('created', filter=Q(day__gte=month_start, day__lt=next_month)), 0),
+        updated=Coalesce(Sum('updated'), 0),
+        with_vacancies=Coalesce(Sum('with_vacancies'), 0),
+        with_deadline=Coalesce(Sum('with_deadline'), 0),
+        total_vacancies=Coalesce(Sum('total_vacancies'), 0),
+        last_created_at=Max('last_created_at'),
+        last_modified=Max('last_modified'),
+    )
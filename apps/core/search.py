@@ -0,0 +1,199 @@
+"""Full-text search behind the ``?q=`` parameter of the get-data endpoints.
+
+``company``/``position``/``title`` filter with ``icontains``, a full table
+scan. ``?q=`` goes through an index instead:
+
+* SQLite: an external-content FTS5 table ``<table>_fts`` over the search
+  columns, kept in sync by insert/update/delete triggers, so every write
+  path (ORM, bulk inserts, raw SQL) updates it. Ranked by ``bm25``.
+* PostgreSQL: a GIN index on ``to_tsvector('simple', ...)`` of the
+  columns, ranked by ``ts_rank``.
+
+Every word of the query must match, and each word is a prefix
+(``bang`` finds "Bangladesh"). Without an index (another database, or
+SQLite built without FTS5) the same query runs as ``icontains`` filters.
+"""
+import logging
+import re
+from django.db import OperationalError, connection, migrations
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+logger = logging.getLogger(__name__)
+
+# Annotation holding the relevance of each row; higher is better.
+RANK = 'search_rank'
+
+_available = {}
+
+
+def tokens(text):
+    return re.findall(r'\w+', text or '')
+
+
+def _pg_vector(table, columns):
+    parts = " || ' ' || ".join(f'coalesce("{table}"."{column}", \'\')' for column in columns)
+    return f"to_tsvector('simple', {parts})"
+
+
+def _sqlite_triggers(table, columns):
+    fts = f'{table}_fts'
+    cols = ', '.join(columns)
+    new = ', '.join(f'new.{column}' for column in columns)
+    old = ', '.join(f'old.{column}' for column in columns)
+    return [
+        f'CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN '
+        f'INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END',
+        f'CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN '
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); END",
+        f'CREATE TRIGGER {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN '
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); "
+        f'INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END',
+    ]
+
+
+def _sqlite_sql(table, columns):
+    fts = f'{table}_fts'
+    return [
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({', '.join(columns)}, content='{table}', content_rowid='id')",
+        *_sqlite_triggers(table, columns),
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def search_index_operation(table, columns):
+    """Migration operation creating (and dropping) the search index of ``table``."""
+    def forward(apps, schema_editor):
+        vendor = schema_editor.connection.vendor
+        if vendor == 'sqlite':
+            try:
+                with schema_editor.connection.cursor() as cursor:
+                    cursor.execute('CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x)')
+                    cursor.execute('DROP TABLE temp.fts5_probe')
+            except OperationalError:
+                logger.warning('SQLite has no FTS5; ?q= on %s falls back to icontains.', table)
+                return
+            for sql in _sqlite_sql(table, columns):
+                schema_editor.execute(sql)
+        elif vendor == 'postgresql':
+            schema_editor.execute(
+                f'CREATE INDEX IF NOT EXISTS "{table}_search_idx" ON "{table}" '
+                f'USING GIN (({_pg_vector(table, columns)}))'
+            )
+
+    def backward(apps, schema_editor):
+        vendor = schema_editor.connection.vendor
+        if vendor == 'sqlite':
+            for suffix in ('ai', 'ad', 'au'):
+                schema_editor.execute(f'DROP TRIGGER IF EXISTS {table}_fts_{suffix}')
+            schema_editor.execute(f'DROP TABLE IF EXISTS {table}_fts')
+        elif vendor == 'postgresql':
+            schema_editor.execute(f'DROP INDEX IF EXISTS "{table}_search_idx"')
+
+    return migrations.RunPython(forward, backward)
+
+
+def restore_search_triggers_operation(table, columns):
+    """Migration operation recreating the SQLite triggers of ``table``'s index.
+
+    SQLite rebuilds a table to add or remove most columns, and its triggers
+    are dropped with the old table. The operation does the same both ways,
+    so put it before and after such operations: the last one restores the
+    triggers whichever way the migration runs. The index itself (and the
+    PostgreSQL one) survives.
+    """
+    def forward(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        if f'{table}_fts' not in schema_editor.connection.introspection.table_names():
+            return
+        fts = f'{table}_fts'
+        for suffix in ('ai', 'ad', 'au'):
+            schema_editor.execute(f'DROP TRIGGER IF EXISTS {fts}_{suffix}')
+        for sql in _sqlite_triggers(table, columns):
+            schema_editor.execute(sql)
+        schema_editor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+    return migrations.RunPython(forward, forward)
+
+
+def _has_index(table):
+    key = (connection.alias, connection.settings_dict['NAME'], table)
+    if key not in _available:
+        if connection.vendor == 'sqlite':
+            _available[key] = f'{table}_fts' in connection.introspection.table_names()
+        else:
+            _available[key] = connection.vendor == 'postgresql'
+    return _available[key]
+
+
+def _fallback(qs, words, columns):
+    for word in words:
+        qs = qs.filter(Q(*[Q(**{f'{column}__icontains': word}) for column in columns], _connector=Q.OR))
+    return qs.annotate(**{RANK: Value(0.0, output_field=FloatField())})
+
+
+def search(qs, text, columns):
+    """Filter ``qs`` to rows matching every word of ``text`` in ``columns``.
+
+    Rows are annotated with their relevance as ``RANK``.
+    """
+    words = tokens(text)
+    if not words:
+        return qs.none()
+    table = qs.model._meta.db_table
+    if not _has_index(table):
+        return _fallback(qs, words, columns)
+
+    if connection.vendor == 'sqlite':
+        fts = f'{table}_fts'
+        match = ' '.join('"{}"*'.format(word.replace('"', '""')) for word in words)
+        ids = RawSQL(f'SELECT rowid FROM {fts} WHERE {fts} MATCH %s', [match])
+        rank = RawSQL(
+            f'SELECT -bm25({fts}) FROM {fts} WHERE {fts} MATCH %s AND rowid = "{table}"."id"',
+            [match], output_field=FloatField(),
+        )
+    else:
+        vector = _pg_vector(table, columns)
+        match = ' & '.join(f'{word}:*' for word in words)
+        ids = RawSQL(f'SELECT id FROM "{table}" WHERE {vector} @@ to_tsquery(\'simple\', %s)', [match])
+        rank = RawSQL(f"ts_rank({vector}, to_tsquery('simple', %s))", [match], output_field=FloatField())
+    return qs.filter(id__in=ids).annotate(**{RANK: rank})
+
+
+def search_groups(qs, groups, columns, limit, require_all=True):
+    """Filter ``qs`` to the ``limit`` newest rows matching ``groups`` of words.
+
+    A row matches a group when ``columns`` hold one of its words (whole
+    words only). With ``require_all`` it must match every group, otherwise
+    any. The rows are picked from the whole table in one pass over the
+    index, then filtered by ``qs``. Without an index, words match as
+    ``icontains`` substrings.
+    """
+    groups = [[word for word in group if word] for group in groups]
+    groups = [group for group in groups if group]
+    if not groups:
+        return qs.none()
+    table = qs.model._meta.db_table
+    if not _has_index(table):
+        conditions = [
+            Q(*[Q(**{f'{column}__icontains': word}) for word in group for column in columns], _connector=Q.OR)
+            for group in groups
+        ]
+        condition = Q(*conditions, _connector=Q.AND if require_all else Q.OR)
+        return qs.filter(pk__in=qs.model._default_manager.filter(condition).order_by('-pk').values('pk')[:limit])
+    if connection.vendor == 'sqlite':
+        fts = f'{table}_fts'
+        match = (' AND ' if require_all else ' OR ').join(
+            '({})'.format(' OR '.join('"{}"'.format(word.replace('"', '""')) for word in group))
+            for group in groups
+        )
+        ids = RawSQL(f'SELECT rowid FROM {fts} WHERE {fts} MATCH %s ORDER BY rowid DESC LIMIT %s', [match, limit])
+    else:
+        match = (' & ' if require_all else ' | ').join('({})'.format(' | '.join(group)) for group in groups)
+        ids = RawSQL(
+            f'SELECT id FROM "{table}" WHERE {_pg_vector(table, columns)} @@ to_tsquery(\'simple\', %s) '
+            f'ORDER BY id DESC LIMIT %s',
+            [match, limit],
+        )
+    return qs.filter(id__in=ids)
@@ -0,0 +1,21 @@
+from rest_framework import serializers
+from .models import IngestBatch
+
+
+class IngestBatchSerializer(serializers.ModelSerializer):
+    """Progress report of a queued ingest batch (the payload is not echoed)."""
+
+    class Meta:
+        model = IngestBatch
+        fields = [
+            'id',
+            'source',
+            'status',
+            'total_items',
+            'processed_items',
+            'counts',
+            'errors',
+            'created_at',
+            'started_at',
+            'finished_at',
+        ]
@@ -0,0 +1,27 @@
+"""Test runner keeping the test suite away from deployment state.
+
+The ``responses`` cache defaults to the file backend under
+``BASE_DIR/.response_cache``, which a running server shares. Tests clear
+and fill that cache, so each run gets its own temporary directory
+instead: it neither wipes a deployment's cached responses nor reads
+entries left by an earlier run.
+"""
+import shutil
+import tempfile
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.cache_dir = tempfile.mkdtemp(prefix='response-cache-')
+        caches = {**settings.CACHES, 'responses': {**settings.CACHES['responses'], 'LOCATION': self.cache_dir}}
+        self.cache_override = override_settings(CACHES=caches)
+        self.cache_override.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.cache_override.disable()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)
@@ -0,0 +1,501 @@
+import gzip
+import json
+import os
+import re
+import shutil
+import tempfile
+import warnings
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from io import StringIO
+from unittest import mock, skipIf
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.core.cache.backends.base import CacheKeyWarning
+from django.core.management import call_command
+from django.db.models import F
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+from apps.bdgovjob.ingest import upsert_jobs
+from apps.bdgovjob.models import GovtJob
+from apps.n8n_integration.models import HotJob
+from apps.n8n_integration.ingest import ingest_jobs
+from .cache_backends import LRUFileBasedCache
+from .compression import GzipEncoder, available_encoders, brotli, negotiate
+from .fuzzy import similarity, trigrams
+from .models import DailyJobRollup, IdempotencyRecord, IngestBatch, SearchTerm
+from .normalize import (
+    DateTimeParser, normalize_govtjobs, normalize_hotjobs, parse_date_text, parse_deadline_at, parse_vacancies,
+)
+from .queue import claim_next_batch, process_batch
+from .response_cache import stats
+from .transactions import split, write_batched
+
+
+def hot_job(n):
+    return {
+        'company_name': f'Company {n}',
+        'position': f'Position {n}',
+        'job_url': f'https://hotjobs.bdjobs.com/jobs/company{n}/job{n}.htm',
+        'scraped_date': '2025-11-03 12:00:00',
+    }
+
+
+class IngestQueueTest(TestCase):
+    """Test cases for accept-and-queue ingest"""
+
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+
+    def test_enqueue_returns_202(self):
+        """Test that ?mode=async stores the batch without touching HotJob"""
+        response = self.client.post('/n8n/send-data/?mode=async', [hot_job(1), hot_job(2)], format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['total_items'], 2)
+        self.assertTrue(response.data['status_url'].endswith(f"/n8n/ingest-batches/{response.data['batch_id']}/"))
+        self.assertEqual(HotJob.objects.count(), 0)
+        batch = IngestBatch.objects.get()
+        self.assertEqual((batch.source, batch.status), (IngestBatch.SOURCE_HOTJOBS, IngestBatch.STATUS_PENDING))
+
+    def test_enqueue_rejects_invalid_json(self):
+        """Test that invalid JSON or a non-UTF-8 body is rejected up front"""
+        for body in ['{oops', b'[{"position": "\xff"}]']:
+            with self.subTest(body=body):
+                response = self.client.post('/n8n/send-data/?mode=async', body, content_type='application/json')
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(IngestBatch.objects.exists())
+
+    def test_process_batch_reports_progress(self):
+        """Test that a claimed batch is drained and its status endpoint reports it"""
+        payload = [hot_job(1), hot_job(1), {'job_url': 'not a url'}]
+        batch_id = self.client.post('/n8n/send-data/?mode=async', payload, format='json').data['batch_id']
+
+        process_batch(claim_next_batch(), chunk_size=2)
+
+        response = self.client.get(f'/n8n/ingest-batches/{batch_id}/')
+        self.assertEqual(response.data['status'], IngestBatch.STATUS_DONE)
+        self.assertEqual(response.data['processed_items'], 3)
+        self.assertEqual(response.data['counts'], {'created': 1, 'skipped': 1})
+        self.assertIn('job_url', response.data['errors'][0])
+        self.assertEqual(HotJob.objects.count(), 1)
+
+    def test_batch_scoped_to_source(self):
+        """Test that a batch id is only visible under its own app"""
+        batch_id = self.client.post('/n8n/send-data/?mode=async', [hot_job(1)], format='json').data['batch_id']
+        response = self.client.get(f'/bdgovjob/ingest-batches/{batch_id}/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_claim_is_exclusive(self):
+        """Test that a batch can only be claimed once"""
+        IngestBatch.objects.create(source=IngestBatch.SOURCE_HOTJOBS, payload='[]')
+        self.assertIsNotNone(claim_next_batch())
+        self.assertIsNone(claim_next_batch())
+
+    def test_failed_batch(self):
+        """Test that an unreadable payload marks the batch failed"""
+        IngestBatch.objects.create(source=IngestBatch.SOURCE_HOTJOBS, payload='{oops')
+        batch = process_batch(claim_next_batch())
+        self.assertEqual(batch.status, IngestBatch.STATUS_FAILED)
+        self.assertTrue(batch.errors)
+
+
+class ProcessIngestBatchesCommandTest(TransactionTestCase):
+    """Test cases for the process_ingest_batches worker command"""
+
+    def test_drains_queue(self):
+        """Test that the worker pool drains batches for both sources"""
+        IngestBatch.objects.create(
+            source=IngestBatch.SOURCE_HOTJOBS, payload=json.dumps([hot_job(1), hot_job(2)]), total_items=2
+        )
+        IngestBatch.objects.create(
+            source=IngestBatch.SOURCE_GOVTJOBS,
+            payload=json.dumps({'job_title': 'Job', 'job_url': 'https://bdgovtjob.net/job-1/'}),
+            total_items=1,
+        )
+        call_command('process_ingest_batches', once=True, concurrency=1, stdout=StringIO())
+        self.assertFalse(IngestBatch.objects.exclude(status=IngestBatch.STATUS_DONE).exists())
+        self.assertEqual(HotJob.objects.count(), 2)
+        self.assertEqual(GovtJob.objects.count(), 1)
+
+
+class NormalizeTest(TestCase):
+    """Test cases for the batch normalization engine"""
+
+    def test_hotjob_rows(self):
+        """Test the HotJob cleaning rules"""
+        row = normalize_hotjobs([{
+            'company_name': '  BRAC Bank  ',
+            'company_logo_url': 'N/A',
+            'position': ' ESG   Analyst ',
+            'job_url': ' https://hotjobs.bdjobs.com/jobs/bracbank/bracbank859.htm ',
+            'scraped_date': '2025-11-03 12:00:00',
+        }])[0]
+        self.assertEqual(row['company_name'], 'BRAC Bank')
+        self.assertIsNone(row['company_logo_url'])
+        self.assertEqual(row['position'], 'ESG Analyst')
+        self.assertEqual(row['job_url'], 'https://hotjobs.bdjobs.com/jobs/bracbank/bracbank859.htm')
+        self.assertEqual(row['scraped_date'], datetime(2025, 11, 3, 12, tzinfo=dt_timezone.utc))
+
+    def test_govtjob_partial_rows(self):
+        """Test that only keys present in a row are cleaned or added"""
+        rows = normalize_govtjobs([{'vacancies': ' N/A '}, {'deadline': ' 30 November 2025 '}])
+        self.assertEqual(rows, [
+            {'vacancies': None, 'vacancies_int': None},
+            {'deadline': '30 November 2025', 'deadline_at': datetime(2025, 11, 30, 23, 59, 59, 999999, tzinfo=dt_timezone.utc)},
+        ])
+
+    def test_govtjob_typed_fields(self):
+        """Test vacancy and date parsing of English and Bengali scraper text"""
+        for text, expected in [('65', 65), ('1,017 posts', 1017), ('৬৫ জন', 65), ('Various', None)]:
+            with self.subTest(text=text):
+                self.assertEqual(parse_vacancies(text), expected)
+        for text, expected in [
+            ('25 November 2025 at 5:00 PM', (date(2025, 11, 25), time(17, 0))),
+            (' 3 November, 2025', (date(2025, 11, 3), None)),
+            ('Nov 30th 2025 (10.30)', (date(2025, 11, 30), time(10, 30))),
+            ('30/11/2025', (date(2025, 11, 30), None)),
+            ('2025-11-30 23:59', (date(2025, 11, 30), time(23, 59))),
+            ('২৫ নভেম্বর ২০২৫', (date(2025, 11, 25), None)),
+            ('31 November 2025', None),
+            ('N/A', None),
+        ]:
+            with self.subTest(text=text):
+                self.assertEqual(parse_date_text(text), expected)
+        self.assertEqual(
+            parse_deadline_at('30 Nov 2025 5 pm', dt_timezone.utc), datetime(2025, 11, 30, 17, tzinfo=dt_timezone.utc),
+        )
+
+    def test_matches_model_save(self):
+        """Test that save() and the batch engine store the same values"""
+        data = {
+            'job_title': ' Job ', 'job_url': 'https://bdgovtjob.net/job/', 'vacancies': '',
+            'deadline': 'N/A', 'posted_date': ' 3 November, 2025', 'scraped_at': '2025-11-03T10:30:00+06:00',
+        }
+        job = GovtJob.objects.create(**data)
+        row = normalize_govtjobs([data])[0]
+        self.assertEqual({field: getattr(job, field) for field in row}, row)
+
+    def test_datetime_parser(self):
+        """Test format detection, caching and fallbacks of DateTimeParser"""
+        parse = DateTimeParser(tz=dt_timezone.utc)
+        iso = parse('2025-11-03T12:00:00')
+        self.assertEqual(iso, datetime(2025, 11, 3, 12, tzinfo=dt_timezone.utc))
+        self.assertIs(parse('2025-11-03T12:00:00'), iso)
+        self.assertEqual(parse('2025-11-03 12:00:00'), iso)
+        self.assertIsNone(parse('yesterday'))
+        self.assertIsNone(parse(None))
+
+
+class IdempotencyTest(TestCase):
+    """Test cases for Idempotency-Key handling on send-data"""
+
+    url = '/n8n/send-data/'
+
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+
+    def post(self, payload, **headers):
+        return self.client.post(self.url, payload, format='json', **headers)
+
+    def test_replay_with_header(self):
+        """Test that a retry with the same key replays without running again"""
+        first = self.post([hot_job(1)], HTTP_IDEMPOTENCY_KEY='run-1')
+        with self.assertNumQueries(0):
+            retry = self.post([hot_job(1)], HTTP_IDEMPOTENCY_KEY='run-1')
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(HotJob.objects.count(), 1)
+
+    def test_replay_from_database(self):
+        """Test that the durable record answers once the cache entry is gone"""
+        first = self.post([hot_job(1)], HTTP_IDEMPOTENCY_KEY='run-1')
+        cache.clear()
+        retry = self.post([hot_job(1)], HTTP_IDEMPOTENCY_KEY='run-1')
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry.data, first.data)
+
+    def test_body_hash_fallback(self):
+        """Test that an identical body without a key is replayed"""
+        self.post([hot_job(1)])
+        retry = self.post([hot_job(1)])
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+
+    def test_different_keys_run_separately(self):
+        """Test that a new key processes the request again"""
+        self.post([hot_job(1)], HTTP_IDEMPOTENCY_KEY='run-1')
+        response = self.post([hot_job(1)], HTTP_IDEMPOTENCY_KEY='run-2')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(response.has_header('Idempotent-Replayed'))
+
+    def test_in_progress_conflict(self):
+        """Test that a retry during the first request gets 409"""
+        self.post([hot_job(1)], HTTP_IDEMPOTENCY_KEY='run-1')
+        record = IdempotencyRecord.objects.get()
+        record.status_code = None
+        record.save()
+        cache.clear()
+        response = self.post([hot_job(1)], HTTP_IDEMPOTENCY_KEY='run-1')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+    def test_expired_records_pruned(self):
+        """Test that expired records are replaced and pruned"""
+        self.post([hot_job(1)], HTTP_IDEMPOTENCY_KEY='run-1')
+        IdempotencyRecord.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        cache.clear()
+        response = self.post([hot_job(2)], HTTP_IDEMPOTENCY_KEY='run-2')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(IdempotencyRecord.objects.count(), 1)
+
+
+class WriteBatchedTest(TestCase):
+    """Test cases for savepoint-isolated batch writes"""
+
+    def test_bad_row_isolated(self):
+        """Test that a failing row is reported and the rest of its chunk is kept"""
+        HotJob.objects.create(company_name='k2')
+        rows = [HotJob(company_name=f'k{n}') for n in range(5)]
+        for job in rows:
+            job.normalize()
+        results, failures = write_batched(HotJob.objects.bulk_create, rows, batch_size=2)
+        self.assertEqual([job.company_name for job, _ in failures], ['k2'])
+        self.assertEqual(len(results), 3)
+        self.assertEqual(HotJob.objects.count(), 5)
+
+    def test_split(self):
+        """Test that size 0 keeps everything in one group"""
+        self.assertEqual(split([1, 2, 3], 2), [[1, 2], [3]])
+        self.assertEqual(split([1, 2, 3], 0), [[1, 2, 3]])
+        self.assertEqual(split([], 0), [])
+
+
+class ResponseCacheTest(TestCase):
+    """Test cases for the versioned get-data response cache"""
+
+    url = '/n8n/get-data/today/'
+
+    def setUp(self):
+        self.client = APIClient()
+        caches['responses'].clear()
+        HotJob.objects.create(**hot_job(1))
+
+    def test_hit_after_miss(self):
+        """Test that a repeated request is served from the cache without queries"""
+        first = self.client.get(self.url)
+        self.assertEqual(first['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            second = self.client.get(self.url)
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(stats([IngestBatch.SOURCE_HOTJOBS])[IngestBatch.SOURCE_HOTJOBS], {'hits': 1, 'misses': 1})
+
+    def test_query_params_normalized(self):
+        """Test that parameter order does not split the cache"""
+        self.client.get(self.url + '?limit=5&count=false')
+        self.assertEqual(self.client.get(self.url + '?count=false&limit=5')['X-Cache'], 'HIT')
+
+    def test_ingest_invalidates(self):
+        """Test that a committed ingest retires cached responses of its app only"""
+        self.client.get(self.url)
+        self.client.get('/bdgovjob/get-data/today/')
+        with self.captureOnCommitCallbacks(execute=True):
+            ingest_jobs([hot_job(2)])
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual(self.client.get('/bdgovjob/get-data/today/')['X-Cache'], 'HIT')
+
+    def test_shared_between_processes(self):
+        """Test that a version bump and counters written by another process are seen here"""
+        self.client.get(self.url)
+        other = LRUFileBasedCache(settings.CACHES['responses']['LOCATION'], {})
+        other.incr(f'response-cache:version:{IngestBatch.SOURCE_HOTJOBS}')
+        self.assertEqual(self.client.get(self.url)['X-Cache'], 'MISS')
+        self.assertEqual(other.get(f'response-cache:stats:{IngestBatch.SOURCE_HOTJOBS}:misses'), 2)
+
+    def test_disabled(self):
+        """Test that RESPONSE_CACHE_TTL=0 turns the cache off"""
+        with self.settings(RESPONSE_CACHE_TTL=0):
+            self.client.get(self.url)
+            self.assertNotIn('X-Cache', self.client.get(self.url))
+
+    def test_file_backend_evicts_least_recently_used(self):
+        """Test that the file backend culls the entries read longest ago"""
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        backend = LRUFileBasedCache(location, {'OPTIONS': {'MAX_ENTRIES': 3, 'CULL_FREQUENCY': 3}})
+        for n, key in enumerate(['a', 'b', 'c']):
+            backend.set(key, n)
+            os.utime(backend._key_to_file(key), (n, n))
+        backend.get('a')
+        backend.set('d', 3)
+        self.assertIsNone(backend.get('b'))
+        self.assertEqual(backend.get('a'), 0)
+        self.assertEqual(backend.get('d'), 3)
+
+
+class FuzzyVocabularyTest(TestCase):
+    """Test cases for the trigram vocabulary behind the search/ endpoints"""
+
+    def terms(self):
+        return set(SearchTerm.objects.filter(source=IngestBatch.SOURCE_HOTJOBS).values_list('term', flat=True))
+
+    def test_trigrams(self):
+        """Test that words are padded like pg_trgm and compared by Jaccard index"""
+        self.assertEqual(trigrams('cat'), {'  c', ' ca', 'cat', 'at '})
+        self.assertEqual(similarity('bank', 'bank'), 1.0)
+        self.assertGreater(similarity('bangladsh', 'bangladesh'), 0.5)
+        self.assertLess(similarity('bangladsh', 'grameenphone'), 0.1)
+
+    def test_ingest_adds_words(self):
+        """Test that ingest indexes new words once, skipping numbers"""
+        ingest_jobs([hot_job(1), hot_job(2)])
+        self.assertEqual(self.terms(), {'company', 'position'})
+        ingest_jobs([dict(hot_job(3), company_name='Bangladesh Bank')])
+        self.assertEqual(self.terms(), {'company', 'position', 'bangladesh', 'bank'})
+
+    def test_rebuild_command(self):
+        """Test that rebuild_search_terms drops unused words and adds missing ones"""
+        ingest_jobs([hot_job(1)])
+        HotJob.objects.update(company_name='Grameenphone')
+        out = StringIO()
+        call_command('rebuild_search_terms', '--source', IngestBatch.SOURCE_HOTJOBS, stdout=out)
+        self.assertEqual(self.terms(), {'grameenphone', 'position'})
+        self.assertIn('indexed 2 word(s)', out.getvalue())
+
+
+class DailyRollupTest(TestCase):
+    """Test cases for the per-day counters maintained on ingest"""
+
+    counters = ('source', 'day', 'created', 'updated', 'with_vacancies', 'with_deadline')
+
+    def rollups(self):
+        return list(DailyJobRollup.objects.order_by('source', 'day').values_list(*self.counters))
+
+    def govt_job(self, n, **overrides):
+        return dict({'job_title': f'Job {n}', 'job_url': f'https://bdgovtjob.net/job-{n}/'}, **overrides)
+
+    def test_ingest_counts(self):
+        """Test that created rows are counted once, with their vacancies and deadlines"""
+        ingest_jobs([hot_job(1), hot_job(2)])
+        ingest_jobs([hot_job(2)])
+        upsert_jobs([self.govt_job(1, vacancies='5', deadline='30 Nov 2025'), self.govt_job(2, vacancies='N/A')])
+        today = timezone.localdate()
+        self.assertEqual(self.rollups(), [
+            (IngestBatch.SOURCE_GOVTJOBS, today, 2, 0, 1, 1),
+            (IngestBatch.SOURCE_HOTJOBS, today, 2, 0, 0, 0),
+        ])
+        rollup = DailyJobRollup.objects.get(source=IngestBatch.SOURCE_GOVTJOBS)
+        self.assertEqual(rollup.last_created_at, GovtJob.objects.latest('created_at').created_at)
+
+    def test_update_counts_on_creation_day(self):
+        """Test that a filled-in vacancy moves the counters of the day the job was created"""
+        upsert_jobs([self.govt_job(1), self.govt_job(2)])
+        GovtJob.objects.update(created_at=F('created_at') - timedelta(days=3), updated_at=F('updated_at') - timedelta(days=3))
+        call_command('rebuild_rollups', stdout=StringIO())
+        upsert_jobs([self.govt_job(1, vacancies='5'), self.govt_job(2)])
+        today = timezone.localdate()
+        expected = [
+            (IngestBatch.SOURCE_GOVTJOBS, today - timedelta(days=3), 2, 0, 1, 0),
+            (IngestBatch.SOURCE_GOVTJOBS, today, 0, 1, 0, 0),
+        ]
+        self.assertEqual(self.rollups(), expected)
+        out = StringIO()
+        call_command('rebuild_rollups', '--source', IngestBatch.SOURCE_GOVTJOBS, stdout=out)
+        self.assertEqual(self.rollups(), expected)
+        self.assertIn('stored 2 day(s)', out.getvalue())
+
+    def test_failed_rows_not_counted(self):
+        """Test that a row the database rejects is left out of the rollups"""
+        with mock.patch('apps.n8n_integration.models.HotJob.objects.bulk_create', side_effect=ValueError('boom')):
+            ingest_jobs([hot_job(1)])
+        self.assertEqual(self.rollups(), [])
+
+
+class CompressionTest(TestCase):
+    """Test cases for Accept-Encoding negotiated response compression"""
+
+    url = '/n8n/get-data/'
+
+    def setUp(self):
+        self.client = APIClient()
+        caches['responses'].clear()
+        ingest_jobs([hot_job(n) for n in range(20)])
+
+    def test_gzip(self):
+        """Test that a large response is gzipped and decompresses to the plain body"""
+        plain = self.client.get(self.url)
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertLess(len(response.content), len(plain.content) / 3)
+        self.assertNotIn('Content-Encoding', plain)
+
+    def test_negotiation(self):
+        """Test that q-values are honoured and unknown codings fall back to identity"""
+        self.assertIs(negotiate('gzip;q=0.5, identity'), GzipEncoder)
+        self.assertIs(negotiate('*'), available_encoders()[0])
+        self.assertIsNone(negotiate('gzip;q=0'))
+        self.assertIsNone(negotiate('deflate'))
+        self.assertIsNone(negotiate(''))
+
+    @skipIf(brotli is None, 'brotli is not installed')
+    def test_brotli_preferred(self):
+        """Test that br wins over gzip when brotli is installed"""
+        plain = self.client.get(self.url)
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, deflate, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(response.content), plain.content)
+        self.assertIs(negotiate('br;q=0.5, gzip'), GzipEncoder)
+
+    def test_min_size(self):
+        """Test that bodies under COMPRESSION_MIN_SIZE are sent as they are"""
+        with self.settings(COMPRESSION_MIN_SIZE=10 ** 6):
+            response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertNotIn('Content-Encoding', response)
+
+    def test_streamed(self):
+        """Test that streamed exports are compressed chunk by chunk"""
+        plain = b''.join(self.client.get('/n8n/export/').streaming_content)
+        response = self.client.get('/n8n/export/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), plain)
+
+    def test_cached_period_response_compressed_once(self):
+        """Test that cache hits reuse the stored compressed bytes"""
+        with mock.patch.object(GzipEncoder, 'finish', autospec=True, side_effect=GzipEncoder.finish) as finish:
+            first = self.client.get('/n8n/get-data/today/', HTTP_ACCEPT_ENCODING='gzip')
+            second = self.client.get('/n8n/get-data/today/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(finish.call_count, 1)
+
+    def test_user_html_never_shared(self):
+        """Test that an anonymous gzip request never gets another user's browsable API page"""
+        User.objects.create_superuser('admin-user', 'admin@example.com', 'secret')
+        admin = APIClient()
+        admin.login(username='admin-user', password='secret')
+        page = gzip.decompress(
+            admin.get('/n8n/get-data/today/', HTTP_ACCEPT='text/html', HTTP_ACCEPT_ENCODING='gzip').content
+        )
+        self.assertIn(b'admin-user', page)
+        token = re.search(rb'"csrfToken": "(\w+)"', page).group(1)
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', CacheKeyWarning)
+            response = self.client.get('/n8n/get-data/today/', HTTP_ACCEPT='text/html', HTTP_ACCEPT_ENCODING='gzip')
+        body = gzip.decompress(response.content)
+        self.assertNotIn(b'admin-user', body)
+        self.assertNotIn(token, body)
+
+    def test_weak_etag_revalidates(self):
+        """Test that the weakened ETag of a compressed response still gets a 304"""
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertTrue(response['ETag'].startswith('W/"'))
+        again = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(again.status_code, status.HTTP_304_NOT_MODIFIED)
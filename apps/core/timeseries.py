@@ -0,0 +1,125 @@
+"""Job counts per hour, day or week behind the ``timeseries/`` endpoints.
+
+Charting job volume used to take one ``get-data/date/<d>/`` call per day.
+Here a whole range is one grouped query: ``Trunc*`` of ``created_at``
+over a half-open ``created_at`` range, which the ``created_at`` index
+serves. Day and week charts without text filters read the daily rollups
+(``apps.core.rollups``) instead, tens of rows rather than every job of
+the range.
+
+The query only returns buckets that have jobs; the empty ones are filled
+in here, so a chart gets one point per bucket.
+"""
+from datetime import datetime, time, timedelta
+from django.conf import settings
+from django.db.models import Count
+from django.db.models.functions import TruncDay, TruncHour, TruncWeek
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from .models import DailyJobRollup
+from .pagination import parse_limit
+
+BUCKET_PARAM = 'bucket'
+TRUNCS = {'hour': TruncHour, 'day': TruncDay, 'week': TruncWeek}
+STEPS = {'hour': timedelta(hours=1), 'day': timedelta(days=1), 'week': timedelta(weeks=1)}
+DATE_FORMAT = '%Y-%m-%d'
+
+
+def _parse_date(request, param):
+    value = request.query_params.get(param)
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, DATE_FORMAT).date()
+    except ValueError:
+        raise ValidationError({'error': f'{param} must be a date (YYYY-MM-DD)'})
+
+
+def _midnight(day):
+    return timezone.make_aware(datetime.combine(day, time.min), timezone.get_current_timezone())
+
+
+def parse_range(request, bucket):
+    """Read ``?start=``/``?end=`` (dates, both included) or ``?days=``.
+
+    Without ``start`` the range is the last ``days`` days up to ``end``
+    (default today). Week ranges start on the Monday of their first day.
+    Returns the ``(first, last)`` dates. Raises ``ValidationError`` for a
+    bad date, an inverted range or more than ``TIMESERIES_MAX_BUCKETS``
+    buckets.
+    """
+    last = _parse_date(request, 'end') or timezone.localdate()
+    first = _parse_date(request, 'start')
+    if first is None:
+        days = parse_limit(request, settings.TIMESERIES_DEFAULT_DAYS, settings.TIMESERIES_MAX_DAYS, 'days')
+        first = last - timedelta(days=days - 1)
+    if first > last:
+        raise ValidationError({'error': 'start must not be after end'})
+    if bucket == 'week':
+        first -= timedelta(days=first.weekday())
+    buckets = (_midnight(last + timedelta(days=1)) - _midnight(first)) / STEPS[bucket]
+    if buckets > settings.TIMESERIES_MAX_BUCKETS:
+        raise ValidationError({
+            'error': f'{int(buckets)} {bucket} buckets requested; narrow the range or use a larger bucket '
+                     f'(at most {settings.TIMESERIES_MAX_BUCKETS})',
+        })
+    return first, last
+
+
+def _bucket_starts(bucket, first, last):
+    if bucket == 'hour':
+        # Stepping instants from local midnight keeps DST days at their
+        # real length (23 or 25 hours).
+        start, end = _midnight(first), _midnight(last + timedelta(days=1))
+        return [start + STEPS['hour'] * n for n in range(int((end - start) / STEPS['hour']))]
+    step = STEPS[bucket].days
+    return [_midnight(first + timedelta(days=n)) for n in range(0, (last - first).days + 1, step)]
+
+
+def _counts_from_rollups(source, bucket, first, last):
+    rows = (
+        DailyJobRollup.objects.filter(source=source, day__gte=first, day__lte=last)
+        .order_by().values_list('day', 'created')
+    )
+    counts = {}
+    for day, created in rows:
+        if bucket == 'week':
+            day -= timedelta(days=day.weekday())
+        start = _midnight(day)
+        counts[start] = counts.get(start, 0) + created
+    return counts
+
+
+def timeseries(request, qs, source, use_rollups=True):
+    """Count the rows of ``qs`` per ``?bucket=`` (hour, day or week) in one query.
+
+    Day and week counts come from ``source``'s rollups when
+    ``use_rollups`` (i.e. ``qs`` is not narrowed by other filters).
+    Returns ``{bucket, start, end, total, series}``; ``series`` lists every
+    bucket of the range in order as ``{start, count}``. Raises
+    ``ValidationError`` for a bad bucket or range.
+    """
+    bucket = request.query_params.get(BUCKET_PARAM, 'day').lower()
+    if bucket not in TRUNCS:
+        raise ValidationError({'error': f"bucket must be one of: {', '.join(TRUNCS)}"})
+    first, last = parse_range(request, bucket)
+    start, end = _midnight(first), _midnight(last + timedelta(days=1))
+
+    if use_rollups and bucket != 'hour':
+        counts = _counts_from_rollups(source, bucket, first, last)
+    else:
+        counts = dict(
+            qs.filter(created_at__gte=start, created_at__lt=end).order_by()
+            .annotate(bucket_start=TRUNCS[bucket]('created_at')).values('bucket_start')
+            .annotate(count=Count('pk')).values_list('bucket_start', 'count')
+        )
+
+    series = [{'start': bucket_start, 'count': counts.get(bucket_start, 0)}
+              for bucket_start in _bucket_starts(bucket, first, last)]
+    return {
+        'bucket': bucket,
+        'start': start,
+        'end': end,
+        'total': sum(point['count'] for point in series),
+        'series': series,
+    }
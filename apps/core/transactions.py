@@ -0,0 +1,64 @@
+"""Batched transactions with savepoint isolation for the ingest paths.
+
+A batch is written in groups of ``INGEST_TRANSACTION_SIZE`` rows, one
+transaction (and one commit/fsync) per group; 0 means the whole batch in a
+single transaction. Inside a group, each chunk of ``INGEST_BATCH_SIZE``
+rows runs in a savepoint. If a chunk fails, only its savepoint is rolled
+back and the chunk is retried row by row, each row in its own savepoint,
+so one bad row costs that row and nothing else.
+"""
+from django.conf import settings
+from django.db import transaction
+
+
+def split(rows, size):
+    """Split ``rows`` into consecutive lists of ``size`` (everything if size <= 0)."""
+    if size <= 0:
+        return [rows] if rows else []
+    return [rows[start:start + size] for start in range(0, len(rows), size)]
+
+
+def write_isolated(write, rows):
+    """Run ``write(rows)`` in a savepoint, falling back to one savepoint per row.
+
+    Returns ``(results, failures)``: the return values of the successful
+    ``write`` calls and ``(row, exception)`` pairs for rows that failed on
+    their own.
+    """
+    try:
+        with transaction.atomic():
+            return [write(rows)], []
+    except Exception as exc:
+        if len(rows) == 1:
+            return [], [(rows[0], exc)]
+
+    results = []
+    failures = []
+    for row in rows:
+        try:
+            with transaction.atomic():
+                results.append(write([row]))
+        except Exception as exc:
+            failures.append((row, exc))
+    return results, failures
+
+
+def write_batched(write, rows, batch_size=None, transaction_size=None):
+    """Write ``rows`` through ``write`` in savepoint-isolated chunks.
+
+    Chunks are grouped into transactions of ``transaction_size`` rows.
+    Returns ``(results, failures)`` like ``write_isolated``, for all chunks.
+    """
+    if batch_size is None:
+        batch_size = settings.INGEST_BATCH_SIZE
+    if transaction_size is None:
+        transaction_size = settings.INGEST_TRANSACTION_SIZE
+    results = []
+    failures = []
+    for group in split(rows, transaction_size):
+        with transaction.atomic():
+            for chunk in split(group, batch_size):
+                chunk_results, chunk_failures = write_isolated(write, chunk)
+                results.extend(chunk_results)
+                failures.extend(chunk_failures)
+    return results, failures
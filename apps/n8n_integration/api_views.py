@@ -1,66 +1,56 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework import status, serializers
+from rest_framework import status
+from django.conf import settings
 from django.utils import timezone
-from datetime import timedelta, datetime
-from django.db.models import Q
+from datetime import time, timedelta, datetime
+from django.db.models import Count, Q, Window
 from .models import HotJob
-
-
-class JobSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = HotJob
-        fields = ['id', 'company_name', 'company_logo_url', 'position', 'job_url', 'scraped_date', 'created_at']
+from .serializers import JobSerializer, JOB_ROWS
+from .ingest import ingest_jobs, ingest_counts
+from apps.core.conditional import check_values, conditional
+from apps.core.export import export
+from apps.core.fuzzy import fuzzy_search
+from apps.core.idempotency import idempotent
+from apps.core.models import IngestBatch
+from apps.core.ndjson import stream_ingest
+from apps.core.pagination import paginate, parse_limit
+from apps.core.queue import enqueue
+from apps.core.response_cache import cached_response
+from apps.core.rollups import day_of, summary
+from apps.core.responses import wants_summary
+from apps.core.rows import select_fields
+from apps.core.search import search
+from apps.core.timeseries import timeseries
 
 
 class SendDataView(APIView):
-    """POST: accept single or list of jobs and persist them."""
+    """POST: accept single or list of jobs and persist them.
 
+    With ``?mode=async`` the batch is queued and 202 is returned with a
+    batch id; poll ``ingest-batches/<id>/`` for the outcome. With
+    ``?response=summary`` only counts, ids and errors are returned.
+    """
+
+    @idempotent
     def post(self, request):
+        if request.query_params.get('mode') == 'async':
+            return enqueue(request, IngestBatch.SOURCE_HOTJOBS, 'ingest_batch')
+
         data = request.data
         payloads = data if isinstance(data, list) else [data]
 
-        created = []
-        errors = []
-        skipped = []
-
-        for item in payloads:
-            serializer = JobSerializer(data=item)
-            if not serializer.is_valid():
-                errors.append(serializer.errors)
-                continue
-
-            vd = serializer.validated_data
-            job_url = (vd.get('job_url') or '').strip()
-
-            # Deduplication strategy:
-            # 1) If job_url provided, consider it unique key.
-            # 2) Otherwise, use company_name + position + scraped_date as fallback key.
-            exists = False
-            if job_url:
-                exists = HotJob.objects.filter(job_url=job_url).exists()
-            else:
-                exists = HotJob.objects.filter(
-                    company_name=vd.get('company_name'),
-                    position=vd.get('position'),
-                    scraped_date=vd.get('scraped_date')
-                ).exists()
-
-            if exists:
-                skipped.append({'item': item, 'reason': 'duplicate'})
-                continue
-
-            # create new record
-            job = HotJob.objects.create(
-                company_name=vd.get('company_name'),
-                company_logo_url=vd.get('company_logo_url', ''),
-                position=vd.get('position'),
-                job_url=vd.get('job_url', ''),
-                scraped_date=vd.get('scraped_date'),
-            )
-            created.append(JobSerializer(job).data)
+        created, skipped, errors = ingest_jobs(payloads)
 
-        resp = {'created': created, 'skipped': skipped}
+        if wants_summary(request):
+            resp = {
+                'created_ids': [job.pk for job in created],
+                'total_created': len(created),
+                'total_skipped': len(skipped),
+                'total_errors': len(errors),
+            }
+        else:
+            resp = {'created': JobSerializer(created, many=True).data, 'skipped': skipped}
         if errors:
             resp['errors'] = errors
 
@@ -68,142 +58,183 @@ class SendDataView(APIView):
         return Response(resp, status=status_code)
 
 
+class SendDataStreamView(APIView):
+    """POST: ingest an NDJSON body in fixed-size chunks, streaming progress back."""
+
+    def post(self, request):
+        return stream_ingest(request, ingest_counts)
+
+
+def filter_text(request, qs):
+    """Apply the get-data text filters; return ``(queryset, filters echoed back)``."""
+    # Filter by company name (case-insensitive partial match)
+    company = request.query_params.get('company')
+    if company:
+        qs = qs.filter(company_name__icontains=company)
+    
+    # Filter by position (case-insensitive partial match)
+    position = request.query_params.get('position')
+    if position:
+        qs = qs.filter(position__icontains=position)
+    
+    # Full-text search, ranked, every word a prefix (apps.core.search)
+    q = request.query_params.get('q')
+    if q:
+        qs = search(qs, q, HotJob.SEARCH_FIELDS)
+    
+    return qs, {'company': company, 'position': position, 'q': q}
+
+
+def filter_jobs(request):
+    """Apply the get-data query params; return ``(queryset, filters echoed back)``."""
+    qs = HotJob.objects.all()
+    
+    # Filter by days (last N days)
+    days = request.query_params.get('days')
+    if days:
+        try:
+            days_int = int(days)
+            date_from = timezone.now() - timedelta(days=days_int)
+            qs = qs.filter(created_at__gte=date_from)
+        except ValueError:
+            pass
+    
+    # Filter by date range
+    start_date = request.query_params.get('start')
+    if start_date:
+        try:
+            start = datetime.strptime(start_date, '%Y-%m-%d')
+            start_aware = timezone.make_aware(start, timezone.get_current_timezone())
+            qs = qs.filter(created_at__gte=start_aware)
+        except ValueError:
+            pass
+    
+    end_date = request.query_params.get('end')
+    if end_date:
+        try:
+            end = datetime.strptime(end_date, '%Y-%m-%d')
+            end_aware = timezone.make_aware(end, timezone.get_current_timezone())
+            # Add 1 day to include the end date
+            end_aware = end_aware + timedelta(days=1)
+            qs = qs.filter(created_at__lt=end_aware)
+        except ValueError:
+            pass
+    
+    qs, text_filters = filter_text(request, qs)
+    
+    filters = {
+        'days': days,
+        'start_date': start_date,
+        'end_date': end_date,
+        **text_filters,
+    }
+    return qs, filters
+
+
 class GetDataView(APIView):
     """GET: list persisted hot jobs with optional filters via query params."""
 
+    @conditional
     def get(self, request):
-        qs = HotJob.objects.all()
-        
-        # Filter by days (last N days)
-        days = request.query_params.get('days')
-        if days:
-            try:
-                days_int = int(days)
-                date_from = timezone.now() - timedelta(days=days_int)
-                qs = qs.filter(created_at__gte=date_from)
-            except ValueError:
-                pass
-        
-        # Filter by date range
-        start_date = request.query_params.get('start')
-        if start_date:
-            try:
-                start = datetime.strptime(start_date, '%Y-%m-%d')
-                start_aware = timezone.make_aware(start, timezone.get_current_timezone())
-                qs = qs.filter(created_at__gte=start_aware)
-            except ValueError:
-                pass
-        
-        end_date = request.query_params.get('end')
-        if end_date:
-            try:
-                end = datetime.strptime(end_date, '%Y-%m-%d')
-                end_aware = timezone.make_aware(end, timezone.get_current_timezone())
-                # Add 1 day to include the end date
-                end_aware = end_aware + timedelta(days=1)
-                qs = qs.filter(created_at__lt=end_aware)
-            except ValueError:
-                pass
+        qs, filters = filter_jobs(request)
         
-        # Filter by company name (case-insensitive partial match)
-        company = request.query_params.get('company')
-        if company:
-            qs = qs.filter(company_name__icontains=company)
-        
-        # Filter by position (case-insensitive partial match)
-        position = request.query_params.get('position')
-        if position:
-            qs = qs.filter(position__icontains=position)
-        
-        qs = qs.order_by('-created_at')
-        serializer = JobSerializer(qs, many=True)
+        jobs, count, page = paginate(request, qs, JOB_ROWS)
         
         return Response({
-            'filters': {
-                'days': days,
-                'start_date': start_date,
-                'end_date': end_date,
-                'company': company,
-                'position': position,
-            },
-            'count': qs.count(),
-            'jobs': serializer.data
+            'filters': filters,
+            'count': count,
+            'jobs': jobs,
+            **page,
         })
 
 
 class GetTodayDataView(APIView):
     """GET: Jobs scraped today"""
     
+    @cached_response(IngestBatch.SOURCE_HOTJOBS)
+    @conditional
     def get(self, request):
         today = timezone.now().date()
         qs = HotJob.objects.filter(
             created_at__date=today
-        ).order_by('-created_at')
-        serializer = JobSerializer(qs, many=True)
+        )
+        jobs, count, page = paginate(request, qs, JOB_ROWS)
         return Response({
             'date': str(today),
-            'count': qs.count(),
-            'jobs': serializer.data
+            'count': count,
+            'jobs': jobs,
+            **page,
         })
 
 
 class GetYesterdayDataView(APIView):
     """GET: Jobs scraped yesterday"""
     
+    @cached_response(IngestBatch.SOURCE_HOTJOBS)
+    @conditional
     def get(self, request):
         yesterday = timezone.now().date() - timedelta(days=1)
         qs = HotJob.objects.filter(
             created_at__date=yesterday
-        ).order_by('-created_at')
-        serializer = JobSerializer(qs, many=True)
+        )
+        jobs, count, page = paginate(request, qs, JOB_ROWS)
         return Response({
             'date': str(yesterday),
-            'count': qs.count(),
-            'jobs': serializer.data
+            'count': count,
+            'jobs': jobs,
+            **page,
         })
 
 
 class GetWeekDataView(APIView):
     """GET: Jobs scraped in the last 7 days"""
     
+    @cached_response(IngestBatch.SOURCE_HOTJOBS)
+    @conditional
     def get(self, request):
         week_ago = timezone.now() - timedelta(days=7)
         qs = HotJob.objects.filter(
             created_at__gte=week_ago
-        ).order_by('-created_at')
-        serializer = JobSerializer(qs, many=True)
+        )
+        jobs, count, page = paginate(request, qs, JOB_ROWS)
         return Response({
             'period': 'last_7_days',
             'from': str(week_ago.date()),
             'to': str(timezone.now().date()),
-            'count': qs.count(),
-            'jobs': serializer.data
+            'count': count,
+            'jobs': jobs,
+            **page,
         })
 
 
 class GetMonthDataView(APIView):
     """GET: Jobs scraped this month"""
     
+    @cached_response(IngestBatch.SOURCE_HOTJOBS)
+    @conditional
     def get(self, request):
         now = timezone.now()
         month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
         qs = HotJob.objects.filter(
             created_at__gte=month_start
-        ).order_by('-created_at')
-        serializer = JobSerializer(qs, many=True)
+        )
+        jobs, count, page = paginate(request, qs, JOB_ROWS)
         return Response({
             'period': 'current_month',
             'month': now.strftime('%B %Y'),
             'from': str(month_start.date()),
             'to': str(now.date()),
-            'count': qs.count(),
-            'jobs': serializer.data
+            'count': count,
+            'jobs': jobs,
+            **page,
         })
 
 
 class GetDateDataView(APIView):
     """GET: Jobs scraped on specific date"""
     
+    @cached_response(IngestBatch.SOURCE_HOTJOBS)
+    @conditional
     def get(self, request, date_str):
         try:
             target_date = datetime.strptime(date_str, '%Y-%m-%d').date()
@@ -215,10 +246,91 @@ class GetDateDataView(APIView):
         
         qs = HotJob.objects.filter(
             created_at__date=target_date
-        ).order_by('-created_at')
-        serializer = JobSerializer(qs, many=True)
+        )
+        jobs, count, page = paginate(request, qs, JOB_ROWS)
         return Response({
             'date': str(target_date),
-            'count': qs.count(),
-            'jobs': serializer.data
+            'count': count,
+            'jobs': jobs,
+            **page,
         })
+
+
+class SearchView(APIView):
+    """GET: typo-tolerant search of hot jobs by company name and position (?q=, ?limit=, ?fields=)."""
+
+    def get(self, request):
+        q = request.query_params.get('q', '').strip()
+        if not q:
+            return Response({'error': 'q is required'}, status=status.HTTP_400_BAD_REQUEST)
+        limit = parse_limit(request, settings.SEARCH_DEFAULT_LIMIT, settings.SEARCH_MAX_LIMIT)
+
+        results = fuzzy_search(
+            HotJob.objects.all(), q, IngestBatch.SOURCE_HOTJOBS, HotJob.SEARCH_FIELDS, select_fields(request, JOB_ROWS), limit,
+        )
+
+        return Response({
+            'query': q,
+            'count': len(results),
+            'results': results,
+        })
+
+
+class GetStatsView(APIView):
+    """GET: Statistics about hot jobs and the companies posting most (?days=, ?top=)"""
+
+    @conditional
+    def get(self, request):
+        days = parse_limit(request, settings.STATS_DEFAULT_DAYS, settings.STATS_MAX_DAYS, 'days')
+        top = parse_limit(request, settings.STATS_DEFAULT_TOP, settings.STATS_MAX_TOP, 'top')
+        now = timezone.now()
+
+        # Period totals, and the ETag validator, from the daily rollups
+        totals = summary(IngestBatch.SOURCE_HOTJOBS, now)
+        check_values(request, totals['last_modified'], totals['total'])
+
+        # Jobs per company over the last ``days`` calendar days, grouped from the
+        # (created_at, company_name) index alone. The window count over the
+        # groups is the number of distinct companies, in the same query.
+        window_start = timezone.make_aware(
+            datetime.combine(day_of(now) - timedelta(days=days - 1), time.min), timezone.get_current_timezone(),
+        )
+        companies = list(
+            HotJob.objects.filter(created_at__gte=window_start, company_name__isnull=False)
+            .order_by().values('company_name')
+            .annotate(jobs=Count('pk'), companies=Window(Count('company_name')))
+            .order_by('-jobs', 'company_name')[:top]
+        )
+
+        return Response({
+            'total_jobs': totals['total'],
+            'today': totals['today'],
+            'this_week': totals['this_week'],
+            'this_month': totals['this_month'],
+            'last_updated': totals['last_created_at'],
+            'days': days,
+            'companies': companies[0]['companies'] if companies else 0,
+            'top_companies': [
+                {'company_name': row['company_name'], 'jobs': row['jobs']} for row in companies
+            ],
+        })
+
+
+class TimeseriesView(APIView):
+    """GET: hot jobs per hour, day or week (?bucket=, ?start=&end= or ?days=, text filters)."""
+
+    def get(self, request):
+        qs, filters = filter_text(request, HotJob.objects.all())
+        use_rollups = not any(filters.values())
+        return Response({**timeseries(request, qs, IngestBatch.SOURCE_HOTJOBS, use_rollups), 'filters': filters})
+
+
+class ExportView(APIView):
+    """GET: stream every matching hot job as CSV or NDJSON (get-data filters, ?type=)."""
+
+    # Same columns, in the same order, as BDJobsHotJobsScraper.save_to_csv.
+    CSV_COLUMNS = ['company_name', 'company_logo_url', 'position', 'job_url', 'scraped_date']
+
+    def get(self, request):
+        qs, _ = filter_jobs(request)
+        return export(request, qs, self.CSV_COLUMNS, JOB_ROWS, 'bdjobs_hot_jobs')
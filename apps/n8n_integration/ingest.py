@@ -0,0 +1,186 @@
+"""Set-based ingest of hot jobs posted by the n8n workflow.
+
+The whole payload is validated first. For each batch, one indexed
+``dedup_key__in`` query finds the jobs already stored (the duplicates);
+the others are written with one insert-or-ignore on the unique
+``dedup_key`` index and read back with a second lookup. Batches run in
+savepoints inside one transaction (see ``apps.core.transactions``), so a
+row the database rejects is reported on its own instead of rolling back
+the payload. The unique index stops concurrent n8n runs from storing the
+same job twice, and only the run that stored it reports it as created. The daily rollups (``apps.core.rollups``) are
+counted in the same savepoint.
+"""
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+from apps.core.fuzzy import index_terms
+from apps.core.models import IngestBatch
+from apps.core.normalize import HOTJOB_FIELDS, hotjob_dedup_key, normalize_hotjobs
+from apps.core.response_cache import bump_version
+from apps.core.rollups import Tally
+from apps.core.transactions import write_batched
+from .models import HotJob
+from .serializers import JobSerializer
+
+
+def _insert_or_ignore(jobs):
+    """Insert ``jobs`` whose dedup key is not stored yet; return the ones inserted.
+
+    Insert-or-ignore also skips rows that break any other constraint
+    (SQLite's ``INSERT OR IGNORE`` does, for NOT NULL and CHECK too). A new
+    key that is still missing afterwards therefore raises
+    ``IntegrityError``, so ``write_batched`` retries the batch row by row
+    and reports the rejected row as an error rather than a duplicate.
+
+    Another run may insert one of the keys between the lookup and the
+    INSERT. ``created_at`` is set on each instance before the INSERT, so a
+    stored row with a different timestamp is that run's, and the job is a
+    duplicate here. Only the rows this call wrote are returned and added
+    to the daily rollups.
+    """
+    stored_before = set(
+        HotJob.objects.filter(dedup_key__in=[job.dedup_key for job in jobs]).values_list('dedup_key', flat=True)
+    )
+    fresh = [job for job in jobs if job.dedup_key not in stored_before]
+    if not fresh:
+        return fresh
+    HotJob.objects.bulk_create(fresh, ignore_conflicts=True)
+    stored = HotJob.objects.in_bulk([job.dedup_key for job in fresh], field_name='dedup_key')
+    rejected = [job for job in fresh if job.dedup_key not in stored]
+    if rejected:
+        raise IntegrityError(f'{len(rejected)} row(s) rejected by a database constraint')
+    inserted = []
+    for job in fresh:
+        row = stored[job.dedup_key]
+        if row.created_at == job.created_at:
+            job.pk = row.pk
+            inserted.append(job)
+    tally = Tally(IngestBatch.SOURCE_HOTJOBS)
+    tally.created(inserted)
+    tally.flush()
+    return inserted
+
+
+def assign_dedup_keys(model, batch_size=500, dry_run=False):
+    """Fill ``dedup_key`` of ``model``'s rows without one, collapsing duplicates.
+
+    Of the rows sharing a key, with or without a stored key, the oldest
+    (``created_at``, then ``pk``) is kept and gets the key; the others are
+    deleted. ``model`` is ``HotJob`` or its historical version in a
+    migration. Returns ``(keyed, deleted)``; with ``dry_run`` nothing is
+    written and the counts are what would happen.
+    """
+    keyed = 0
+    deleted = 0
+    # Key -> (created_at, pk) of the row owning it, for keys settled by earlier
+    # batches that a dry run has not written.
+    settled = {}
+    last_id = 0
+
+    while True:
+        rows = list(model.objects.filter(dedup_key__isnull=True, pk__gt=last_id).order_by('pk')[:batch_size])
+        if not rows:
+            break
+        last_id = rows[-1].pk
+
+        keys = [
+            hotjob_dedup_key(row)
+            for row in normalize_hotjobs([{field: getattr(row, field) for field in HOTJOB_FIELDS} for row in rows])
+        ]
+        owners = {
+            key: (created_at, pk)
+            for key, created_at, pk in model.objects.filter(dedup_key__in=keys)
+            .values_list('dedup_key', 'created_at', 'pk')
+        }
+        owners.update((key, settled[key]) for key in keys if key in settled)
+        winners = {}
+        losers = []
+        for row, key in zip(rows, keys):
+            mine = (row.created_at, row.pk)
+            owner = winners.get(key) or owners.get(key)
+            if owner is None or mine < owner:
+                if owner is not None:
+                    losers.append(owner[1])
+                winners[key] = mine
+                row.dedup_key = key
+            else:
+                losers.append(row.pk)
+        keep = [row for row, key in zip(rows, keys) if winners.get(key) == (row.created_at, row.pk)]
+
+        if dry_run:
+            settled.update(winners)
+        else:
+            with transaction.atomic():
+                model.objects.filter(pk__in=losers).delete()
+                model.objects.bulk_update(keep, ['dedup_key'])
+        keyed += len(keep)
+        deleted += len(losers)
+    return keyed, deleted
+
+
+def ingest_jobs(payloads, batch_size=None):
+    """Validate, deduplicate and insert a list of hot job payloads.
+
+    Returns ``(created, skipped, errors)`` where ``created`` holds the new
+    ``HotJob`` instances, ``skipped`` the duplicate input items and ``errors``
+    the serializer errors of invalid items, in input order, followed by
+    ``{'item', 'error'}`` entries for rows the database rejected.
+    """
+    validator = JobSerializer()
+    errors = []
+    items = []
+    rows = []
+    for item in payloads:
+        try:
+            vd = validator.run_validation(item)
+        except serializers.ValidationError as exc:
+            errors.append(exc.detail)
+            continue
+        items.append(item)
+        rows.append({
+            'company_name': vd.get('company_name'),
+            'company_logo_url': vd.get('company_logo_url', ''),
+            'position': vd.get('position'),
+            'job_url': vd.get('job_url', ''),
+            'scraped_date': vd.get('scraped_date'),
+        })
+    candidates = [
+        (item, HotJob(dedup_key=hotjob_dedup_key(row), **row))
+        for item, row in zip(items, normalize_hotjobs(rows))
+    ]
+
+    fresh = []
+    seen = set()
+    for _, job in candidates:
+        if job.dedup_key not in seen:
+            seen.add(job.dedup_key)
+            fresh.append(job)
+    results, failures = write_batched(_insert_or_ignore, fresh, batch_size)
+    inserted = {id(job) for jobs in results for job in jobs}
+    failed = {id(job): exc for job, exc in failures}
+
+    created = []
+    skipped = []
+    for item, job in candidates:
+        if id(job) in inserted:
+            created.append(job)
+        elif id(job) in failed:
+            errors.append({'item': item, 'error': str(failed[id(job)])})
+        else:
+            skipped.append({'item': item, 'reason': 'duplicate'})
+
+    if created:
+        index_terms(IngestBatch.SOURCE_HOTJOBS, [
+            getattr(job, field) for job in created for field in HotJob.SEARCH_FIELDS
+        ])
+        transaction.on_commit(lambda: bump_version(IngestBatch.SOURCE_HOTJOBS))
+    return created, skipped, errors
+
+
+def ingest_counts(payloads):
+    """Run ``ingest_jobs`` and return counters plus errors.
+
+    Used where the created rows are not echoed back (streamed and queued
+    ingest).
+    """
+    created, skipped, errors = ingest_jobs(payloads)
+    return {'created': len(created), 'skipped': len(skipped), 'errors': errors}
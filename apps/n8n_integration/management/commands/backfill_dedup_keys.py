@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from apps.n8n_integration.ingest import assign_dedup_keys
+from apps.n8n_integration.models import HotJob
+
+
+class Command(BaseCommand):
+    help = (
+        'Fill HotJob.dedup_key for rows stored without one, deleting copies of jobs '
+        'that are already stored. Of the copies of a job the oldest row is kept, '
+        'whether or not it already had a key.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Rows hashed and written per transaction (default: 500).',
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Report what would change without writing anything.',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        keyed, deleted = assign_dedup_keys(HotJob, options['batch_size'], dry_run)
+        verb = 'Would key' if dry_run else 'Keyed'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {keyed} row(s) and {"would delete" if dry_run else "deleted"} {deleted} duplicate(s)'
+        ))
@@ -0,0 +1,12 @@
+from apps.core.importer import ImportCommand
+from apps.core.normalize import normalize_hotjobs
+from apps.n8n_integration.ingest import ingest_counts
+
+
+class Command(ImportCommand):
+    help = (
+        'Import hot jobs from a scraper CSV (bdjobs_hot_jobs.csv) or NDJSON file, '
+        'deduplicating and bulk-inserting in chunks. Resumes from a checkpoint if interrupted.'
+    )
+    normalize = staticmethod(normalize_hotjobs)
+    ingest = staticmethod(ingest_counts)
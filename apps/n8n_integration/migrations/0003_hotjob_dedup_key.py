@@ -0,0 +1,26 @@
+# Generated by Django 3.2.25 on 2026-10-18 11:32
+
+from django.db import migrations, models
+
+
+def fill_dedup_keys(apps, schema_editor):
+    # Existing rows get their key (and stored duplicates are collapsed onto
+    # the oldest copy) before ingest starts relying on the unique index.
+    from apps.n8n_integration.ingest import assign_dedup_keys
+    assign_dedup_keys(apps.get_model('n8n_integration', 'HotJob'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('n8n_integration', '0002_delete_job_alter_hotjob_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='hotjob',
+            name='dedup_key',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True, unique=True),
+        ),
+        migrations.RunPython(fill_dedup_keys, migrations.RunPython.noop),
+    ]
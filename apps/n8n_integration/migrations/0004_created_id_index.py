@@ -0,0 +1,17 @@
+# Generated by Django 3.2.25 on 2026-10-18 11:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('n8n_integration', '0003_hotjob_dedup_key'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='hotjob',
+            index=models.Index(fields=['-created_at', '-id'], name='hotjob_created_id_idx'),
+        ),
+    ]
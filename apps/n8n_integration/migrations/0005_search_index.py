@@ -0,0 +1,13 @@
+from django.db import migrations
+from apps.core.search import search_index_operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('n8n_integration', '0004_created_id_index'),
+    ]
+
+    operations = [
+        search_index_operation('n8n_integration_hotjob', ['company_name', 'position']),
+    ]
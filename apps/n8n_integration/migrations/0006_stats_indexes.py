@@ -0,0 +1,21 @@
+# Generated by Django 3.2.25 on 2026-10-18 12:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('n8n_integration', '0005_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='hotjob',
+            index=models.Index(fields=['created_at', 'company_name'], name='hotjob_created_company_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hotjob',
+            index=models.Index(fields=['company_name', 'created_at'], name='hotjob_company_created_idx'),
+        ),
+    ]
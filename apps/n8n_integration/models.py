@@ -1,7 +1,5 @@
 from django.db import models
-from django.utils import timezone
-from django.core.validators import URLValidator
-from django.core.exceptions import ValidationError
+from apps.core.normalize import HOTJOB_FIELDS, clean_url, hotjob_dedup_key, normalize_hotjobs
 
 
 class HotJob(models.Model):
@@ -10,70 +8,56 @@ class HotJob(models.Model):
     Fields are permissive to accommodate CSV rows with missing/placeholder
     values (empty strings, whitespace, or 'N/A'). The model normalizes
     these values to None where appropriate.
+
+    ``dedup_key`` is a SHA-256 of the job_url (or of company_name, position
+    and scraped_date when there is no URL). Its unique index makes duplicate
+    detection an indexed lookup and lets bulk ingest insert-or-ignore.
     """
 
+    # Columns indexed for ?q= full-text search (apps.core.search).
+    SEARCH_FIELDS = ('company_name', 'position')
+
     company_name = models.TextField(blank=True, null=True)
     company_logo_url = models.URLField(blank=True, null=True)
     position = models.TextField(blank=True, null=True)
     job_url = models.URLField(blank=True, null=True)
     scraped_date = models.DateTimeField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    dedup_key = models.CharField(max_length=64, unique=True, blank=True, null=True, editable=False)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination: ORDER BY created_at DESC, id DESC.
+            models.Index(fields=['-created_at', '-id'], name='hotjob_created_id_idx'),
+            # stats/: companies posting within a created_at window, read from
+            # the index alone; and per-company lookups.
+            models.Index(fields=['created_at', 'company_name'], name='hotjob_created_company_idx'),
+            models.Index(fields=['company_name', 'created_at'], name='hotjob_company_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.company_name or 'Unknown'} - {self.position or 'Unknown'}"
 
     def clean_url(self, value):
-        """Normalize URL-like fields: treat empty, whitespace or 'N/A' as None.
+        """Normalize URL-like fields: treat empty, whitespace or 'N/A' as None."""
+        return clean_url(value)
 
-        If a non-empty value is provided, attempt a basic URL validation and
-        return the original string (no further normalization).
-        """
-        if value is None:
-            return None
-        if isinstance(value, str):
-            v = value.strip()
-            if not v or v.upper() == 'N/A':
-                return None
-            # basic validation (will raise on invalid URL)
-            try:
-                URLValidator()(v)
-            except ValidationError:
-                # keep the raw value — downstream consumers can handle it
-                return v
-            return v
-        return value
+    def normalize(self):
+        """Apply the field normalization performed by ``save()``.
 
-    def save(self, *args, **kwargs):
-        # Normalize company_name and position: strip and set None for empty
-        if isinstance(self.company_name, str):
-            self.company_name = self.company_name.strip() or None
-        if isinstance(self.position, str):
-            # collapse multiple spaces and strip
-            cleaned = ' '.join(self.position.split())
-            self.position = cleaned or None
-
-        # Normalize URL fields
-        self.company_logo_url = self.clean_url(self.company_logo_url)
-        self.job_url = self.clean_url(self.job_url)
+        Delegates to the batch engine in ``apps.core.normalize`` so single
+        saves and bulk paths (``bulk_create``) store exactly the same values.
+        """
+        row = normalize_hotjobs([{field: getattr(self, field) for field in HOTJOB_FIELDS}])[0]
+        for field, value in row.items():
+            setattr(self, field, value)
+        self.dedup_key = hotjob_dedup_key(row)
 
-        # If scraped_date is a string, try to parse it (best-effort)
-        if isinstance(self.scraped_date, str):
-            try:
-                # use django's timezone parsing
-                parsed = timezone.datetime.fromisoformat(self.scraped_date)
-                # make timezone-aware using current timezone if naive
-                if timezone.is_naive(parsed):
-                    parsed = timezone.make_aware(parsed, timezone.get_current_timezone())
-                self.scraped_date = parsed
-            except Exception:
-                # leave as-is (DB will reject non-datetime) — fallback to None
-                try:
-                    self.scraped_date = timezone.datetime.strptime(self.scraped_date, '%Y-%m-%d %H:%M:%S')
-                    self.scraped_date = timezone.make_aware(self.scraped_date, timezone.get_current_timezone())
-                except Exception:
-                    self.scraped_date = None
+    def build_dedup_key(self):
+        """Hash job_url, or company_name/position/scraped_date when there is no URL."""
+        return hotjob_dedup_key({field: getattr(self, field) for field in HOTJOB_FIELDS})
 
+    def save(self, *args, **kwargs):
+        self.normalize()
         super().save(*args, **kwargs)
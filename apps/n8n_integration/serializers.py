@@ -1,8 +1,13 @@
 from rest_framework import serializers
+from apps.core.rows import RowSerializer
+from .models import HotJob
 
-class JobSerializer(serializers.Serializer):
-    company_name = serializers.CharField(max_length=255)
-    company_logo_url = serializers.URLField(required=False)
-    position = serializers.CharField(max_length=255)
-    job_url = serializers.URLField()
-    scraped_date = serializers.DateTimeField()
\ No newline at end of file
+
+class JobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = HotJob
+        fields = ['id', 'company_name', 'company_logo_url', 'position', 'job_url', 'scraped_date', 'created_at']
+
+
+# values_list() read path of the get-data endpoints; renders like JobSerializer.
+JOB_ROWS = RowSerializer(JobSerializer)
@@ -1,33 +1,754 @@
+import csv
+from datetime import datetime, timedelta, timezone as dt_timezone
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock, skipUnless
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.db.models import F
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework import status
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIClient
-from .models import YourModel  # Replace with your actual model
+from apps.core.importer import Checkpoint
+from apps.core.models import DailyJobRollup
+from .ingest import ingest_jobs
+from .models import HotJob
+from .serializers import JOB_ROWS, JobSerializer
+
+
+def make_job(n, **overrides):
+    job = {
+        'company_name': f'Company {n}',
+        'company_logo_url': f'https://hotjobs.bdjobs.com/logos/company{n}.png',
+        'position': f'Position {n}',
+        'job_url': f'https://hotjobs.bdjobs.com/jobs/company{n}/job{n}.htm',
+        'scraped_date': '2025-11-03 12:00:00',
+    }
+    job.update(overrides)
+    return job
+
+
+class SendDataViewTests(TestCase):
+    """Test cases for the bulk send-data endpoint"""
+
+    url = '/n8n/send-data/'
 
-class N8NIntegrationTests(TestCase):
     def setUp(self):
         self.client = APIClient()
-        self.url = '/api/your-endpoint/'  # Replace with your actual endpoint
+        cache.clear()
 
-    def test_create_data(self):
-        data = {
-            'field1': 'value1',  # Replace with your actual fields and values
-            'field2': 'value2',
-        }
-        response = self.client.post(self.url, data, format='json')
+    def test_create_batch(self):
+        """Test that a batch is inserted and echoed back with ids"""
+        response = self.client.post(self.url, [make_job(i) for i in range(3)], format='json')
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        self.assertEqual(YourModel.objects.count(), 1)  # Replace with your actual model
-        self.assertEqual(YourModel.objects.get().field1, 'value1')  # Replace with your actual fields
+        self.assertEqual(HotJob.objects.count(), 3)
+        self.assertEqual(len(response.data['created']), 3)
+        self.assertEqual(response.data['skipped'], [])
+        self.assertTrue(all(job['id'] for job in response.data['created']))
+
+    def test_single_object(self):
+        """Test that a single object (not a list) is accepted"""
+        response = self.client.post(self.url, make_job(1), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(HotJob.objects.get().position, 'Position 1')
+
+    def test_skip_existing_job_url(self):
+        """Test that jobs whose job_url is already stored are skipped"""
+        self.client.post(self.url, [make_job(1)], format='json')
+        response = self.client.post(self.url, [make_job(1), make_job(2)], format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data['created']), 1)
+        self.assertEqual(response.data['skipped'], [{'item': make_job(1), 'reason': 'duplicate'}])
+        self.assertEqual(HotJob.objects.count(), 2)
+
+    def test_skip_duplicates_within_batch(self):
+        """Test that repeated items in one batch are only inserted once"""
+        response = self.client.post(self.url, [make_job(1), make_job(1)], format='json')
+        self.assertEqual(len(response.data['created']), 1)
+        self.assertEqual(len(response.data['skipped']), 1)
+        self.assertEqual(HotJob.objects.count(), 1)
+
+    def test_fallback_key_without_job_url(self):
+        """Test dedup on company/position/scraped_date when job_url is missing"""
+        job = make_job(1)
+        del job['job_url']
+        self.client.post(self.url, [job], format='json')
+        response = self.client.post(self.url, [job, make_job(1, job_url=None, position='Other')], format='json')
+        self.assertEqual(len(response.data['created']), 1)
+        self.assertEqual(len(response.data['skipped']), 1)
+        self.assertEqual(HotJob.objects.count(), 2)
+
+    def test_normalization_applied(self):
+        """Test that bulk inserts store the same values as HotJob.save()"""
+        self.client.post(self.url, [make_job(1, position='  Senior   Officer  ')], format='json')
+        self.assertEqual(HotJob.objects.get().position, 'Senior Officer')
+
+    def test_invalid_items_reported(self):
+        """Test that invalid items are reported without blocking valid ones"""
+        response = self.client.post(self.url, [make_job(1), make_job(2, job_url='not a url')], format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data['errors']), 1)
+        self.assertIn('job_url', response.data['errors'][0])
+
+    def test_all_invalid(self):
+        """Test that a batch without any new job returns 400"""
+        response = self.client.post(self.url, [make_job(1, scraped_date='yesterday')], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(HotJob.objects.count(), 0)
+
+    def test_summary_response(self):
+        """Test that ?response=summary returns ids and counts only"""
+        self.client.post(self.url, [make_job(1)], format='json')
+        response = self.client.post(self.url + '?response=summary', [make_job(1), make_job(2)], format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data, {
+            'created_ids': [HotJob.objects.get(position='Position 2').pk],
+            'total_created': 1,
+            'total_skipped': 1,
+            'total_errors': 0,
+        })
+
+    def test_summary_via_prefer_header(self):
+        """Test that Prefer: return=minimal selects the summary too"""
+        response = self.client.post(self.url, [make_job(1)], format='json', HTTP_PREFER='return=minimal')
+        self.assertEqual(response.data['total_created'], 1)
+        self.assertNotIn('created', response.data)
+
+    def test_query_count_independent_of_batch_size(self):
+        """Test that the dedup and insert work does not grow per item"""
+        payload = [make_job(i) for i in range(50)]
+        payload.append(make_job(50, job_url=None))
+        # batch and chunk savepoints + release each, stored dedup_key lookup,
+        # insert-or-ignore, inserted dedup_key lookup, the day's first rollup
+        # (UPDATE, INSERT, UPDATE), then the search vocabulary: lookup,
+        # savepoint, term insert, id lookup, trigram insert, release
+        with self.assertNumQueries(16):
+            ingest_jobs(payload)
+        self.assertEqual(HotJob.objects.count(), 51)
+
+    @skipUnless(connection.vendor == 'sqlite', 'uses a SQLite trigger')
+    def test_rejected_row_is_an_error(self):
+        """Test that a row skipped by the insert-or-ignore for another reason is an error, not a duplicate"""
+        with connection.cursor() as cursor:
+            # Drops the row silently, as INSERT OR IGNORE does for NOT NULL or CHECK failures.
+            cursor.execute(
+                "CREATE TEMP TRIGGER reject_hotjob BEFORE INSERT ON n8n_integration_hotjob "
+                "WHEN new.position = 'Rejected' BEGIN SELECT RAISE(IGNORE); END"
+            )
+        HotJob.objects.create(**make_job(1))
+        created, skipped, errors = ingest_jobs([make_job(1), make_job(2), make_job(3, position='Rejected')])
+        self.assertEqual([job.position for job in created], ['Position 2'])
+        self.assertEqual([entry['item']['job_url'] for entry in skipped], [make_job(1)['job_url']])
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0]['item']['position'], 'Rejected')
+        self.assertIn('rejected by a database constraint', errors[0]['error'])
+
+    def test_concurrent_insert_is_a_duplicate(self):
+        """Test that a job another run stores between the lookup and the INSERT is skipped and not counted"""
+        bulk_create = HotJob.objects.bulk_create
+
+        def racing_bulk_create(jobs, **kwargs):
+            # The other run commits its copy of job 1 first.
+            bulk_create([HotJob(dedup_key=jobs[0].dedup_key, **make_job(1))])
+            return bulk_create(jobs, **kwargs)
+
+        with mock.patch.object(HotJob.objects, 'bulk_create', side_effect=racing_bulk_create):
+            created, skipped, errors = ingest_jobs([make_job(1), make_job(2)])
+        self.assertEqual([job.position for job in created], ['Position 2'])
+        self.assertEqual(len(skipped), 1)
+        self.assertEqual(errors, [])
+        self.assertEqual(DailyJobRollup.objects.get().created, 1)
+
+    def test_dedup_key_unique(self):
+        """Test that the dedup_key index rejects a second copy of a job"""
+        HotJob.objects.create(**make_job(1))
+        with self.assertRaises(IntegrityError):
+            HotJob.objects.create(**make_job(1, position='Renamed'))
+
+    def test_fallback_key_ignores_timezone_spelling(self):
+        """Test that equal instants hash to the same fallback key"""
+        utc = HotJob(company_name='A', position='B', scraped_date='2025-11-03T12:00:00+00:00')
+        dhaka = HotJob(company_name='A', position='B', scraped_date='2025-11-03T18:00:00+06:00')
+        utc.normalize()
+        dhaka.normalize()
+        self.assertEqual(utc.dedup_key, dhaka.dedup_key)
+
+
+class GetDataPaginationTests(TestCase):
+    """Test cases for keyset pagination of the get-data endpoints"""
+
+    def setUp(self):
+        self.client = APIClient()
+        caches['responses'].clear()
+        HotJob.objects.bulk_create([HotJob(**make_job(n, scraped_date=None)) for n in range(5)])
+        # Equal timestamps: the id breaks the tie.
+        HotJob.objects.update(created_at=timezone.now())
+
+    def test_pages_cover_all_rows(self):
+        """Test that following next visits every row once, newest first"""
+        url = '/n8n/get-data/?limit=2'
+        ids = []
+        pages = 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data['jobs']), 2)
+            ids += [job['id'] for job in response.data['jobs']]
+            url = response.data['next']
+            pages += 1
+        self.assertEqual(pages, 3)
+        self.assertEqual(ids, list(HotJob.objects.order_by('-created_at', '-id').values_list('id', flat=True)))
+
+    def test_period_endpoint_paginated(self):
+        """Test that the period endpoints accept limit too"""
+        response = self.client.get('/n8n/get-data/today/?limit=3')
+        self.assertEqual(len(response.data['jobs']), 3)
+        self.assertEqual(response.data['count'], 5)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_unpaginated_by_default(self):
+        """Test that old clients still get every row without next"""
+        response = self.client.get('/n8n/get-data/')
+        self.assertEqual(len(response.data['jobs']), 5)
+        self.assertNotIn('next', response.data)
+
+    def test_one_query_per_endpoint(self):
+        """Test that every list endpoint fetches rows and count in one query"""
+        today = timezone.now().date()
+        for url in ['/n8n/get-data/', '/n8n/get-data/?days=1&company=Company', '/n8n/get-data/today/',
+                    '/n8n/get-data/yesterday/', '/n8n/get-data/week/', '/n8n/get-data/month/',
+                    f'/n8n/get-data/date/{today}/', '/n8n/get-data/?limit=2',
+                    '/n8n/get-data/week/?limit=2&count=false']:
+            with self.subTest(url=url), self.assertNumQueries(1):
+                self.client.get(url)
+
+    def test_total_carried_across_pages(self):
+        """Test that later pages report the first page's total without counting"""
+        first = self.client.get('/n8n/get-data/?limit=2')
+        self.assertEqual(first.data['count'], 5)
+        with self.assertNumQueries(1):
+            second = self.client.get(first.data['next'])
+        self.assertEqual(second.data['count'], 5)
+        skipped = self.client.get('/n8n/get-data/?limit=2&count=false')
+        self.assertIsNone(skipped.data['count'])
+
+    def test_invalid_cursor(self):
+        """Test that a tampered cursor is rejected"""
+        response = self.client.get('/n8n/get-data/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {'error': 'Invalid cursor'})
+
+
+class SparseFieldsTests(TestCase):
+    """Test cases for ?fields= on the list endpoints"""
+
+    def setUp(self):
+        self.client = APIClient()
+        caches['responses'].clear()
+        ingest_jobs([make_job(1, company_name='Bangladesh Bank'), make_job(2)])
+
+    def test_output_and_select_narrowed(self):
+        """Test that only the requested fields are selected and returned"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/n8n/get-data/', {'fields': 'position,job_url'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([set(job) for job in response.data['jobs']], [{'position', 'job_url'}] * 2)
+        self.assertNotIn('company_logo_url', queries[0]['sql'])
+
+    def test_period_and_paginated(self):
+        """Test that period endpoints and pages honour fields too"""
+        response = self.client.get('/n8n/get-data/today/', {'fields': 'id', 'limit': 1})
+        self.assertEqual(response.data['jobs'], [{'id': HotJob.objects.latest('id').pk}])
+        self.assertEqual(self.client.get(response.data['next']).data['jobs'][0], {'id': HotJob.objects.earliest('id').pk})
+
+    def test_search(self):
+        """Test that the search/ endpoint narrows results to fields plus score"""
+        response = self.client.get('/n8n/search/', {'q': 'bangladsh', 'fields': 'company_name'})
+        self.assertEqual(response.data['results'][0]['company_name'], 'Bangladesh Bank')
+        self.assertEqual(set(response.data['results'][0]), {'company_name', 'score'})
+
+    def test_unknown_field_rejected(self):
+        """Test that an unknown field name is a 400 naming it"""
+        response = self.client.get('/n8n/get-data/', {'fields': 'position,salary'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('salary', response.data['error'])
+
+
+class ConditionalGetTests(TestCase):
+    """Test cases for ETag / Last-Modified on the get-data endpoints"""
+
+    url = '/n8n/get-data/?company=Company'
+
+    def setUp(self):
+        self.client = APIClient()
+        caches['responses'].clear()
+        HotJob.objects.create(**make_job(1))
+
+    def test_not_modified(self):
+        """Test that a matching If-None-Match gets 304 from one aggregate query"""
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+
+    def test_new_row_changes_etag(self):
+        """Test that a new job makes the old ETag stale"""
+        etag = self.client.get(self.url)['ETag']
+        HotJob.objects.create(**make_job(2))
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data['count'], 2)
+
+    def test_if_modified_since(self):
+        """Test that If-Modified-Since is honoured when no ETag is sent"""
+        last_modified = self.client.get(self.url)['Last-Modified']
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_page_etag(self):
+        """Test that paginated pages have their own validators"""
+        HotJob.objects.create(**make_job(2))
+        first = self.client.get('/n8n/get-data/?limit=1')
+        second = self.client.get(first.data['next'])
+        self.assertNotEqual(first['ETag'], second['ETag'])
+        response = self.client.get(first.data['next'], HTTP_IF_NONE_MATCH=second['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_cached_not_modified(self):
+        """Test that a cached period response answers 304 without queries"""
+        etag = self.client.get('/n8n/get-data/today/')['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get('/n8n/get-data/today/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class JobRowsGoldenTests(TestCase):
+    """Test cases for the values_list() read path against JobSerializer"""
+
+    def setUp(self):
+        HotJob.objects.create(**make_job(1))
+        HotJob.objects.create(**make_job(2, company_logo_url='N/A', job_url=None, position='  Officer  '))
+        HotJob.objects.create(**make_job(3, scraped_date='2025-11-03T18:30:00.123456+06:00'))
+        HotJob.objects.create(company_name='বাংলা কোম্পানি', position='\u00e9\"quoted\"')
+        HotJob.objects.create(**make_job(5))
+        HotJob.objects.filter(company_name='Company 5').update(created_at=datetime(2025, 11, 3, tzinfo=dt_timezone.utc))
+
+    def assert_same_json(self):
+        qs = HotJob.objects.order_by('-created_at', '-id')
+        expected = JSONRenderer().render(JobSerializer(qs, many=True).data)
+        self.assertEqual(JSONRenderer().render(JOB_ROWS.serialize(qs)), expected)
+
+    def test_matches_serializer(self):
+        """Test that the fast path renders byte-for-byte like JobSerializer"""
+        self.assert_same_json()
+
+    def test_matches_serializer_in_other_timezone(self):
+        """Test that datetimes follow the active timezone like DRF does"""
+        with timezone.override('Asia/Dhaka'):
+            self.assert_same_json()
+
+    def test_endpoint_output(self):
+        """Test that get-data returns the serializer's representation"""
+        response = APIClient().get('/n8n/get-data/')
+        qs = HotJob.objects.order_by('-created_at', '-id')
+        self.assertEqual(json.loads(response.content)['jobs'], json.loads(JSONRenderer().render(JobSerializer(qs, many=True).data)))
+
+
+class SearchTests(TestCase):
+    """Test cases for ?q= full-text search on get-data"""
+
+    url = '/n8n/get-data/'
+
+    def setUp(self):
+        self.client = APIClient()
+        HotJob.objects.create(**make_job(1, company_name='Bangladesh Bank', position='Assistant Director'))
+        HotJob.objects.create(**make_job(2, company_name='BRAC Bank PLC', position='Bank Officer, Retail Banking'))
+        HotJob.objects.create(**make_job(3, company_name='Grameenphone', position='Software Engineer'))
+
+    def positions(self, q):
+        response = self.client.get(self.url, {'q': q})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [job['position'] for job in response.data['jobs']]
+
+    def test_prefix_and_all_words(self):
+        """Test that every word must match, each as a prefix"""
+        self.assertEqual(self.positions('bangla'), ['Assistant Director'])
+        self.assertEqual(self.positions('brac bank'), ['Bank Officer, Retail Banking'])
+        self.assertEqual(self.positions('engineer phone'), [])
+
+    def test_ranked(self):
+        """Test that the better match comes first"""
+        self.assertEqual(self.positions('bank'), ['Bank Officer, Retail Banking', 'Assistant Director'])
 
-    def test_get_data(self):
-        # Create a sample object to test retrieval
-        YourModel.objects.create(field1='value1', field2='value2')  # Replace with your actual fields
+    def test_index_follows_updates(self):
+        """Test that the triggers keep the index in sync with writes"""
+        job = HotJob.objects.get(company_name='Grameenphone')
+        job.position = 'Data Analyst'
+        job.save()
+        self.assertEqual(self.positions('analyst'), ['Data Analyst'])
+        self.assertEqual(self.positions('software'), [])
+        job.delete()
+        self.assertEqual(self.positions('analyst'), [])
+
+    def test_one_query(self):
+        """Test that search stays a single query"""
+        with self.assertNumQueries(1):
+            self.client.get(self.url, {'q': 'bank', 'limit': 1})
+
+    def test_icontains_fallback(self):
+        """Test that without an index the same words match with icontains"""
+        with mock.patch('apps.core.search._has_index', return_value=False):
+            self.assertEqual(sorted(self.positions('bank')), ['Assistant Director', 'Bank Officer, Retail Banking'])
+
+
+class FuzzySearchTests(TestCase):
+    """Test cases for the typo-tolerant search/ endpoint"""
+
+    url = '/n8n/search/'
+
+    def setUp(self):
+        self.client = APIClient()
+        ingest_jobs([
+            make_job(1, company_name='Bangladesh Bank', position='Assistant Director'),
+            make_job(2, company_name='BRAC Bank PLC', position='Relationship Officer'),
+            make_job(3, company_name='Grameenphone', position='Software Engineer'),
+        ])
+
+    def search(self, q, **params):
+        response = self.client.get(self.url, {'q': q, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_misspelled_words(self):
+        """Test that a misspelled query still finds the closest jobs first"""
+        data = self.search('Bangladsh Bank')
+        self.assertEqual(data['results'][0]['company_name'], 'Bangladesh Bank')
+        self.assertEqual(data['results'][1]['company_name'], 'BRAC Bank PLC')
+        self.assertGreater(data['results'][0]['score'], data['results'][1]['score'])
+        self.assertEqual(self.search('softwre enginer')['results'][0]['position'], 'Software Engineer')
+
+    def test_result_fields(self):
+        """Test that results carry the get-data fields plus a score"""
+        result = self.search('grameenfone')['results'][0]
+        self.assertEqual(set(result), set(JOB_ROWS.names) | {'score'})
+        self.assertEqual(result['company_name'], 'Grameenphone')
+
+    def test_limit(self):
+        """Test that ?limit= caps the number of results"""
+        data = self.search('bank', limit=1)
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(len(data['results']), 1)
+
+    def test_requires_query(self):
+        """Test that a missing or empty q is a 400"""
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.url, {'q': ' '}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_no_match(self):
+        """Test that an unrelated query returns no results"""
+        self.assertEqual(self.search('xyzzy')['results'], [])
+
+
+class ExportViewTests(TestCase):
+    """Test cases for the streaming export/ endpoint"""
+
+    url = '/n8n/export/'
+
+    def setUp(self):
+        self.client = APIClient()
+        ingest_jobs([make_job(n) for n in range(3)])
+
+    def content(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content)
+
+    def test_csv_matches_scraper_layout(self):
+        """Test that the CSV has the scraper's BOM, columns and timestamp format"""
         response = self.client.get(self.url)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="bdjobs_hot_jobs.csv"')
+        content = self.content(response)
+        self.assertTrue(content.startswith(b'\xef\xbb\xbf'))
+        rows = list(csv.DictReader(StringIO(content.decode('utf-8-sig'))))
+        self.assertEqual(rows, [make_job(n) for n in (2, 1, 0)])
+
+    def test_csv_round_trips_through_import(self):
+        """Test that an export can be re-imported with import_hotjobs"""
+        tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmpdir)
+        path = os.path.join(tmpdir, 'export.csv')
+        with open(path, 'wb') as handle:
+            handle.write(self.content(self.client.get(self.url)))
+        HotJob.objects.all().delete()
+        call_command('import_hotjobs', path, stdout=StringIO())
+        self.assertEqual(
+            sorted(HotJob.objects.values_list('position', 'job_url')),
+            sorted((job['position'], job['job_url']) for job in map(make_job, range(3))),
+        )
+
+    def test_ndjson_with_filters(self):
+        """Test that NDJSON lines are get-data rows and the get-data filters apply"""
+        params = {'type': 'ndjson', 'position': 'Position 1', 'fields': 'id,position'}
+        lines = self.content(self.client.get(self.url, params)).decode('utf-8').splitlines()
+        expected = self.client.get('/n8n/get-data/', params).data['jobs']
+        self.assertEqual([json.loads(line) for line in lines], expected)
+        self.assertEqual(len(lines), 1)
+
+    def test_unknown_type(self):
+        """Test that an unknown export type is a 400"""
+        self.assertEqual(self.client.get(self.url, {'type': 'xlsx'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class StatsViewTests(TestCase):
+    """Test cases for the stats/ endpoint"""
+
+    url = '/n8n/stats/'
+
+    def setUp(self):
+        self.client = APIClient()
+        ingest_jobs([make_job(n, company_name='Company D') for n in range(10, 14)])
+        HotJob.objects.update(created_at=F('created_at') - timedelta(days=40))
+        call_command('rebuild_rollups', stdout=StringIO())
+        companies = ['Company A'] * 3 + ['Company B'] * 2 + ['Company C']
+        ingest_jobs([make_job(n, company_name=company) for n, company in enumerate(companies)])
+
+    def test_stats(self):
+        """Test period totals and the top companies of the default 30-day window"""
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url, {'top': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_jobs'], 10)
+        self.assertEqual(response.data['today'], 6)
+        self.assertEqual(response.data['days'], 30)
+        self.assertEqual(response.data['companies'], 3)
+        self.assertEqual(response.data['top_companies'], [
+            {'company_name': 'Company A', 'jobs': 3},
+            {'company_name': 'Company B', 'jobs': 2},
+        ])
+        self.assertEqual(response.data['last_updated'], HotJob.objects.latest('created_at').created_at)
+
+    def test_window(self):
+        """Test that ?days= widens the window of the top companies"""
+        response = self.client.get(self.url, {'days': 60, 'top': 1})
+        self.assertEqual(response.data['companies'], 4)
+        self.assertEqual(response.data['top_companies'], [{'company_name': 'Company D', 'jobs': 4}])
+
+    def test_deletes_reach_stats(self):
+        """Test that deleted jobs leave the totals, the top companies and the ETag alike"""
+        etag = self.client.get(self.url)['ETag']
+        HotJob.objects.filter(company_name='Company A').delete()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['total_jobs'], 7)
+        self.assertEqual(response.data['today'], 3)
+        self.assertEqual(response.data['top_companies'][0], {'company_name': 'Company B', 'jobs': 2})
+
+    def test_not_modified_in_one_query(self):
+        """Test that a conditional stats request is answered from the rollups alone"""
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_invalid_params(self):
+        """Test that a non-positive top or days is a 400"""
+        for params in [{'top': 0}, {'days': 'week'}]:
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TimeseriesViewTests(TestCase):
+    """Test cases for the timeseries/ endpoint"""
+
+    url = '/n8n/timeseries/'
+
+    def setUp(self):
+        self.client = APIClient()
+        ingest_jobs([make_job(n) for n in range(4)])
+        created = [
+            datetime(2025, 11, 3, 9, 30), datetime(2025, 11, 3, 20, 0),
+            datetime(2025, 11, 5, 9, 45), datetime(2025, 11, 10, 1, 0),
+        ]
+        for job, created_at in zip(HotJob.objects.order_by('id'), created):
+            HotJob.objects.filter(pk=job.pk).update(created_at=created_at.replace(tzinfo=dt_timezone.utc))
+        call_command('rebuild_rollups', stdout=StringIO())
+
+    def counts(self, params):
+        response = self.client.get(self.url, params)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)  # Adjust based on your expected response
+        return [point['count'] for point in response.data['series']]
+
+    def test_days_gap_filled_from_rollups(self):
+        """Test that day buckets cover the whole range and come from one rollup query"""
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, {'start': '2025-11-02', 'end': '2025-11-06'})
+        self.assertEqual([point['count'] for point in response.data['series']], [0, 2, 0, 1, 0])
+        self.assertEqual(response.data['series'][0]['start'], datetime(2025, 11, 2, tzinfo=dt_timezone.utc))
+        self.assertEqual(response.data['total'], 3)
+
+    def test_filters_use_one_grouped_query(self):
+        """Test that text filters count the jobs themselves, with the same buckets"""
+        # 2025-11-01 is a Saturday: weeks start Mondays Oct 27, Nov 3 and Nov 10
+        params = {'start': '2025-11-01', 'end': '2025-11-12', 'bucket': 'week'}
+        self.assertEqual(self.counts(params), [0, 3, 1])
+        with self.assertNumQueries(1):
+            self.assertEqual(self.counts(dict(params, position='Position')), [0, 3, 1])
+        self.assertEqual(self.counts(dict(params, company='Company 3')), [0, 0, 1])
+
+    def test_hours(self):
+        """Test hour buckets over one day"""
+        counts = self.counts({'start': '2025-11-03', 'end': '2025-11-03', 'bucket': 'hour'})
+        self.assertEqual(len(counts), 24)
+        self.assertEqual((counts[9], counts[20], sum(counts)), (1, 1, 2))
+
+    def test_local_days(self):
+        """Test that buckets follow the current time zone"""
+        with timezone.override('Asia/Dhaka'):
+            self.assertEqual(self.counts({'start': '2025-11-03', 'end': '2025-11-04', 'position': 'Position'}), [1, 1])
+
+    def test_invalid_params(self):
+        """Test that a bad bucket or range is a 400"""
+        for params in [{'bucket': 'minute'}, {'start': '2025-11-05', 'end': '2025-11-01'},
+                       {'start': '03-11-2025'}, {'bucket': 'hour', 'days': 365}]:
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+                self.assertIn('error', response.data)
+
+
+class SendDataStreamViewTests(TestCase):
+    """Test cases for the NDJSON streaming ingest endpoint"""
+
+    url = '/n8n/send-data/stream/'
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def post_lines(self, lines, chunk_size=2):
+        body = '\n'.join(lines) + '\n'
+        with self.settings(INGEST_STREAM_CHUNK_SIZE=chunk_size):
+            response = self.client.post(self.url, body, content_type='application/x-ndjson')
+            progress = b''.join(response.streaming_content)
+        return response, [json.loads(line) for line in progress.decode().splitlines()]
+
+    def test_chunked_progress(self):
+        """Test that each chunk reports progress and the last line sums up"""
+        lines = [json.dumps(make_job(i)) for i in range(5)]
+        response, progress = self.post_lines(lines)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual([p['created'] for p in progress[:-1]], [2, 2, 1])
+        self.assertEqual(progress[-1], {'received': 5, 'errors': 0, 'created': 5, 'skipped': 0,
+                                        'done': True, 'chunks': 3})
+        self.assertEqual(HotJob.objects.count(), 5)
+
+    def test_duplicates_across_chunks(self):
+        """Test that dedup sees rows written by earlier chunks"""
+        lines = [json.dumps(make_job(1))] * 3
+        _, progress = self.post_lines(lines)
+        self.assertEqual(progress[-1]['created'], 1)
+        self.assertEqual(progress[-1]['skipped'], 2)
+
+    def test_bad_lines_reported(self):
+        """Test that malformed lines are reported with their line number"""
+        _, progress = self.post_lines([json.dumps(make_job(1)), '{not json', ''], chunk_size=10)
+        self.assertEqual(progress[0]['errors'][0]['line'], 2)
+        self.assertEqual(progress[-1]['created'], 1)
+
+    def test_wrong_content_type(self):
+        """Test that non-NDJSON bodies are rejected"""
+        response = self.client.post(self.url, [make_job(1)], format='json')
+        self.assertEqual(response.status_code, status.HTTP_415_UNSUPPORTED_MEDIA_TYPE)
+
+
+class BackfillDedupKeysCommandTests(TestCase):
+    """Test cases for the backfill_dedup_keys command"""
+
+    def test_backfill_collapses_duplicates(self):
+        """Test that legacy rows get keys and later copies are deleted"""
+        first = HotJob.objects.create(**make_job(1))
+        HotJob.objects.create(**make_job(2))
+        # Rows stored before the column existed had no key (and no protection).
+        HotJob.objects.update(dedup_key=None)
+        HotJob.objects.bulk_create([HotJob(**make_job(1, scraped_date=None)) for _ in range(2)])
+
+        out = StringIO()
+        call_command('backfill_dedup_keys', batch_size=2, stdout=out)
+
+        self.assertIn('Keyed 2 row(s) and deleted 2 duplicate(s)', out.getvalue())
+        self.assertEqual(HotJob.objects.count(), 2)
+        self.assertTrue(HotJob.objects.filter(pk=first.pk).exists())
+        self.assertFalse(HotJob.objects.filter(dedup_key__isnull=True).exists())
+
+    def test_oldest_copy_kept_over_keyed_one(self):
+        """Test that an unkeyed original wins over a newer copy that already has the key"""
+        original = HotJob.objects.create(**make_job(1))
+        HotJob.objects.filter(pk=original.pk).update(dedup_key=None, created_at=F('created_at') - timedelta(days=30))
+        copy = HotJob.objects.create(**make_job(1))
+        out = StringIO()
+        call_command('backfill_dedup_keys', stdout=out)
+        self.assertIn('Keyed 1 row(s) and deleted 1 duplicate(s)', out.getvalue())
+        self.assertEqual(list(HotJob.objects.values_list('pk', flat=True)), [original.pk])
+        self.assertEqual(HotJob.objects.get().dedup_key, copy.dedup_key)
+
+    def test_dry_run_writes_nothing(self):
+        """Test that --dry-run only reports"""
+        HotJob.objects.bulk_create([HotJob(**make_job(1, scraped_date=None)) for _ in range(2)])
+        out = StringIO()
+        call_command('backfill_dedup_keys', dry_run=True, batch_size=1, stdout=out)
+        self.assertIn('Would key 1 row(s) and would delete 1 duplicate(s)', out.getvalue())
+        self.assertEqual(HotJob.objects.filter(dedup_key__isnull=True).count(), 2)
+
+
+class ImportHotJobsCommandTests(TestCase):
+    """Test cases for the import_hotjobs command"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.path = os.path.join(self.tmpdir, 'bdjobs_hot_jobs.csv')
+        # Same layout and encoding as BDJobsHotJobsScraper.save_to_csv.
+        with open(self.path, 'w', newline='', encoding='utf-8-sig') as handle:
+            writer = csv.DictWriter(handle, fieldnames=list(make_job(0)))
+            writer.writeheader()
+            for n in range(5):
+                writer.writerow(make_job(n, company_logo_url='N/A' if n == 0 else make_job(n)['company_logo_url']))
+            writer.writerow(make_job(1))
+
+    def test_import_csv(self):
+        """Test that a scraper CSV is imported in chunks with dedup"""
+        out = StringIO()
+        call_command('import_hotjobs', self.path, chunk_size=2, stdout=out)
+        self.assertIn('Imported 6 record(s)', out.getvalue())
+        self.assertIn('created=5, skipped=1', out.getvalue())
+        self.assertEqual(HotJob.objects.count(), 5)
+        self.assertIsNone(HotJob.objects.get(company_name='Company 0').company_logo_url)
+        self.assertFalse(os.path.exists(self.path + '.checkpoint'))
+
+    def test_resume_from_checkpoint(self):
+        """Test that an interrupted import skips the records already done"""
+        Checkpoint(self.path + '.checkpoint', self.path).save(4)
+        out = StringIO()
+        call_command('import_hotjobs', self.path, stdout=out)
+        self.assertIn('Resuming after record 4', out.getvalue())
+        self.assertEqual(
+            sorted(HotJob.objects.values_list('position', flat=True)), ['Position 1', 'Position 4']
+        )
 
-    def test_invalid_data(self):
-        data = {
-            'field1': '',  # Invalid data
-        }
-        response = self.client.post(self.url, data, format='json')
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+    def test_import_ndjson(self):
+        """Test that NDJSON files are accepted"""
+        path = os.path.join(self.tmpdir, 'jobs.ndjson')
+        with open(path, 'w') as handle:
+            handle.write('\n'.join(json.dumps(make_job(n)) for n in range(3)))
+        call_command('import_hotjobs', path, stdout=StringIO())
+        self.assertEqual(HotJob.objects.count(), 3)
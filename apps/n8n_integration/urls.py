@@ -1,17 +1,26 @@
 from django.urls import path
+from apps.core.api_views import IngestBatchView
+from apps.core.models import IngestBatch
 from .api_views import (
     SendDataView, 
+    SendDataStreamView,
     GetDataView,
     GetTodayDataView,
     GetYesterdayDataView,
     GetWeekDataView,
     GetMonthDataView,
     GetDateDataView,
+    GetStatsView,
+    TimeseriesView,
+    SearchView,
+    ExportView,
 )
 
 urlpatterns = [
     # Data submission endpoint
     path('send-data/', SendDataView.as_view(), name='send_data'),
+    path('send-data/stream/', SendDataStreamView.as_view(), name='send_data_stream'),
+    path('ingest-batches/<int:batch_id>/', IngestBatchView.as_view(source=IngestBatch.SOURCE_HOTJOBS), name='ingest_batch'),
     
     # Smart filtering endpoints
     path('get-data/', GetDataView.as_view(), name='get_data'),  # Supports query params
@@ -20,4 +29,16 @@ urlpatterns = [
     path('get-data/week/', GetWeekDataView.as_view(), name='get_week'),
     path('get-data/month/', GetMonthDataView.as_view(), name='get_month'),
     path('get-data/date/<str:date_str>/', GetDateDataView.as_view(), name='get_date'),
+    
+    # Statistics
+    path('stats/', GetStatsView.as_view(), name='stats'),
+    
+    # Job volume per hour / day / week
+    path('timeseries/', TimeseriesView.as_view(), name='timeseries'),
+    
+    # Typo-tolerant search
+    path('search/', SearchView.as_view(), name='search'),
+    
+    # Streaming CSV / NDJSON download (get-data filters)
+    path('export/', ExportView.as_view(), name='export'),
 ]
\ No newline at end of file
@@ -0,0 +1,42 @@
+"""Shared helpers for the benchmark scripts in this directory.
+
+Each benchmark runs against a throw-away SQLite database (and response
+cache directory) so it never touches ``db.sqlite3`` or ``.response_cache``.
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django(db_name=None):
+    """Configure Django against a fresh, migrated temporary database."""
+    if str(BASE_DIR) not in sys.path:
+        sys.path.insert(0, str(BASE_DIR))
+    if db_name is None:
+        db_name = os.path.join(tempfile.mkdtemp(prefix='bench-'), 'bench.sqlite3')
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_project.settings')
+    os.environ['DJANGO_DB_NAME'] = db_name
+    # Keep the file response cache next to the throw-away database too.
+    os.environ['RESPONSE_CACHE_LOCATION'] = os.path.join(os.path.dirname(db_name), 'response_cache')
+
+    import django
+    from django.core.management import call_command
+
+    django.setup()
+    call_command('migrate', verbosity=0)
+    return db_name
+
+
+def timed(func, *args, **kwargs):
+    """Run ``func`` once and return ``(result, seconds)``."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def report(label, rows, seconds):
+    print(f'{label:<36} {rows:>8} rows  {seconds:8.3f}s  {rows / seconds:>10.0f} rows/s')
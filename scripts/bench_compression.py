@@ -0,0 +1,54 @@
+"""Benchmark response compression on the list endpoints.
+
+Usage: python scripts/bench_compression.py [--rows 10000] [--repeat 10] [--mbps 10]
+
+Seeds the hot jobs table, then requests ``get-data/`` and the cached
+``get-data/today/`` with each coding (identity, gzip, and br when the
+optional brotli package is installed). Reports body size, median
+server time and that time plus the transfer time of the body over a
+``--mbps`` link. ``today/`` is measured on cache hits, where the
+compressed bytes are reused instead of recompressed.
+"""
+import argparse
+import statistics
+import time
+
+from _bench import setup_django
+from bench_ingest import make_payload
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--mbps', type=float, default=10.0)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test import Client
+    from apps.core.compression import available_encoders
+    from apps.n8n_integration.ingest import ingest_jobs
+
+    ingest_jobs(make_payload(args.rows))
+    client = Client()
+    codings = ['identity'] + [encoder.name for encoder in reversed(available_encoders())]
+    bytes_per_second = args.mbps * 1e6 / 8
+
+    for url in ('/n8n/get-data/', '/n8n/get-data/today/'):
+        for coding in codings:
+            client.get(url, HTTP_ACCEPT_ENCODING=coding)  # warm the response cache
+            times = []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                response = client.get(url, HTTP_ACCEPT_ENCODING=coding)
+                times.append(time.perf_counter() - start)
+            assert response.get('Content-Encoding', 'identity') == coding
+            size = len(response.content)
+            server = statistics.median(times)
+            total = server + size / bytes_per_second
+            print(f'{url:<22} {coding:<9} {size / 1024:9.1f} KiB  server {server * 1000:7.1f} ms  '
+                  f'+ {args.mbps:g} Mbit/s transfer {total * 1000:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
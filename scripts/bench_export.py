@@ -0,0 +1,57 @@
+"""Benchmark export/ against get-data/ for a full-history pull.
+
+Usage: python scripts/bench_export.py [--rows 100000]
+
+Fills the hot jobs table, then fetches every row once through
+``get-data/?days=3650`` and once through ``export/`` (CSV and NDJSON),
+reporting total time and time to the first byte, then (in a second,
+slower pass under ``tracemalloc``) the peak Python memory allocated while
+producing the body.
+"""
+import argparse
+import time
+import tracemalloc
+
+from _bench import setup_django
+from bench_ingest import make_payload
+
+
+def measure(label, produce):
+    start = time.perf_counter()
+    first = None
+    size = 0
+    for chunk in produce():
+        if first is None:
+            first = time.perf_counter() - start
+        size += len(chunk)
+    total = time.perf_counter() - start
+
+    tracemalloc.start()
+    for chunk in produce():
+        pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f'{label:<22} {total:7.2f}s total  {first:7.3f}s first byte  '
+          f'{peak / 2 ** 20:8.1f} MiB peak  {size / 2 ** 20:7.1f} MiB body')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test import Client
+    from apps.n8n_integration.ingest import ingest_jobs
+
+    for offset in range(0, args.rows, 10000):
+        ingest_jobs(make_payload(min(10000, args.rows - offset), offset))
+    client = Client()
+
+    measure('get-data/?days=3650', lambda: [client.get('/n8n/get-data/', {'days': 3650}).content])
+    measure('export/ (csv)', lambda: client.get('/n8n/export/').streaming_content)
+    measure('export/ (ndjson)', lambda: client.get('/n8n/export/', {'type': 'ndjson'}).streaming_content)
+
+
+if __name__ == '__main__':
+    main()
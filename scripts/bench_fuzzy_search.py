@@ -0,0 +1,87 @@
+"""Benchmark the typo-tolerant search/ endpoint query path.
+
+Usage: python scripts/bench_fuzzy_search.py [--rows 100000] [--repeat 20]
+
+Fills the hot jobs table with ``--rows`` jobs whose company names and
+positions are drawn from a few hundred words, builds the search
+vocabulary, then times ``fuzzy_search`` for misspelled queries (median
+of ``--repeat`` runs) next to the scan it replaces: comparing the query
+with every row's words in Python.
+"""
+import argparse
+import random
+import statistics
+
+from _bench import setup_django, timed
+
+SYLLABLES = ['ban', 'gla', 'desh', 'gra', 'meen', 'pho', 'ne', 'ra', 'tul', 'pran', 'ak', 'ij',
+             'bas', 'und', 'har', 'ha', 'mid', 'bex', 'im', 'co', 'sq', 'ua', 're', 'ro', 'kom']
+POSITIONS = ['Officer', 'Engineer', 'Manager', 'Executive', 'Director', 'Assistant', 'Analyst',
+             'Software', 'Sales', 'Accounts', 'Senior', 'Junior', 'Marketing', 'Relationship']
+QUERIES = ['Bangladsh Bank', 'grameenfone', 'softwre enginer', 'relatonship officer', 'marketng']
+
+
+def company_words(rng, count):
+    words = set()
+    while len(words) < count:
+        words.add(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize())
+    return sorted(words) + ['Bangladesh', 'Bank', 'Grameenphone']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.utils import timezone
+    from apps.core.fuzzy import fuzzy_search, rebuild_terms, similarity, words
+    from apps.core.models import IngestBatch, SearchTerm
+    from apps.n8n_integration.models import HotJob
+    from apps.n8n_integration.serializers import JOB_ROWS
+
+    rng = random.Random(7)
+    vocabulary = company_words(rng, 2000)
+    now = timezone.now()
+    jobs = [
+        HotJob(
+            company_name=' '.join(rng.sample(vocabulary, 2)),
+            position=' '.join(rng.sample(POSITIONS, 2)),
+            job_url=f'https://hotjobs.bdjobs.com/jobs/{i}.htm',
+            dedup_key=str(i),
+            created_at=now,
+        )
+        for i in range(args.rows - 1)
+    ]
+    jobs.append(HotJob(company_name='Bangladesh Bank', position='Assistant Director',
+                       job_url='https://hotjobs.bdjobs.com/jobs/bb.htm', dedup_key='bb', created_at=now))
+    HotJob.objects.bulk_create(jobs, batch_size=5000)
+    _, seconds = timed(rebuild_terms, IngestBatch.SOURCE_HOTJOBS, 5000)
+    terms = SearchTerm.objects.count()
+    print(f'{args.rows} rows, {terms} words in the vocabulary, built in {seconds:.1f}s')
+
+    qs = HotJob.objects.all()
+    for query in QUERIES:
+        runs = [
+            timed(fuzzy_search, qs, query, IngestBatch.SOURCE_HOTJOBS, HotJob.SEARCH_FIELDS, JOB_ROWS, 10)
+            for _ in range(args.repeat)
+        ]
+        median = statistics.median(seconds for _, seconds in runs) * 1000
+        top = runs[0][0][0] if runs[0][0] else {}
+        print(f'{query!r:<24} {median:8.1f} ms  top: {top.get("company_name")} / {top.get("position")}')
+
+    def scan(query):
+        wanted = words(query)
+        best = []
+        for company, position in qs.values_list(*HotJob.SEARCH_FIELDS).iterator():
+            row_words = words(company) + words(position)
+            best.append(sum(max(similarity(w, r) for r in row_words) for w in wanted) / len(wanted))
+        return sorted(best, reverse=True)[:10]
+
+    _, seconds = timed(scan, QUERIES[0])
+    print(f'{"full scan " + repr(QUERIES[0]):<24} {seconds * 1000:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
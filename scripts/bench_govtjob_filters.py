@@ -0,0 +1,61 @@
+"""Benchmark the typed deadline/vacancy filters against the icontains ones.
+
+Usage: python scripts/bench_govtjob_filters.py [--rows 200000] [--repeat 5]
+
+Fills the government jobs table through ``upsert_jobs`` (which parses
+``vacancies_int``/``deadline_at``), then times one page of ``get-data/``
+(with its total count) filtered by the free-text columns and by the
+indexed typed ones.
+"""
+import argparse
+import time
+
+from _bench import setup_django
+from bench_stats import make_govt_payload
+
+
+def best_of(repeat, func):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.cache import caches
+    from django.test import Client
+    from apps.bdgovjob.ingest import upsert_jobs
+    from apps.bdgovjob.models import GovtJob
+
+    for offset in range(0, args.rows, 5000):
+        upsert_jobs(make_govt_payload(min(5000, args.rows - offset), offset))
+    client = Client()
+
+    def page(params):
+        def request():
+            caches['responses'].clear()
+            client.get('/bdgovjob/get-data/', dict(params, limit=100))
+        return request
+
+    cases = [
+        ('?deadline=5 Dec', page({'deadline': '5 Dec'})),
+        ('?deadline_after=&_before=', page({'deadline_after': '2025-12-05', 'deadline_before': '2025-12-05'})),
+        ('?vacancies=39', page({'vacancies': '39'})),
+        ('?min_vacancies=39', page({'min_vacancies': 39})),
+    ]
+    print(f'{GovtJob.objects.count()} jobs, one page of 100 with its count')
+    for label, func in cases:
+        print(f'{label:<30} {best_of(args.repeat, func) * 1000:9.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
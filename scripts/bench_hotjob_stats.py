@@ -0,0 +1,70 @@
+"""Benchmark n8n stats/ against counting get-data/month/ client-side.
+
+Usage: python scripts/bench_hotjob_stats.py [--rows 1000000] [--days 365] [--repeat 5]
+
+Fills the hot jobs table through ``ingest_jobs`` with rows spread over
+``--days`` days (each day's batch is moved back in time, then the rollups
+are rebuilt). It then times ``stats/`` against what dashboards did before:
+fetch ``get-data/month/`` and count the companies of the rows.
+"""
+import argparse
+import json
+import time
+from collections import Counter
+from datetime import timedelta
+
+from _bench import setup_django
+from bench_ingest import make_payload
+
+
+def best_of(repeat, func):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.cache import caches
+    from django.db.models import F
+    from django.test import Client
+    from apps.core.models import IngestBatch
+    from apps.core.rollups import rebuild
+    from apps.n8n_integration.ingest import ingest_jobs
+    from apps.n8n_integration.models import HotJob
+
+    per_day = max(1, args.rows // args.days)
+    for day, offset in enumerate(range(0, args.rows, per_day)):
+        created, _, _ = ingest_jobs(make_payload(min(per_day, args.rows - offset), offset))
+        HotJob.objects.filter(pk__gte=created[0].pk).update(
+            created_at=F('created_at') - timedelta(days=args.days - day),
+        )
+    rebuild(IngestBatch.SOURCE_HOTJOBS)
+    client = Client()
+
+    def stats():
+        return client.get('/n8n/stats/', {'days': 30, 'top': 10}).content
+
+    def month_client_side():
+        caches['responses'].clear()
+        jobs = json.loads(client.get('/n8n/get-data/month/').content)['jobs']
+        return Counter(job['company_name'] for job in jobs).most_common(10)
+
+    print(f'{HotJob.objects.count()} jobs over {args.days} days')
+    for label, func in [('stats/', stats), ('get-data/month/ + Counter', month_client_side)]:
+        seconds, _ = best_of(args.repeat, func)
+        print(f'{label:<28} {seconds * 1000:9.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark hot job ingest throughput.
+
+Usage: python scripts/bench_ingest.py [--sizes 1000 10000 100000] [--legacy-max 1000]
+
+Compares the set-based ``ingest_jobs`` path against the previous
+one-query-plus-one-insert-per-item loop (only up to ``--legacy-max`` rows,
+it is too slow beyond that).
+"""
+import argparse
+
+from _bench import report, setup_django, timed
+
+
+def make_payload(size, offset=0):
+    return [
+        {
+            'company_name': f'Company {i % 500}',
+            'company_logo_url': f'https://hotjobs.bdjobs.com/logos/company{i % 500}.png',
+            'position': f'Position {i}',
+            'job_url': f'https://hotjobs.bdjobs.com/jobs/company{i % 500}/job{i}.htm',
+            'scraped_date': '2025-11-03 12:00:00',
+        }
+        for i in range(offset, offset + size)
+    ]
+
+
+def legacy_ingest(payloads):
+    from apps.n8n_integration.models import HotJob
+    from apps.n8n_integration.serializers import JobSerializer
+
+    for item in payloads:
+        serializer = JobSerializer(data=item)
+        if not serializer.is_valid():
+            continue
+        vd = serializer.validated_data
+        if HotJob.objects.filter(job_url=vd.get('job_url')).exists():
+            continue
+        HotJob.objects.create(**vd)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--legacy-max', type=int, default=1000)
+    args = parser.parse_args()
+
+    setup_django()
+    from apps.n8n_integration.ingest import ingest_jobs
+    from apps.n8n_integration.models import HotJob
+
+    offset = 0
+    for size in args.sizes:
+        payload = make_payload(size, offset)
+        offset += size
+        _, seconds = timed(ingest_jobs, payload)
+        report(f'bulk insert ({size})', size, seconds)
+        _, seconds = timed(ingest_jobs, payload)
+        report(f'bulk all-duplicates ({size})', size, seconds)
+
+        if size <= args.legacy_max:
+            payload = make_payload(size, offset)
+            offset += size
+            _, seconds = timed(legacy_ingest, payload)
+            report(f'per-item legacy ({size})', size, seconds)
+
+    print(f'{HotJob.objects.count()} rows stored')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""Micro-benchmark the batch normalizer against the legacy per-row save() code.
+
+Usage: python scripts/bench_normalize.py [--rows 100000]
+
+``legacy_normalize`` is the body ``HotJob.save()`` ran before the batch
+engine existed (fresh URLValidator per call, fromisoformat/strptime cascade
+for every row). The second part times per-row ``save()`` against
+``normalize_hotjobs`` + ``bulk_create`` on a temporary database.
+"""
+import argparse
+
+from _bench import report, setup_django, timed
+
+
+def make_rows(size):
+    return [
+        {
+            'company_name': f'  Company {i % 500} ',
+            'company_logo_url': 'N/A' if i % 7 == 0 else f'https://hotjobs.bdjobs.com/logos/c{i % 500}.png',
+            'position': f' Senior   Officer {i} ',
+            'job_url': f'https://hotjobs.bdjobs.com/jobs/company{i % 500}/job{i}.htm',
+            # One scrape stamps many rows with the same second.
+            'scraped_date': f'2025-11-03 12:{(i // 250) % 60:02d}:00',
+        }
+        for i in range(size)
+    ]
+
+
+def legacy_normalize(row):
+    from django.core.exceptions import ValidationError
+    from django.core.validators import URLValidator
+    from django.utils import timezone
+
+    def clean_url(value):
+        if value is None:
+            return None
+        if isinstance(value, str):
+            v = value.strip()
+            if not v or v.upper() == 'N/A':
+                return None
+            try:
+                URLValidator()(v)
+            except ValidationError:
+                return v
+            return v
+        return value
+
+    row = dict(row)
+    if isinstance(row['company_name'], str):
+        row['company_name'] = row['company_name'].strip() or None
+    if isinstance(row['position'], str):
+        row['position'] = ' '.join(row['position'].split()) or None
+    row['company_logo_url'] = clean_url(row['company_logo_url'])
+    row['job_url'] = clean_url(row['job_url'])
+    if isinstance(row['scraped_date'], str):
+        try:
+            parsed = timezone.datetime.fromisoformat(row['scraped_date'])
+            if timezone.is_naive(parsed):
+                parsed = timezone.make_aware(parsed, timezone.get_current_timezone())
+            row['scraped_date'] = parsed
+        except Exception:
+            try:
+                row['scraped_date'] = timezone.make_aware(
+                    timezone.datetime.strptime(row['scraped_date'], '%Y-%m-%d %H:%M:%S'),
+                    timezone.get_current_timezone()
+                )
+            except Exception:
+                row['scraped_date'] = None
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--db-rows', type=int, default=5000)
+    args = parser.parse_args()
+
+    setup_django()
+    from apps.core.normalize import hotjob_dedup_key, normalize_hotjobs
+    from apps.n8n_integration.models import HotJob
+
+    rows = make_rows(args.rows)
+    legacy, seconds = timed(lambda: [legacy_normalize(row) for row in rows])
+    report('legacy per-row normalize', len(rows), seconds)
+    batch, seconds = timed(normalize_hotjobs, rows)
+    report('batch normalize_hotjobs', len(rows), seconds)
+    assert batch == legacy, 'batch engine output differs from the legacy save() code'
+
+    rows = make_rows(args.db_rows)
+
+    def per_row_save():
+        for row in rows:
+            HotJob(**row).save()
+
+    def batch_insert():
+        HotJob.objects.bulk_create(
+            [HotJob(dedup_key=hotjob_dedup_key(row), **row) for row in normalize_hotjobs(rows)],
+            batch_size=500,
+        )
+
+    _, seconds = timed(per_row_save)
+    report('per-row save()', len(rows), seconds)
+    HotJob.objects.all().delete()
+    _, seconds = timed(batch_insert)
+    report('normalize_hotjobs + bulk_create', len(rows), seconds)
+
+
+if __name__ == '__main__':
+    main()
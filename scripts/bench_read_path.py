@@ -0,0 +1,47 @@
+"""Benchmark the get-data read path: ModelSerializer vs values_list() rows.
+
+Usage: python scripts/bench_read_path.py [--sizes 10000 100000]
+
+For each size the hot jobs table is filled to that many rows, then the
+whole list is fetched and converted (and rendered to JSON) once through
+``JobSerializer(many=True)`` and once through ``JOB_ROWS``.
+"""
+import argparse
+
+from _bench import report, setup_django, timed
+from bench_ingest import make_payload
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000])
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.renderers import JSONRenderer
+    from apps.n8n_integration.ingest import ingest_jobs
+    from apps.n8n_integration.models import HotJob
+    from apps.n8n_integration.serializers import JOB_ROWS, JobSerializer
+
+    renderer = JSONRenderer()
+    stored = 0
+    for size in sorted(args.sizes):
+        ingest_jobs(make_payload(size - stored, stored))
+        stored = size
+        qs = HotJob.objects.order_by('-created_at', '-id')
+
+        serializer_data, seconds = timed(lambda: JobSerializer(qs.all(), many=True).data)
+        report(f'ModelSerializer ({size})', size, seconds)
+        rows_data, seconds = timed(JOB_ROWS.serialize, qs.all())
+        report(f'values_list rows ({size})', size, seconds)
+
+        _, seconds = timed(lambda: renderer.render(JobSerializer(qs.all(), many=True).data))
+        report(f'ModelSerializer + render ({size})', size, seconds)
+        _, seconds = timed(lambda: renderer.render(JOB_ROWS.serialize(qs.all())))
+        report(f'values_list rows + render ({size})', size, seconds)
+
+        assert renderer.render(rows_data) == renderer.render(serializer_data)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""Benchmark send-data end to end: full echo vs ``?response=summary``.
+
+Usage: python scripts/bench_send_data.py [--sizes 1000 5000]
+
+Each size is posted twice per mode (new rows, then all duplicates) through
+the Django test client, so parsing, ingest and rendering are all counted.
+"""
+import argparse
+import json
+import logging
+
+from _bench import report, setup_django, timed
+from bench_ingest import make_payload
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 5000])
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test import Client, override_settings
+
+    # The all-duplicates posts answer 400; keep the log quiet.
+    logging.getLogger('django.request').setLevel(logging.ERROR)
+    client = Client()
+    offset = 0
+    with override_settings(ALLOWED_HOSTS=['*']):
+        for size in args.sizes:
+            for mode, query in (('full', ''), ('summary', '?response=summary')):
+                payload = make_payload(size, offset)
+                offset += size
+                for label in ('new', 'duplicates'):
+                    body = json.dumps(payload)
+                    response, seconds = timed(
+                        client.post, f'/n8n/send-data/{query}', body,
+                        content_type='application/json', HTTP_IDEMPOTENCY_KEY=f'{mode}-{label}-{size}',
+                    )
+                    report(f'{mode} {label} ({size}, {len(response.content) // 1024} KiB)', size, seconds)
+
+
+if __name__ == '__main__':
+    main()
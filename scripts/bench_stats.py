@@ -0,0 +1,83 @@
+"""Benchmark bdgovjob stats/ from the daily rollups against a table scan.
+
+Usage: python scripts/bench_stats.py [--rows 200000] [--days 365] [--repeat 20]
+
+Fills the government jobs table through ``upsert_jobs`` with rows spread
+over ``--days`` days (each day's batch is moved back in time, then the
+rollups are rebuilt), then times the aggregate the stats endpoint used to
+run over ``GovtJob`` and the rollup ``summary`` it runs now.
+"""
+import argparse
+import time
+from datetime import timedelta
+
+from _bench import setup_django
+
+
+def make_govt_payload(size, offset):
+    return [
+        {
+            'job_title': f'Ministry {n % 300} Job Circular {n}',
+            'job_url': f'https://bdgovtjob.net/circular-{n}/',
+            'vacancies': str(n % 40) if n % 3 else 'N/A',
+            'deadline': f'{n % 28 + 1} Dec 2025' if n % 5 else '',
+            'posted_date': '1 Nov 2025',
+        }
+        for n in range(offset, offset + size)
+    ]
+
+
+def best_of(repeat, func):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db.models import Count, F, Max, Q
+    from django.utils import timezone
+    from apps.bdgovjob.ingest import upsert_jobs
+    from apps.bdgovjob.models import GovtJob
+    from apps.core.models import IngestBatch
+    from apps.core.rollups import filled_q, rebuild, summary
+
+    per_day = max(1, args.rows // args.days)
+    for day, offset in enumerate(range(0, args.rows, per_day)):
+        created, _, _, _ = upsert_jobs(make_govt_payload(min(per_day, args.rows - offset), offset))
+        age = timedelta(days=args.days - day)
+        GovtJob.objects.filter(pk__gte=created[0].pk).update(
+            created_at=F('created_at') - age, updated_at=F('updated_at') - age,
+        )
+    rebuild(IngestBatch.SOURCE_GOVTJOBS)
+
+    def table_scan():
+        now = timezone.now()
+        GovtJob.objects.aggregate(
+            total_jobs=Count('pk'),
+            this_week=Count('pk', filter=Q(created_at__gte=now - timedelta(days=7))),
+            with_vacancies=Count('pk', filter=filled_q('vacancies')),
+            with_deadlines=Count('pk', filter=filled_q('deadline')),
+            last_updated=Max('created_at'),
+            last_modified=Max('updated_at'),
+        )
+
+    scan = best_of(args.repeat, table_scan)
+    rollups = best_of(args.repeat, lambda: summary(IngestBatch.SOURCE_GOVTJOBS))
+    print(f'{GovtJob.objects.count()} jobs over {args.days} days')
+    print(f'{"aggregate over GovtJob":<28} {scan * 1000:9.2f} ms')
+    print(f'{"summary over rollups":<28} {rollups * 1000:9.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark a 90-day chart from timeseries/ against per-day get-data/ calls.
+
+Usage: python scripts/bench_timeseries.py [--rows 300000] [--days 365] [--repeat 3]
+
+Fills the hot jobs table through ``ingest_jobs`` with rows spread over
+``--days`` days (each day's batch is moved back in time, then the rollups
+are rebuilt). It then times the daily counts of the last 90 days three
+ways: one ``get-data/date/<d>/`` call per day (counting the payloads),
+``timeseries/`` from the rollups, and ``timeseries/`` with a text filter
+(one grouped query over the jobs). Hour buckets over the same range are
+timed too.
+"""
+import argparse
+import json
+import time
+from datetime import timedelta
+
+from _bench import setup_django
+from bench_ingest import make_payload
+
+
+def best_of(repeat, func):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=300000)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.core.cache import caches
+    from django.db.models import F
+    from django.test import Client
+    from django.utils import timezone
+    from apps.core.models import IngestBatch
+    from apps.core.rollups import rebuild
+    from apps.n8n_integration.ingest import ingest_jobs
+    from apps.n8n_integration.models import HotJob
+
+    per_day = max(1, args.rows // args.days)
+    for day, offset in enumerate(range(0, args.rows, per_day)):
+        created, _, _ = ingest_jobs(make_payload(min(per_day, args.rows - offset), offset))
+        HotJob.objects.filter(pk__gte=created[0].pk).update(
+            created_at=F('created_at') - timedelta(days=args.days - day),
+        )
+    rebuild(IngestBatch.SOURCE_HOTJOBS)
+    client = Client()
+    today = timezone.localdate()
+
+    def per_day_calls():
+        caches['responses'].clear()
+        for n in range(90):
+            day = today - timedelta(days=n)
+            len(json.loads(client.get(f'/n8n/get-data/date/{day}/').content)['jobs'])
+
+    cases = [
+        ('90 x get-data/date/', per_day_calls),
+        ('timeseries/ (rollups)', lambda: client.get('/n8n/timeseries/', {'days': 90})),
+        ('timeseries/?position=', lambda: client.get('/n8n/timeseries/', {'days': 90, 'position': 'Position'})),
+        ('timeseries/?bucket=hour', lambda: client.get('/n8n/timeseries/', {'days': 90, 'bucket': 'hour'})),
+    ]
+    print(f'{HotJob.objects.count()} jobs over {args.days} days, 90-day chart')
+    for label, func in cases:
+        print(f'{label:<28} {best_of(args.repeat, func) * 1000:9.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
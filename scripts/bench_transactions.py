@@ -0,0 +1,80 @@
+"""Benchmark commit strategies for government job ingest.
+
+Usage: python scripts/bench_transactions.py [--size 5000] [--autocommit-max 5000]
+
+Compares one INSERT and one commit per row (autocommit) against
+``upsert_jobs`` with one transaction per batch, one per
+``INGEST_TRANSACTION_SIZE`` rows, and with a failing row in every chunk so
+that each chunk falls back to per-row savepoints.
+"""
+import argparse
+
+from _bench import report, setup_django, timed
+
+
+def make_payload(size, offset=0):
+    return [
+        {
+            'job_title': f'Assistant Officer {i}',
+            'job_url': f'https://example.gov.bd/jobs/{i}',
+            'vacancies': str(i % 20 + 1),
+            'deadline': '30 November 2025',
+            'posted_date': '01 November 2025',
+            'scraped_at': '2025-11-03 12:00:00',
+        }
+        for i in range(offset, offset + size)
+    ]
+
+
+def autocommit_insert(payloads):
+    from apps.bdgovjob.models import GovtJob
+    from apps.bdgovjob.serializers import GovtJobIngestSerializer
+
+    validator = GovtJobIngestSerializer()
+    for item in payloads:
+        GovtJob.objects.create(**validator.run_validation(item))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=5000)
+    parser.add_argument('--autocommit-max', type=int, default=5000)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test import override_settings
+    from apps.bdgovjob import ingest
+
+    size = args.size
+    offset = 0
+    if size <= args.autocommit_max:
+        _, seconds = timed(autocommit_insert, make_payload(size, offset))
+        report(f'autocommit per row ({size})', size, seconds)
+    offset += size
+
+    for transaction_size in (0, 1000):
+        with override_settings(INGEST_TRANSACTION_SIZE=transaction_size):
+            _, seconds = timed(ingest.upsert_jobs, make_payload(size, offset))
+        offset += size
+        label = 'one transaction' if not transaction_size else f'commit every {transaction_size}'
+        report(f'{label} ({size})', size, seconds)
+
+    original = ingest._upsert_chunk
+    batch_size = 500
+
+    def upsert_chunk(chunk):
+        # Every full chunk fails once and is redone row by row.
+        if len(chunk) == batch_size:
+            raise ValueError('simulated bad row')
+        return original(chunk)
+
+    ingest._upsert_chunk = upsert_chunk
+    try:
+        _, seconds = timed(ingest.upsert_jobs, make_payload(size, offset), batch_size)
+    finally:
+        ingest._upsert_chunk = original
+    report(f'per-row fallback everywhere ({size})', size, seconds)
+
+
+if __name__ == '__main__':
+    main()